@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Banc d'essai des performances d'AccountManager et des modes de persistance
+Mesure le débit (op/s) et les latences p50/p99, enregistre les résultats en JSON
+et les compare à une exécution précédente pour détecter les régressions
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+from account_manager import AccountManager
+from journal import TransactionLog, DURABILITY_NONE, DURABILITY_ALWAYS
+from ledger import Ledger
+from app import run_batch
+from shard import ShardedLedger
+from balance_table import BalanceView
+import balance_codec
+
+DEFAULT_OUTPUT = "bench_results.json"
+
+
+def percentile(sorted_values, fraction):
+    """Percentile par rang le plus proche sur une liste triée"""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def measure(func, iterations, threads=1):
+    """Exécute `func` `iterations` fois par thread et retourne débit et latences"""
+    latencies = []
+
+    def run():
+        local = []
+        clock = time.perf_counter_ns
+        for _ in range(iterations):
+            started = clock()
+            func()
+            local.append(clock() - started)
+        latencies.extend(local)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'iterations': iterations * threads,
+        'threads': threads,
+        'ops_per_second': iterations * threads / elapsed,
+        'p50_us': percentile(latencies, 0.50) / 1000,
+        'p99_us': percentile(latencies, 0.99) / 1000,
+    }
+
+
+def write_balance(path, balance=1000.0):
+    with open(path, 'w') as file:
+        json.dump({'balance': balance}, file)
+
+
+def write_journal(path, records):
+    """Prépare un fichier de données suivi d'un journal de `records` opérations"""
+    write_balance(path)
+    log = TransactionLog(path, durability=DURABILITY_NONE, compact_every=records + 1)
+    balance = 100000
+    for _ in range(records):
+        balance += 100
+        log.append("credit", 100, balance)
+    log.close()
+
+
+def bench_operations(directory, iterations, results):
+    """Consultation, crédit et débit pour chaque mode de persistance"""
+    configurations = {
+        'json': {},
+        'binary': {'storage': 'binary'},
+        'journal': {'journal': True, 'durability': DURABILITY_NONE},
+        'mmap': {'storage': 'mmap'},
+        'sqlite': {'storage': 'sqlite'},
+        'memory': {'storage': 'memory'},
+        'group_commit': {'group_commit': True},
+        'metrics': {'metrics': True},
+    }
+    for name, options in configurations.items():
+        path = os.path.join(directory, f'ops_{name}.dat')
+        if options.get('storage') in (None, 'json'):
+            write_balance(path)
+        account = AccountManager(path, **options)
+        results[f'get_balance/{name}'] = measure(account.get_balance, iterations * 10)
+        results[f'credit_account/{name}'] = measure(lambda: account.credit_account(1), iterations)
+        results[f'debit_account/{name}'] = measure(lambda: account.debit_account(1), iterations)
+        account.close()
+
+
+def bench_threads(directory, iterations, results, threads=4):
+    """Crédits concurrents sur une instance partagée (concurrency="thread")"""
+    for storage in ('json', 'mmap'):
+        path = os.path.join(directory, f'threads_{storage}.dat')
+        if storage == 'json':
+            write_balance(path)
+        account = AccountManager(path, concurrency="thread", storage=storage)
+        results[f'credit_account/{storage}/threads={threads}'] = measure(
+            lambda: account.credit_account(1), max(1, iterations // threads), threads)
+        account.close()
+
+
+def bench_load(directory, iterations, results):
+    """Construction/chargement selon la taille des fichiers"""
+    path = os.path.join(directory, 'load.json')
+    write_balance(path)
+    results['load/json'] = measure(lambda: AccountManager(path), iterations)
+
+    for records in (1000, 100000):
+        path = os.path.join(directory, f'load_journal_{records}.json')
+        write_journal(path, records)
+        results[f'load/journal/records={records}'] = measure(
+            lambda: AccountManager(path, journal=True).close(), max(1, iterations * 100 // records))
+
+    path = os.path.join(directory, 'load.dat')
+    AccountManager(path, storage='mmap').close()
+    results['load/mmap'] = measure(lambda: AccountManager(path, storage='mmap').close(), iterations)
+
+    for accounts in (1000, 100000):
+        path = os.path.join(directory, f'ledger_{accounts}.bin')
+        ledger = Ledger()
+        for account_id in range(accounts):
+            ledger.open_account(account_id)
+        ledger.save(path)
+        results[f'load/ledger/accounts={accounts}'] = measure(
+            lambda: Ledger.load(path), max(1, iterations * 100 // accounts))
+
+
+def bench_batch(directory, iterations, results, size=10000):
+    """Lots de `size` opérations appliqués en une écriture"""
+    path = os.path.join(directory, 'batch.json')
+    write_balance(path)
+    account = AccountManager(path)
+    ops = [("credit", 1), ("debit", 1)] * (size // 2)
+    result = measure(lambda: account.apply_batch(ops), max(1, iterations // 100))
+    result['ops_per_second'] *= size
+    results[f'apply_batch/size={size}'] = result
+
+
+def bench_app_batch(directory, iterations, results, size=10000):
+    """Mode batch de app.py : analyse des commandes, application et sortie JSONL"""
+    path = os.path.join(directory, 'app_batch.json')
+    write_balance(path)
+    account = AccountManager(path)
+    commands = "balance\ncredit 1.00\ndebit 1.00\n" * (size // 3)
+    result = measure(lambda: run_batch(account, io.StringIO(commands), io.StringIO()), max(1, iterations // 100))
+    result['ops_per_second'] *= size // 3 * 3
+    results[f'app_batch/size={size // 3 * 3}'] = result
+
+
+def bench_balance_at(directory, iterations, results):
+    """balance_at à une date aléatoire selon la longueur de l'historique"""
+    rng = random.Random(0)
+    for rows in (1000, 100000, 1000000):
+        path = os.path.join(directory, f'history_{rows}.json')
+        write_balance(path)
+        account = AccountManager(path, history=True)
+        started = time.time()
+        for _ in range(rows // 10000 + 1):
+            account.apply_batch([("credit", 1), ("debit", 1)] * min(5000, rows // 2))
+        ended = time.time()
+        results[f'balance_at/history={rows}'] = measure(
+            lambda: account.balance_at(rng.uniform(started, ended)), iterations)
+        account.close()
+
+
+def bench_codec(directory, iterations, results, size=10000):
+    """Encodage et décodage des soldes : enregistrement binaire comparé à JSON, unitaire puis en flux"""
+    record = balance_codec.encode(123456)
+    text = json.dumps({'balance': 1234.56})
+    results['codec/encode/binary'] = measure(lambda: balance_codec.encode(123456), iterations * 10)
+    results['codec/encode/json'] = measure(lambda: json.dumps({'balance': 123456 / 100}), iterations * 10)
+    results['codec/decode/binary'] = measure(lambda: balance_codec.decode(record), iterations * 10)
+    results['codec/decode/json'] = measure(lambda: balance_codec.decode_legacy(text), iterations * 10)
+
+    # Flux de `size` soldes : débit exprimé en enregistrements/s
+    records = [(account_id, account_id * 37) for account_id in range(size)]
+    stream = balance_codec.encode_many(records)
+    lines = "".join(json.dumps({'account': account_id, 'balance': cents / 100}) + "\n"
+                    for account_id, cents in records)
+    benches = {
+        'codec/stream_encode/binary': lambda: balance_codec.encode_many(records),
+        'codec/stream_encode/json': lambda: "".join(json.dumps({'account': account_id, 'balance': cents / 100}) + "\n"
+                                                    for account_id, cents in records),
+        'codec/stream_decode/binary': lambda: balance_codec.RecordReader().feed(stream),
+        'codec/stream_decode/json': lambda: [json.loads(line) for line in lines.splitlines()],
+    }
+    for name, bench in benches.items():
+        result = measure(bench, max(1, iterations // 200))
+        result['ops_per_second'] *= size
+        results[name] = result
+
+
+def bench_transfers(directory, iterations, results):
+    """Virement (deux comptes, un enregistrement) comparé à une opération sur un compte"""
+    for durability in (DURABILITY_NONE, DURABILITY_ALWAYS):
+        ledger = Ledger()
+        ledger.open_log(os.path.join(directory, f'ledger_{durability}.wal'), durability)
+        count = iterations if durability == DURABILITY_NONE else max(1, iterations // 10)
+        results[f'ledger/credit_account/{durability}'] = measure(lambda: ledger.credit_account(1, 1), count)
+        results[f'ledger/transfer/{durability}'] = measure(lambda: ledger.transfer(1, 2, 1), count)
+        ledger.close()
+
+
+def bench_bulk(directory, iterations, results):
+    """Intérêts sur tous les comptes en une passe, journalisés, avec et sans NumPy (débit en comptes/s)"""
+    import bulk
+    accounts = iterations * 100
+    available = bulk.numpy
+    modes = (('numpy', available), ('python', None)) if available is not None else (('python', None),)
+    try:
+        for name, numpy in modes:
+            bulk.numpy = numpy
+            ledger = Ledger()
+            for account_id in range(accounts):
+                ledger.open_account(account_id)
+            ledger.open_log(os.path.join(directory, f'bulk_{name}.wal'), DURABILITY_NONE)
+            result = measure(lambda: ledger.accrue_interest("0.0001"), 3)
+            result['ops_per_second'] *= accounts
+            results[f'ledger/accrue_interest/{name}'] = result
+            ledger.close()
+    finally:
+        bulk.numpy = available
+
+
+def bench_idempotency(directory, iterations, results):
+    """Crédit avec clé d'idempotence : clé nouvelle (écriture) puis clé répétée (résultat en cache)"""
+    account = AccountManager(os.path.join(directory, 'idempotency.dat'), storage='mmap', idempotency=True)
+    keys = iter(range(iterations))
+    results['credit_account/mmap+request_id'] = measure(
+        lambda: account.credit_account(1, request_id=str(next(keys))), iterations)
+    keys = iter(range(iterations))
+    results['credit_account/mmap+request_id/duplicate'] = measure(
+        lambda: account.credit_account(1, request_id=str(next(keys))), iterations)
+    account.close()
+
+
+def bench_shards(directory, iterations, results, size=20000, accounts=100000):
+    """Grand livre réparti : débit de lots de `size` opérations de 1 à N processus (N = nombre de cœurs)"""
+    rng = random.Random(0)
+    ops = [(rng.randrange(accounts), "credit", 100) for _ in range(size)]
+    counts = [1]
+    while counts[-1] < max(2, os.cpu_count() or 1):
+        counts.append(min(counts[-1] * 2, max(2, os.cpu_count() or 1)))
+    for workers in counts:
+        ledger = ShardedLedger(workers, os.path.join(directory, f'shards_{workers}'), DURABILITY_NONE)
+        ledger.apply_many(ops)
+        result = measure(lambda: ledger.apply_many(ops), max(1, iterations // 100))
+        result['ops_per_second'] *= size
+        results[f'sharded/workers={workers}'] = result
+        ledger.close()
+
+
+def bench_shared_table(directory, iterations, results):
+    """Lecture du solde par un tableau de bord : vue sur la table partagée ou nouvelle instance"""
+    path = os.path.join(directory, 'table.json')
+    write_balance(path)
+    account = AccountManager(path, shared_table=True)
+    view = BalanceView(path + '.tbl')
+    results['get_balance/shared_table_view'] = measure(view.get_balance, iterations * 10)
+    results['get_balance/new_instance'] = measure(lambda: AccountManager(path).get_balance(), iterations)
+    view.close()
+    account.close()
+
+
+def bench_startup(directory, iterations, results):
+    """Temps de démarrage d'app.py : interpréteur seul, --batch complet, --balance (cache binaire), client du démon"""
+    app = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python', 'app.py')
+    path = os.path.join(directory, 'startup.json')
+    socket_path = os.path.join(directory, 'startup.sock')
+    write_balance(path)
+    # Bytecode mis en cache hors du dépôt : sans lui, chaque démarrage recompile les modules
+    environment = {key: value for key, value in os.environ.items()
+                   if key != 'PYTHONDONTWRITEBYTECODE' and not key.startswith('ACCOUNT_')}
+    environment['PYTHONPYCACHEPREFIX'] = os.path.join(directory, 'pycache')
+
+    def launch(*args, stdin=b"balance\n"):
+        return lambda: subprocess.run([sys.executable, *args], input=stdin, stdout=subprocess.DEVNULL,
+                                      env=environment, check=True)
+
+    commands = {
+        'startup/interpreter': launch('-c', 'pass'),
+        'startup/app_batch': launch(app, '--batch', '--data-file', path),
+        'startup/app_balance': launch(app, '--balance', '--data-file', path),
+        'startup/app_client': launch(app, '--client', socket_path, '--balance'),
+    }
+    server = subprocess.Popen([sys.executable, app, '--serve', socket_path, '--data-file', path], env=environment)
+    try:
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+        for name, command in commands.items():
+            command()
+            results[name] = measure(command, max(5, iterations // 100))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run_benchmarks(iterations=2000):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        bench_operations(directory, iterations, results)
+        bench_threads(directory, iterations, results)
+        bench_load(directory, iterations, results)
+        bench_batch(directory, iterations, results)
+        bench_app_batch(directory, iterations, results)
+        bench_balance_at(directory, iterations, results)
+        bench_codec(directory, iterations, results)
+        bench_transfers(directory, iterations, results)
+        bench_bulk(directory, iterations, results)
+        bench_idempotency(directory, iterations, results)
+        bench_shards(directory, iterations, results)
+        bench_shared_table(directory, iterations, results)
+        bench_startup(directory, iterations, results)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'iterations': iterations,
+        },
+        'results': results,
+    }
+
+
+def compare(previous, current, threshold):
+    """Liste les mesures dont le débit a baissé de plus de `threshold` (fraction)"""
+    regressions = []
+    for name, result in current['results'].items():
+        before = previous.get('results', {}).get(name)
+        if before and result['ops_per_second'] < before['ops_per_second'] * (1 - threshold):
+            regressions.append((name, before['ops_per_second'], result['ops_per_second']))
+    return regressions
+
+
+def print_results(report):
+    print(f"{'mesure':<42} {'op/s':>14} {'p50 (µs)':>10} {'p99 (µs)':>10}")
+    for name, result in report['results'].items():
+        print(f"{name:<42} {result['ops_per_second']:>14,.0f} {result['p50_us']:>10.1f} {result['p99_us']:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai des performances d'AccountManager")
+    parser.add_argument('--iterations', type=int, default=2000, help="Nombre d'opérations par mesure")
+    parser.add_argument('--quick', action='store_true', help="Exécution rapide (200 opérations par mesure)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Fichier JSON des résultats")
+    parser.add_argument('--compare', help="Résultats précédents à comparer")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Baisse de débit tolérée (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(200 if args.quick else args.iterations)
+    print_results(report)
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nRésultats enregistrés dans {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            previous = json.load(file)
+        regressions = compare(previous, report, args.threshold)
+        for name, before, after in regressions:
+            print(f"RÉGRESSION {name}: {before:,.0f} -> {after:,.0f} op/s")
+        if regressions:
+            return 1
+        print("Aucune régression détectée")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fuzzing différentiel COBOL / Python
+Génère de longues suites aléatoires de choix de menu et de montants (dont des
+valeurs proches des limites PIC 9(6)V99), les exécute sur les deux
+implémentations via les workers de parity.py, compare les soldes affichés et
+réduit chaque divergence à une reproduction minimale
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import multiprocessing
+
+import parity
+
+# Capacité du champ COBOL PIC 9(6)V99, en centimes
+PIC_MODULUS = 100000000
+
+EDGE_AMOUNTS = ("0.00", "0.01", "0.99", "1.00", "999.99", "1000.00", "1000.01",
+                "99999.99", "500000.00", "999999.98", "999999.99")
+
+
+class CobolModel:
+    """Modèle de référence en Python de la sémantique COBOL (sans compilateur).
+
+    Le solde et les montants sont des PIC 9(6)V99 : ACCEPT et ADD tronquent les
+    chiffres de poids fort au-delà de 999999.99, un débit n'est appliqué que si
+    FINAL-BALANCE >= AMOUNT, et un crédit de zéro est accepté.
+    """
+
+    def run(self, inputs):
+        inputs = list(inputs) if "4" in inputs else list(inputs) + ["1"]
+        balance = 100000
+        balances = []
+        values = iter(inputs)
+        for choice in values:
+            if choice == "4":
+                break
+            if choice == "1":
+                balances.append(balance / 100)
+            elif choice in ("2", "3"):
+                amount = round(float(next(values, "0")) * 100) % PIC_MODULUS
+                if choice == "2":
+                    balance = (balance + amount) % PIC_MODULUS
+                elif balance >= amount:
+                    balance -= amount
+        return balances
+
+
+def generate_steps(rng, length, edge_ratio=0.2, exclude_overflow=False):
+    """Suite d'étapes : (choix,) ou (choix, montant) pour un crédit ou un débit.
+
+    Avec `exclude_overflow`, le solde reste dans la capacité PIC 9(6)V99 : un
+    crédit qui la dépasserait devient un débit du même montant. Le dépassement
+    est une divergence connue (le COBOL tronque, le Python conserve le solde),
+    générée par défaut ; l'exclure fait de toute divergence restante une nouveauté.
+    """
+    steps = []
+    balance = 100000
+    for _ in range(length):
+        choice = rng.choices("1239", weights=(2, 4, 4, 1))[0]
+        if choice in "23":
+            if rng.random() < edge_ratio:
+                amount = rng.choice(EDGE_AMOUNTS)
+            else:
+                amount = f"{rng.randint(1, 500000) / 100:.2f}"
+            cents = round(float(amount) * 100)
+            if choice == "2" and balance + cents >= PIC_MODULUS and exclude_overflow:
+                choice = "3"
+            if choice == "2":
+                balance += cents
+            elif balance >= cents:
+                balance -= cents
+            steps.append((choice, amount))
+        else:
+            steps.append((choice,))
+    return steps
+
+
+def flatten(steps):
+    return [value for step in steps for value in step]
+
+
+def shrink(steps, fails):
+    """Réduit une suite divergente : suppression d'étapes puis simplification des montants"""
+    chunk = max(1, len(steps) // 2)
+    while chunk >= 1:
+        changed = False
+        index = 0
+        while index < len(steps):
+            candidate = steps[:index] + steps[index + chunk:]
+            if candidate and fails(candidate):
+                steps = candidate
+                changed = True
+            else:
+                index += chunk
+        if not changed:
+            chunk //= 2
+
+    for index, step in enumerate(steps):
+        if len(step) == 2:
+            for simpler in ("1.00", "0.01", "0.00"):
+                candidate = steps[:index] + [(step[0], simpler)] + steps[index + 1:]
+                if simpler != step[1] and fails(candidate):
+                    steps = candidate
+                    break
+    return steps
+
+
+_workers = None
+
+
+def _init_worker(oracle, root):
+    global _workers
+    # Sous-répertoire de celui de fuzz() ou de main(), supprimé avec lui
+    python_worker = parity.PythonWorker(tempfile.mkdtemp(prefix="worker-", dir=root))
+    _workers = (python_worker, parity.CobolWorker() if oracle == "cobol" else CobolModel())
+
+
+def diverges(steps, workers=None):
+    python_worker, reference = workers or _workers
+    inputs = flatten(steps)
+    return python_worker.run(inputs) != reference.run(inputs)
+
+
+def _check(job):
+    seed, length, edge_ratio, exclude_overflow = job
+    steps = generate_steps(random.Random(seed), length, edge_ratio, exclude_overflow)
+    return seed, len(flatten(steps)), (steps if diverges(steps) else None)
+
+
+def default_oracle():
+    """Exécutable COBOL compilé s'il existe, sinon modèle Python de sa sémantique"""
+    return "cobol" if os.path.exists(parity.COBOL_APP_PATH) else "model"
+
+
+def fuzz(sequences, length, workers=None, oracle="cobol", seed=0, edge_ratio=0.2, exclude_overflow=False):
+    """Exécute `sequences` suites en parallèle ; retourne (nombre d'opérations, suites divergentes)"""
+    jobs = [(seed + index, length, edge_ratio, exclude_overflow) for index in range(sequences)]
+    operations = 0
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="fuzz-") as root:
+        with multiprocessing.Pool(workers or os.cpu_count() or 1, initializer=_init_worker,
+                                  initargs=(oracle, root)) as pool:
+            for _, count, steps in pool.imap_unordered(_check, jobs, chunksize=4):
+                operations += count
+                if steps is not None:
+                    failures.append(steps)
+    return operations, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzzing différentiel des soldes COBOL / Python")
+    parser.add_argument('--sequences', type=int, default=500, help="Nombre de suites générées")
+    parser.add_argument('--length', type=int, default=200, help="Nombre d'étapes par suite")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de workers (un par cœur par défaut)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--edge-ratio', type=float, default=0.2, help="Proportion de montants limites")
+    parser.add_argument('--oracle', choices=("model", "cobol"), default=None,
+                        help="Référence : exécutable COBOL compilé (par défaut s'il existe) "
+                             "ou modèle Python de sa sémantique")
+    parser.add_argument('--max-repros', type=int, default=5, help="Nombre de divergences à réduire")
+    parser.add_argument('--exclude-known-overflow', action='store_true',
+                        help="Exclure les dépassements de capacité PIC 9(6)V99 (divergence connue)")
+    args = parser.parse_args(argv)
+
+    if args.oracle is None:
+        args.oracle = default_oracle()
+        if args.oracle == "model":
+            print(f"NOTE: exécutable COBOL '{parity.COBOL_APP_PATH}' absent, "
+                  "référence : modèle Python de la sémantique COBOL")
+    if args.exclude_known_overflow:
+        print("NOTE: le dépassement de capacité PIC 9(6)V99 (le COBOL tronque au-delà de 999999.99) "
+              "est une divergence connue, délibérément exclue de cette exécution")
+
+    started = time.perf_counter()
+    operations, failures = fuzz(args.sequences, args.length, args.workers, args.oracle, args.seed,
+                                args.edge_ratio, args.exclude_known_overflow)
+    elapsed = time.perf_counter() - started
+    print(f"{args.sequences} suites, {operations} saisies en {elapsed:.2f}s "
+          f"({operations / elapsed:,.0f} saisies/s), {len(failures)} divergences")
+
+    if failures:
+        with tempfile.TemporaryDirectory(prefix="fuzz-") as root:
+            _init_worker(args.oracle, root)
+            python_worker, reference = _workers
+            reproductions = set()
+            for steps in failures[:args.max_repros]:
+                inputs = tuple(flatten(shrink(steps, diverges)))
+                if inputs not in reproductions:
+                    reproductions.add(inputs)
+                    print(f"REPRODUCTION {list(inputs)}: Python={python_worker.run(inputs)} "
+                          f"référence={reference.run(inputs)}")
+            if isinstance(reference, parity.CobolWorker):
+                reference.close()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
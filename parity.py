@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Moteur de tests de parité COBOL / Python avec processus maintenus à chaud
+Chaque worker garde un processus COBOL ouvert et exécute l'application Python
+dans son propre interpréteur, avec un fichier de données isolé ; l'état est
+réinitialisé entre les scénarios au lieu de relancer les programmes
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+import contextlib
+import multiprocessing
+from unittest.mock import patch
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+COBOL_APP_PATH = os.path.abspath("./cobol/accountsystem")
+INITIAL_BALANCE = 1000.0
+
+_COBOL_VIEW = re.compile(r"Current balance:\s*(\d+\.\d{2})")
+_PYTHON_VIEW = re.compile(r"Solde actuel:\s*(\d+\.\d{2})")
+
+
+def count_views(inputs):
+    """Nombre de consultations (option 1) d'une suite de saisies, montants exclus"""
+    views = 0
+    expect_amount = False
+    for value in inputs:
+        if expect_amount:
+            expect_amount = False
+        elif value == "1":
+            views += 1
+        elif value in ("2", "3"):
+            expect_amount = True
+    return views
+
+
+def trajectory(output, pattern):
+    """Soldes affichés par les consultations successives"""
+    return [float(value) for value in pattern.findall(output)]
+
+
+class CobolWorker:
+    """Processus COBOL maintenu ouvert entre les scénarios.
+
+    Le programme COBOL garde le solde en WORKING-STORAGE : après chaque
+    scénario, une consultation donne le solde final et un crédit ou un débit
+    compensatoire le ramène à la valeur initiale. Un scénario qui choisit
+    « 4 » (quitter) termine le processus, relancé au scénario suivant.
+    """
+
+    def __init__(self, app_path=COBOL_APP_PATH):
+        self.app_path = app_path
+        self.process = None
+
+    def _start(self):
+        command = [self.app_path]
+        # Sortie non bufferisée : les réponses arrivent dès leur affichage
+        if shutil.which("stdbuf"):
+            command = ["stdbuf", "-o0"] + command
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, text=True, bufsize=1)
+
+    def run(self, inputs):
+        if self.process is None or self.process.poll() is not None:
+            self._start()
+
+        if "4" in inputs:
+            # Scénario terminal : le processus se termine, on lit toute sa sortie
+            output, _ = self.process.communicate("\n".join(inputs) + "\n")
+            self.process = None
+            return trajectory(output, _COBOL_VIEW)
+
+        # Consultation finale servant de marqueur de fin de scénario
+        inputs = list(inputs) + ["1"]
+        self.process.stdin.write("\n".join(inputs) + "\n")
+        self.process.stdin.flush()
+
+        expected = count_views(inputs)
+        balances = []
+        while len(balances) < expected:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError("Le processus COBOL s'est arrêté pendant le scénario.")
+            match = _COBOL_VIEW.search(line)
+            if match:
+                balances.append(float(match.group(1)))
+
+        self._reset(balances[-1])
+        return balances
+
+    def _reset(self, balance):
+        difference = round(balance - INITIAL_BALANCE, 2)
+        if difference > 0:
+            self.process.stdin.write(f"3\n{difference:.2f}\n")
+        elif difference < 0:
+            self.process.stdin.write(f"2\n{-difference:.2f}\n")
+        self.process.stdin.flush()
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.communicate("4\n")
+        self.process = None
+
+
+class PythonWorker:
+    """Application Python exécutée dans l'interpréteur du worker, sans relance.
+
+    Le worker dispose d'un répertoire temporaire qui lui est propre : le
+    fichier account_data.json y est réécrit avant chaque scénario et passé
+    explicitement à l'application, quels que soient $ACCOUNT_DATA_FILE et
+    $ACCOUNT_STORAGE. Le répertoire courant du processus n'est pas modifié.
+    """
+
+    def __init__(self, directory):
+        import app
+        self.app = app
+        self.directory = directory
+
+    def run(self, inputs):
+        data_file = os.path.join(self.directory, "account_data.json")
+        with open(data_file, 'w') as file:
+            json.dump({'balance': INITIAL_BALANCE}, file)
+
+        inputs = list(inputs) if "4" in inputs else list(inputs) + ["1"]
+        stdout = io.StringIO()
+        with patch('sys.stdin', io.StringIO("\n".join(inputs) + "\n")), contextlib.redirect_stdout(stdout):
+            try:
+                self.app.main(["--data-file", data_file, "--storage", "json"])
+            except EOFError:
+                pass
+        return trajectory(stdout.getvalue(), _PYTHON_VIEW)
+
+
+_worker = None
+
+
+def _init_worker(with_cobol, root):
+    global _worker
+    # Sous-répertoire de celui de run_scenarios, supprimé avec lui
+    directory = tempfile.mkdtemp(prefix="worker-", dir=root)
+    _worker = (PythonWorker(directory), CobolWorker() if with_cobol else None)
+
+
+def _run_scenario(scenario):
+    python_worker, cobol_worker = _worker
+    python_balances = python_worker.run(scenario)
+    cobol_balances = cobol_worker.run(scenario) if cobol_worker is not None else None
+    return scenario, python_balances, cobol_balances
+
+
+def run_scenarios(scenarios, workers=None, with_cobol=True, chunksize=16):
+    """Exécute les scénarios en parallèle ; retourne (scénario, soldes Python, soldes COBOL)"""
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory(prefix="parity-") as root:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(with_cobol, root)) as pool:
+            return list(pool.imap_unordered(_run_scenario, scenarios, chunksize))
+
+
+def generate_scenarios(count, length=8, seed=None):
+    """Scénarios aléatoires de choix de menu et de montants valides, sans « 4 »"""
+    rng = random.Random(seed)
+    scenarios = []
+    for _ in range(count):
+        inputs = []
+        for _ in range(length):
+            choice = rng.choice("1239")
+            inputs.append(choice)
+            if choice in "23":
+                inputs.append(f"{rng.randint(1, 200000) / 100:.2f}")
+        scenarios.append(inputs)
+    return scenarios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tests de parité COBOL / Python sur des scénarios générés")
+    parser.add_argument('--scenarios', type=int, default=1000, help="Nombre de scénarios")
+    parser.add_argument('--length', type=int, default=8, help="Nombre de choix de menu par scénario")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de workers (un par cœur par défaut)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--python-only', action='store_true', help="N'exécuter que l'application Python")
+    args = parser.parse_args(argv)
+
+    with_cobol = not args.python_only
+    if with_cobol and not os.path.exists(COBOL_APP_PATH):
+        print(f"ERREUR: L'exécutable COBOL '{COBOL_APP_PATH}' n'existe pas.")
+        return 1
+
+    scenarios = generate_scenarios(args.scenarios, args.length, args.seed)
+    started = time.perf_counter()
+    results = run_scenarios(scenarios, args.workers, with_cobol)
+    elapsed = time.perf_counter() - started
+
+    mismatches = [result for result in results if with_cobol and result[1] != result[2]]
+    for scenario, python_balances, cobol_balances in mismatches[:10]:
+        print(f"DIVERGENCE {scenario}: Python={python_balances} COBOL={cobol_balances}")
+    print(f"{len(results)} scénarios en {elapsed:.2f}s ({len(results) / elapsed:,.0f} scénarios/s), "
+          f"{len(mismatches)} divergences")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,482 @@
 import os
-import json
+import time
+from itertools import repeat
+
+from journal import TransactionLog, DURABILITY_ALWAYS
+from money import Money, to_cents, format_cents
+from locking import make_lock, CONCURRENCY_PROCESS
+from storage import make_backend, resolve_data_file, JsonBackend, DEFAULT_BALANCE_CENTS
+from metrics import Metrics
+
+# Les modules des modes optionnels (commit groupé, historique, idempotence,
+# table partagée) ne sont importés que s'ils sont activés : le démarrage d'un
+# processus court (app.py) ne paie pas concurrent.futures, hashlib, etc.
+
+INVALID_AMOUNT = "invalid_amount"
+INSUFFICIENT_FUNDS = "insufficient_funds"
+UNKNOWN_OPERATION = "unknown_operation"
+OVERFLOW = "overflow"
+READ_ONLY = "read_only"
+INVALID_REQUEST = "invalid_request"
+
+ERROR_MESSAGES = {
+    INVALID_AMOUNT: "Le montant doit être supérieur à zéro.",
+    INSUFFICIENT_FUNDS: "Fonds insuffisants.",
+    UNKNOWN_OPERATION: "Opération inconnue.",
+    OVERFLOW: "Le solde dépasserait la capacité maximale du compte.",
+    READ_ONLY: "Compte en lecture seule.",
+    INVALID_REQUEST: "Numéro de compte ou montant invalide.",
+}
+
+# Codes entiers des résultats conservés par le cache d'idempotence
+_OP_CODES = {"credit": 1, "debit": 2}
+_OP_NAMES = {code: name for name, code in _OP_CODES.items()}
+_RESULT_CODES = (None, INVALID_AMOUNT, INSUFFICIENT_FUNDS, UNKNOWN_OPERATION, OVERFLOW)
+_RESULT_INDEX = {error: code for code, error in enumerate(_RESULT_CODES)}
+
+# Une date de modification plus récente que cette fenêtre n'est pas fiable
+# (granularité de l'horodatage du système de fichiers) : le fichier est relu
+RACY_WINDOW_NS = 50000000
 
 class AccountManager:
-    def __init__(self, data_file="account_data.json"):
+    def __init__(self, data_file=None, journal=False, durability=DURABILITY_ALWAYS, max_balance=None,
+                 concurrency=None, storage=None, group_commit=False, commit_interval_ms=10,
+                 commit_max_ops=1000, watch=False, history=False, snapshot_every=1000,
+                 metrics=False, idempotency=False, idempotency_capacity=None, idempotency_ttl=None,
+                 shared_table=False, sidecar=False):
+        # Sans argument : $ACCOUNT_DATA_FILE et $ACCOUNT_STORAGE, sinon account_data.json
+        # en JSON (account_data.dat en mmap, account_data.db en SQLite)
+        data_file = resolve_data_file(data_file, storage)
         self.data_file = data_file
-        self.balance = self._load_balance()
+        # metrics=True (ou une instance de metrics.Metrics) : chargement, écriture,
+        # consultation, crédit, débit et lots sont chronométrés dans les méthodes
+        # elles-mêmes, derrière un seul test de self.metrics ; les échecs de
+        # validation sont comptés par motif. Metrics(sample_every=N) ne
+        # chronomètre qu'un appel sur N (opérations de quelques microsecondes)
+        self.metrics = None
+        if metrics:
+            self.metrics = Metrics() if metrics is True else metrics
+            self._histograms = {op: self.metrics.histogram(op)
+                                for op in ("load", "save", "balance", "credit", "debit", "batch")}
+        # Persistance du solde (storage.py) : "json", "mmap" (enregistrement binaire
+        # projeté en mémoire), "sqlite" (mode WAL), "memory", ou une instance de backend
+        # sidecar=True : cache binaire du solde à côté du fichier JSON (voir storage.JsonBackend)
+        self.backend = make_backend(storage, data_file, sidecar)
+        if journal and not isinstance(self.backend, JsonBackend):
+            self.backend.close()
+            raise ValueError("Le mode journal n'est disponible qu'avec le stockage JSON.")
+        # concurrency="thread" sérialise les threads partageant l'instance ;
+        # concurrency="process" prend en plus un verrou de fichier et relit le
+        # solde sur disque avant chaque opération, pour les processus partageant le fichier
+        self._lock = make_lock(concurrency, data_file)
+        self._shared = concurrency == CONCURRENCY_PROCESS
+        # En mode journal, chaque opération est ajoutée au fichier <data_file>.wal
+        # au lieu de réécrire le fichier de données, qui devient un instantané
+        self.journal = TransactionLog(data_file, durability) if journal else None
+        # history=True (ou un chemin) : chaque opération acceptée est ajoutée à
+        # l'historique indexé <data_file>.hist (relevés, solde à une date)
+        if history:
+            if self._shared:
+                raise ValueError("L'historique est incompatible avec concurrency=\"process\".")
+            from history import TransactionHistory, SnapshotLog
+            self.history = TransactionHistory(history if isinstance(history, str) else data_file + ".hist")
+            # Instantané du solde toutes les `snapshot_every` opérations : balance_at
+            # ne cherche la date qu'entre le plus proche et le suivant
+            self.snapshots = SnapshotLog(self.history.path + ".snap")
+            self.snapshot_every = snapshot_every
+        else:
+            self.history = None
+            self.snapshots = None
+        # Plafond optionnel, par exemple money.PIC_9_6_V99_MAX pour reproduire PIC 9(6)V99
+        self.max_cents = to_cents(max_balance) if max_balance is not None else None
+        # watch=True : chargement différé au premier accès, puis revalidation par
+        # inode/taille/date de modification avant chaque lecture ou opération ;
+        # le fichier n'est relu que s'il a changé (processus de supervision)
+        self._watch = watch
+        self._signature = None
+        if watch or self._shared:
+            self._cents = None
+        else:
+            self.balance = self._load_balance()
+        if self.snapshots is not None and not len(self.snapshots):
+            # Instantané initial : solde avant toute opération historisée
+            timestamp = max(time.time_ns(), self.history.last_timestamp)
+            self.snapshots.append(timestamp, len(self.history), self.balance.cents)
+        # idempotency=True (ou un chemin) : une opération portant un request_id déjà
+        # vu retourne le résultat d'origine sans être rejouée. Les résultats sont
+        # ajoutés à <data_file>.idem juste avant chaque écriture du solde ; au
+        # chargement, ceux dont le solde n'a jamais été persisté sont oubliés
+        if idempotency:
+            if self._shared:
+                raise ValueError("L'idempotence est incompatible avec concurrency=\"process\".")
+            if isinstance(idempotency, str):
+                path = idempotency
+            else:
+                path = data_file + ".idem" if self.backend.paths else None
+            from idempotency import IdempotencyCache
+            limits = {'capacity': idempotency_capacity, 'ttl': idempotency_ttl}
+            self.idempotency = IdempotencyCache(path, **{key: value for key, value in limits.items() if value is not None})
+            self.idempotency.recover(self.balance.cents)
+        else:
+            self.idempotency = None
+        # shared_table=True (ou un chemin) : chaque nouveau solde est publié dans la
+        # table projetée en mémoire <data_file>.tbl, lue sans analyse par d'autres
+        # processus via balance_table.BalanceView (cette instance est le seul écrivain)
+        self.table = None
+        if shared_table:
+            if self._shared:
+                raise ValueError("La table des soldes partagée est incompatible avec concurrency=\"process\".")
+            from balance_table import BalanceTable
+            self.table = BalanceTable(shared_table if isinstance(shared_table, str) else data_file + ".tbl")
+            self.table.publish(self.balance.cents)
+        # En commit groupé, les opérations ne modifient que la mémoire ; un thread
+        # d'écriture persiste l'état toutes les commit_interval_ms ou commit_max_ops
+        self._scheduler = None
+        if group_commit:
+            if self._shared or watch:
+                raise ValueError("Le commit groupé est incompatible avec concurrency=\"process\" et watch=True.")
+            self._committed_cents = self._cents
+            from commit_scheduler import CommitScheduler
+            self._scheduler = CommitScheduler(self._commit, commit_interval_ms, commit_max_ops)
+
+    # Le solde est conservé en centimes entiers ; la propriété expose un Money
+    @property
+    def balance(self):
+        if self._cents is None:
+            self._refresh()
+        return Money(self._cents)
+
+    @balance.setter
+    def balance(self, value):
+        self._cents = to_cents(value)
 
     def _load_balance(self):
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as file:
-                    data = json.load(file)
-                    return data.get('balance', 1000.0)
-            except (json.JSONDecodeError, IOError):
-                pass
-        return 1000.0
-
-    def _save_balance(self):
-        try:
-            with open(self.data_file, 'w') as file:
-                json.dump({'balance': self.balance}, file)
+        started = self._histograms["load"].start() if self.metrics is not None else 0
+        cents = self.backend.load(DEFAULT_BALANCE_CENTS)
+        if self.journal is not None:
+            cents = self.journal.recover(cents)
+        if started:
+            self._histograms["load"].stop(started)
+        return Money(cents)
+
+    def _save_balance(self, op=None, amount=0):
+        if self.table is not None:
+            self.table.publish(self._cents)
+        if self._scheduler is not None and op is not None:
+            self._scheduler.mark_dirty()
             return True
-        except IOError:
+        if self.idempotency is not None:
+            self.idempotency.seal(self._cents)
+        return self._write_balance(op, amount, self._cents)
+
+    def _write_balance(self, op, amount, cents):
+        started = self._histograms["save"].start() if self.metrics is not None else 0
+        if self.journal is not None and op is not None:
+            try:
+                self.journal.append(op, amount, cents)
+                saved = True
+            except IOError:
+                saved = False
+        else:
+            saved = self.backend.save(cents)
+        if started:
+            self._histograms["save"].stop(started)
+        return saved
+
+    def _commit(self):
+        # Appelé par le thread d'écriture du commit groupé
+        with self._lock:
+            cents = self._cents
+            if self.idempotency is not None:
+                self.idempotency.seal(cents)
+        # En cas d'échec, le prochain essai repart du dernier solde persisté
+        if not self._write_balance("batch", cents - self._committed_cents, cents):
             return False
+        self._committed_cents = cents
+        return True
+
+    def commit_future(self):
+        """Future résolu quand les opérations déjà effectuées sont persistées (commit groupé)"""
+        if self._scheduler is None:
+            from concurrent.futures import Future
+            future = Future()
+            future.set_result(0)
+            return future
+        return self._scheduler.commit_future()
+
+    def flush(self, timeout=None):
+        if self._scheduler is not None:
+            self._scheduler.flush(timeout)
+
+    def commit_metrics(self):
+        return self._scheduler.metrics() if self._scheduler is not None else None
+
+    def _refused(self, op, error, started):
+        # Échec de validation : compté, et chronométré si l'appel est échantillonné
+        if self.metrics is not None:
+            if started:
+                self._histograms[op].stop(started)
+            self.metrics.increment("failures", op, error)
+        return False, ERROR_MESSAGES[error]
+
+    def _file_signature(self):
+        signature = []
+        paths = self.backend.paths + ((self.journal.log_file,) if self.journal is not None else ())
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stat = None
+            signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns) if stat is not None else None)
+        return signature
+
+    def _refresh(self):
+        if not (self._shared or self._watch):
+            return
+        if not self.backend.paths:
+            self._cents = self.backend.load(DEFAULT_BALANCE_CENTS)
+            return
+        signature = self._file_signature()
+        if signature != self._signature or self._cents is None:
+            self._cents = self._load_balance().cents
+            # Le cache n'est retenu que si aucun fichier n'a été modifié dans la
+            # fenêtre de granularité : sinon une écriture de même taille et de
+            # même date pourrait passer inaperçue
+            recent = time.time_ns() - RACY_WINDOW_NS
+            stable = all(entry is None or entry[2] < recent for entry in signature)
+            self._signature = signature if stable else None
+
+    def close(self):
+        try:
+            if self._scheduler is not None:
+                self._scheduler.close()
+        finally:
+            self._close_storage()
+
+    def _close_storage(self):
+        if self.journal is not None:
+            self.journal.close()
+        self.backend.close()
+        if self.idempotency is not None:
+            self.idempotency.close()
+        if self.table is not None:
+            self.table.close()
+        if self.history is not None:
+            self.history.close()
+            self.snapshots.close()
+        if self._shared:
+            self._lock.close()
+
+    def _record(self, op, cents, balance):
+        rows = self.history.append(0, op, cents, balance) + 1
+        if rows - self.snapshots.rows[-1] >= self.snapshot_every:
+            self.snapshots.append(self.history.last_timestamp, rows, balance)
+
+    def balance_at(self, timestamp):
+        """Solde à la date `timestamp` (secondes, comme time.time()), ou None si elle précède l'historique.
+
+        Part de l'instantané le plus proche : chaque ligne d'historique porte le
+        solde résultant, la dernière ligne antérieure à la date se trouve par
+        dichotomie entre cet instantané et le suivant, sans rejouer les
+        opérations. Au plus log2(snapshot_every) lignes sont lues, quelle que
+        soit la longueur de l'historique.
+        """
+        if self.history is None:
+            raise ValueError("balance_at nécessite history=True.")
+        moment = int(timestamp * 1_000_000_000)
+        snapshot = self.snapshots.before(moment)
+        if snapshot is None:
+            return None
+        _, rows, cents = snapshot
+        last = self.history.row_after(moment, rows, self.snapshots.rows_after(moment))
+        if last > rows:
+            return self.history[last - 1].balance
+        # Aucune opération entre l'instantané et la date
+        return Money(cents)
 
     def get_balance(self):
-        return self.balance
+        started = self._histograms["balance"].start() if self.metrics is not None else 0
+        if self._shared:
+            with self._lock:
+                self._refresh()
+        elif self._watch:
+            self._refresh()
+        balance = Money(self._cents)
+        if started:
+            self._histograms["balance"].stop(started)
+        return balance
+
+    def credit_account(self, amount, request_id=None):
+        started = self._histograms["credit"].start() if self.metrics is not None else 0
+        if request_id is not None:
+            return self._apply_once("credit", amount, request_id, started)
+        cents = to_cents(amount)
+        if cents <= 0:
+            return self._refused("credit", INVALID_AMOUNT, started)
+
+        with self._lock:
+            self._refresh()
+            if self.max_cents is not None and self._cents + cents > self.max_cents:
+                return self._refused("credit", OVERFLOW, started)
+
+            self._cents += cents
+            balance = self._cents
+            self._save_balance("credit", cents)
+            if self.history is not None:
+                self._record("credit", cents, balance)
+        if started:
+            self._histograms["credit"].stop(started)
+        return True, f"Compte crédité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"
+
+    def debit_account(self, amount, request_id=None):
+        started = self._histograms["debit"].start() if self.metrics is not None else 0
+        if request_id is not None:
+            return self._apply_once("debit", amount, request_id, started)
+        cents = to_cents(amount)
+        if cents <= 0:
+            return self._refused("debit", INVALID_AMOUNT, started)
+
+        with self._lock:
+            self._refresh()
+            if cents > self._cents:
+                return self._refused("debit", INSUFFICIENT_FUNDS, started)
+
+            self._cents -= cents
+            balance = self._cents
+            self._save_balance("debit", cents)
+            if self.history is not None:
+                self._record("debit", cents, balance)
+        if started:
+            self._histograms["debit"].stop(started)
+        return True, f"Compte débité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"
+
+    def _apply_once(self, op, amount, request_id, started=0):
+        # Opération unitaire avec clé d'idempotence : lot d'une opération
+        if self.idempotency is None:
+            raise ValueError("request_id nécessite idempotency=True.")
+        # Montant illisible : ValueError, comme sans clé
+        cents = to_cents(amount)
+        with self._lock:
+            self._refresh()
+            result = self._apply_batch(((op, Money(cents)),), True, (request_id,))[0]
+        # Échec éventuel déjà compté par _apply_batch
+        if started:
+            self._histograms[op].stop(started)
+        return result
+
+    def apply_batch(self, ops, messages=False, request_ids=None):
+        """Applique une suite de (opération, montant) dans l'ordre, avec une seule écriture.
+
+        Chaque opération est validée comme credit_account/debit_account ; un montant
+        illisible est refusé (invalid_amount) sans interrompre le lot. Le résultat
+        par opération est (succès, None) ou (False, code d'erreur) ; avec
+        messages=True, il s'agit des mêmes messages que les opérations unitaires.
+        `request_ids` donne une clé d'idempotence (ou None) par opération : une
+        clé déjà vue retourne le résultat d'origine (idempotency=True requis).
+        """
+        if request_ids is not None:
+            if self.idempotency is None:
+                raise ValueError("request_id nécessite idempotency=True.")
+            ops, request_ids = list(ops), list(request_ids)
+            if len(ops) != len(request_ids):
+                raise ValueError("request_ids doit contenir une clé (ou None) par opération.")
+        started = self._histograms["batch"].start() if self.metrics is not None else 0
+        with self._lock:
+            self._refresh()
+            results = self._apply_batch(ops, messages, request_ids)
+        if started:
+            self._histograms["batch"].stop(started)
+        return results
+
+    def _apply_batch(self, ops, messages, request_ids=None):
+        balance = self._cents
+        max_cents = self.max_cents
+        # Lignes d'historique écrites après le solde, comme pour credit_account
+        rows = [] if self.history is not None else None
+        cache = self.idempotency
+        # Les clés ne sont publiées qu'une fois le lot entièrement évalué :
+        # une erreur en cours de lot ne laisse aucune clé sans solde écrit
+        entries = []
+        seen = {}
+        # Refus par (opération, code), comptés en une fois après le lot
+        failures = {} if self.metrics is not None else None
+        results = []
+        append = results.append
+        for (op, amount), request_id in zip(ops, repeat(None) if request_ids is None else request_ids):
+            try:
+                cents = to_cents(amount)
+            except (ValueError, TypeError, OverflowError):
+                cents = 0
+            if request_id is not None:
+                cached = seen.get(request_id) or cache.get(request_id)
+                if cached is not None:
+                    append(_cached_result(cached, messages))
+                    continue
+            if op != "credit" and op != "debit":
+                error = UNKNOWN_OPERATION
+            elif cents <= 0:
+                error = INVALID_AMOUNT
+            elif op == "debit":
+                if cents > balance:
+                    error = INSUFFICIENT_FUNDS
+                else:
+                    error = None
+                    balance -= cents
+            elif max_cents is not None and balance + cents > max_cents:
+                error = OVERFLOW
+            else:
+                error = None
+                balance += cents
 
-    def credit_account(self, amount):
-        if amount <= 0:
-            return False, "Le montant doit être supérieur à zéro."
+            if rows is not None and error is None:
+                rows.append((op, cents, balance))
+            if failures is not None and error is not None:
+                key = (op if op in _OP_CODES else "other", error)
+                failures[key] = failures.get(key, 0) + 1
+            if request_id is not None:
+                entry = (_OP_CODES.get(op, 0), _RESULT_INDEX[error], cents, balance)
+                seen[request_id] = entry
+                entries.append((request_id, entry))
 
-        self.balance += amount
-        self._save_balance()
-        return True, f"Compte crédité de {amount:.2f}. Nouveau solde: {self.balance:.2f}"
+            if not messages:
+                append((error is None, error))
+            elif error is not None:
+                append((False, ERROR_MESSAGES[error]))
+            elif op == "credit":
+                append((True, f"Compte crédité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"))
+            else:
+                append((True, f"Compte débité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"))
 
-    def debit_account(self, amount):
-        if amount <= 0:
-            return False, "Le montant doit être supérieur à zéro."
+        # Les clés précèdent immédiatement l'écriture du solde, qui les scelle (voir IdempotencyCache)
+        for request_id, entry in entries:
+            cache.put(request_id, *entry)
+        if balance != self._cents:
+            net = balance - self._cents
+            self._cents = balance
+            self._save_balance("batch", net)
+        elif entries:
+            # Échecs seulement : solde inchangé, les résultats sont scellés sans le réécrire
+            if self._scheduler is not None:
+                self._scheduler.mark_dirty()
+            else:
+                cache.seal(balance)
+        if rows:
+            for row in rows:
+                self._record(*row)
+        if failures:
+            for (op, error), count in failures.items():
+                self.metrics.increment("failures", op, error, count)
+        return results
 
-        if amount > self.balance:
-            return False, "Fonds insuffisants."
 
-        self.balance -= amount
-        self._save_balance()
-        return True, f"Compte débité de {amount:.2f}. Nouveau solde: {self.balance:.2f}"
+def _cached_result(cached, messages):
+    """Résultat d'origine, au format d'apply_batch, d'une entrée du cache d'idempotence"""
+    op, code, cents, balance = cached
+    error = _RESULT_CODES[code]
+    if not messages:
+        return error is None, error
+    if error is not None:
+        return False, ERROR_MESSAGES[error]
+    if _OP_NAMES[op] == "credit":
+        return True, f"Compte crédité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"
+    return True, f"Compte débité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"
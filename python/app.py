@@ -1,4 +1,28 @@
+import sys
+
+# Consultation du solde et client du démon : réponse avant tout autre import (fastpath.py)
+if __name__ == "__main__":
+    import fastpath
+    _status = fastpath.run(sys.argv[1:])
+    if _status is not None:
+        sys.exit(_status)
+
+import io
+import os
+import json
+import argparse
+from itertools import islice
+
 from account_manager import AccountManager
+from money import Money, to_cents, format_cents
+from storage import read_balance
+
+# Mode batch : commandes lues par paquets, chaque paquet appliqué en une écriture
+BATCH_CHUNK = 10000
+BATCH_COMMANDS = {
+    "1": "balance", "2": "credit", "3": "debit", "4": "quit",
+    "balance": "balance", "credit": "credit", "debit": "debit", "quit": "quit",
+}
 
 def display_menu():
     print("\n=== Application de Gestion de Compte ===")
@@ -11,7 +35,7 @@ def display_menu():
 def get_amount():
     while True:
         try:
-            amount = float(input("Entrez le montant: "))
+            amount = Money.parse(input("Entrez le montant: "))
             if amount < 0:
                 print("Le montant ne peut pas être négatif.")
                 continue
@@ -19,8 +43,154 @@ def get_amount():
         except ValueError:
             print("Veuillez entrer un montant valide.")
 
-def main():
-    account = AccountManager()
+def parse_command(line):
+    """Lit une ligne « commande [montant] » ; retourne None pour une ligne vide ou un commentaire"""
+    parts = line.split(None, 1)
+    if not parts or parts[0].startswith("#"):
+        return None
+    command = BATCH_COMMANDS.get(parts[0].lower(), parts[0])
+    try:
+        amount = Money.parse(parts[1]) if len(parts) > 1 else 0
+    except ValueError:
+        amount = 0
+    return command, amount
+
+def run_batch(account, source, output, chunk=BATCH_CHUNK):
+    """Exécute les commandes de `source` sans menu et écrit un résultat JSON par ligne.
+
+    Les commandes sont lues par paquets de `chunk` lignes ; les crédits et débits
+    d'un paquet passent par AccountManager.apply_batch (mêmes validations, une
+    seule écriture) et les consultations reçoivent le solde courant du paquet.
+    Retourne le nombre de commandes traitées.
+    """
+    processed = 0
+    finished = False
+    while not finished:
+        lines = list(islice(source, chunk))
+        if not lines:
+            break
+        ops = []
+        for line in lines:
+            command = parse_command(line)
+            if command is None:
+                continue
+            if command[0] == "quit":
+                finished = True
+                break
+            ops.append(command)
+
+        balance = account.get_balance().cents
+        results = account.apply_batch(ops)
+        records = []
+        append = records.append
+        for (op, amount), (success, error) in zip(ops, results):
+            if op == "balance":
+                append(f'{{"op":"balance","ok":true,"balance":{format_cents(balance)}}}\n')
+                continue
+            cents = to_cents(amount)
+            if success:
+                balance += cents if op == "credit" else -cents
+                append(f'{{"op":"{op}","ok":true,"amount":{format_cents(cents)},"balance":{format_cents(balance)}}}\n')
+            else:
+                append(f'{{"op":{json.dumps(op)},"ok":false,"amount":{format_cents(cents)},'
+                       f'"error":"{error}","balance":{format_cents(balance)}}}\n')
+        output.write("".join(records))
+        processed += len(ops)
+    output.flush()
+    return processed
+
+def serve(account, socket_path):
+    """Démon : garde le compte chargé et exécute en mode batch les commandes de chaque connexion.
+
+    Les commandes sont lues en entier (jusqu'à la fermeture en écriture du
+    client) avant la première réponse : un client qui envoie tout puis lit
+    ne peut pas bloquer le démon, quelle que soit la taille du lot. Un client
+    parti en cours d'échange ne met fin qu'à sa connexion.
+    """
+    import socket
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    try:
+        while True:
+            connection, _ = server.accept()
+            try:
+                with connection:
+                    chunks = []
+                    while True:
+                        chunk = connection.recv(1 << 16)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                    output = io.StringIO()
+                    run_batch(account, io.StringIO(b"".join(chunks).decode(errors="replace")), output)
+                    connection.sendall(output.getvalue().encode())
+            except OSError:
+                continue
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.unlink(socket_path)
+    return 0
+
+def main(argv=()):
+    parser = argparse.ArgumentParser(description="Application de gestion de compte")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FICHIER",
+                        help="Mode non interactif : commandes lues sur l'entrée standard ou dans FICHIER, "
+                             "résultats en JSONL")
+    parser.add_argument("--data-file",
+                        help="Fichier de données du compte ($ACCOUNT_DATA_FILE, sinon account_data.json ; "
+                             "account_data.dat en mmap, account_data.db en sqlite)")
+    parser.add_argument("--storage", choices=("json", "binary", "mmap", "sqlite", "memory"),
+                        help="Stockage du solde ($ACCOUNT_STORAGE, json par défaut)")
+    parser.add_argument("--balance", action="store_true", help="Afficher le solde et quitter")
+    parser.add_argument("--serve", metavar="SOCKET",
+                        help="Démon : garder le compte chargé et répondre sur la socket Unix SOCKET")
+    parser.add_argument("--client", metavar="SOCKET",
+                        help="Envoyer --balance ou --batch au démon SOCKET (exécution locale s'il ne répond pas)")
+    args = parser.parse_args(argv)
+
+    if args.client is not None and (args.balance or args.batch is not None):
+        import fastpath
+        connection = fastpath.connect(args.client)
+        if connection is not None:
+            if args.balance:
+                payload = b"balance\n"
+            elif args.batch == "-":
+                payload = sys.stdin.buffer.read()
+            else:
+                with open(args.batch, 'rb') as source:
+                    payload = source.read()
+            response = fastpath.exchange(connection, payload)
+            if args.balance:
+                print(fastpath.balance_text(response))
+            else:
+                sys.stdout.buffer.write(response)
+            return 0
+
+    # Consultation en lecture seule : aucun fichier créé ni réécrit
+    if args.balance and args.serve is None:
+        print(format_cents(read_balance(args.storage, args.data_file, sidecar=True)))
+        return 0
+
+    # Modes scriptés : cache binaire du fichier JSON, pour que les consultations
+    # suivantes (--balance) évitent son analyse
+    account = AccountManager(args.data_file, storage=args.storage,
+                             sidecar=args.balance or args.batch is not None)
+
+    if args.serve is not None:
+        return serve(account, args.serve)
+
+    if args.batch is not None:
+        if args.batch == "-":
+            run_batch(account, sys.stdin, sys.stdout)
+        else:
+            with open(args.batch, 'r', buffering=1 << 20) as source:
+                run_batch(account, source, sys.stdout)
+        return 0
 
     while True:
         choice = display_menu()
@@ -42,6 +212,7 @@ def main():
                 break
             case _:
                 print("Option invalide. Veuillez réessayer.")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,116 @@
+import zlib
+import struct
+
+from money import to_cents
+
+# Enregistrement de solde (24 octets, petit-boutiste) : signature, version, octet réservé,
+# numéro de compte, solde en centimes, puis crc32 des 20 octets précédents
+_BODY = struct.Struct("<2sBxQq")
+_CHECKSUM = struct.Struct("<I")
+RECORD_SIZE = _BODY.size + _CHECKSUM.size
+MAGIC = b"BR"
+VERSION = 1
+
+FORMAT_BINARY = "binary"
+FORMAT_JSON = "json"
+
+
+def encode(cents, account_id=0):
+    """Enregistrement binaire d'un solde en centimes"""
+    body = _BODY.pack(MAGIC, VERSION, account_id, cents)
+    return body + _CHECKSUM.pack(zlib.crc32(body))
+
+
+def decode(data, offset=0):
+    """Retourne (compte, centimes) de l'enregistrement à `offset` ; ValueError s'il est tronqué ou corrompu"""
+    if len(data) - offset < RECORD_SIZE:
+        raise ValueError("Enregistrement de solde tronqué.")
+    magic, version, account_id, cents = _BODY.unpack_from(data, offset)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Format d'enregistrement de solde non reconnu (version {version}).")
+    if _CHECKSUM.unpack_from(data, offset + _BODY.size)[0] != zlib.crc32(data[offset:offset + _BODY.size]):
+        raise ValueError("Enregistrement de solde corrompu (crc32).")
+    return account_id, cents
+
+
+def encode_many(records):
+    """Encode des couples (compte, centimes) bout à bout"""
+    pack = _BODY.pack
+    checksum = _CHECKSUM.pack
+    crc32 = zlib.crc32
+    chunks = []
+    for account_id, cents in records:
+        body = pack(MAGIC, VERSION, account_id, cents)
+        chunks.append(body)
+        chunks.append(checksum(crc32(body)))
+    return b"".join(chunks)
+
+
+def detect(data):
+    """Format d'un contenu : enregistrement binaire, sinon JSON historique {"balance": ...}"""
+    return FORMAT_BINARY if data[:len(MAGIC)] == MAGIC else FORMAT_JSON
+
+
+def decode_legacy(data):
+    """Solde en centimes d'un contenu JSON historique ; ValueError s'il est illisible"""
+    import json
+    try:
+        return to_cents(json.loads(data).get('balance', 1000.0))
+    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError, TypeError) as error:
+        raise ValueError(f"Solde JSON illisible: {error}") from None
+
+
+class RecordWriter:
+    """Encodeur en flux : accumule les enregistrements et les écrit par paquets dans un flux binaire"""
+
+    def __init__(self, stream, buffer_records=4096):
+        self.stream = stream
+        self.buffer_records = buffer_records
+        self._chunks = []
+
+    def write(self, cents, account_id=0):
+        self._chunks.append(encode(cents, account_id))
+        if len(self._chunks) >= self.buffer_records:
+            self.flush()
+
+    def write_many(self, records):
+        self.flush()
+        self.stream.write(encode_many(records))
+
+    def flush(self):
+        if self._chunks:
+            self.stream.write(b"".join(self._chunks))
+            self._chunks = []
+        self.stream.flush()
+
+
+class RecordReader:
+    """Décodeur en flux : reçoit des octets par morceaux quelconques (socket, fichier) et rend les enregistrements complets"""
+
+    def __init__(self):
+        self._buffer = b""
+
+    @property
+    def pending(self):
+        """Octets reçus d'un enregistrement encore incomplet"""
+        return len(self._buffer)
+
+    def feed(self, data):
+        """Ajoute des octets reçus ; retourne la liste des (compte, centimes) complétés"""
+        buffer = self._buffer + data if self._buffer else bytes(data)
+        complete = len(buffer) - len(buffer) % RECORD_SIZE
+        records = [decode(buffer, offset) for offset in range(0, complete, RECORD_SIZE)]
+        self._buffer = buffer[complete:]
+        return records
+
+
+def iter_records(stream, chunk_size=1 << 16):
+    """Itère sur les (compte, centimes) d'un flux binaire ; ValueError s'il se termine en plein enregistrement"""
+    reader = RecordReader()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield from reader.feed(chunk)
+    if reader.pending:
+        raise ValueError("Enregistrement de solde tronqué en fin de flux.")
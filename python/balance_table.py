@@ -0,0 +1,152 @@
+import os
+import time
+import mmap
+import struct
+
+from money import Money
+from account_manager import ERROR_MESSAGES, READ_ONLY
+
+# Emplacement : numéro de séquence (impair pendant une mise à jour), compte, solde en centimes
+SLOT = struct.Struct("<QQq")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_AND_BALANCE = struct.Struct("<Q8xq")
+_BALANCE_OFFSET = 16
+# En-tête : signature, version, taille d'emplacement, capacité, nombre d'emplacements utilisés
+HEADER = struct.Struct("<4sHHQQ")
+MAGIC = b"BTBL"
+VERSION = 1
+_COUNT_OFFSET = 16
+DEFAULT_CAPACITY = 1024
+# Relectures tolérées avant de conclure que l'écrivain s'est arrêté en pleine mise à jour
+_MAX_RETRIES = 1000000
+
+
+class BalanceTable:
+    """Table des soldes en mémoire partagée, tenue par un seul processus écrivain.
+
+    Fichier projeté en mémoire (un fichier de /dev/shm reste en RAM) : les
+    lecteurs d'autres processus y lisent les soldes sans copie ni analyse
+    (voir BalanceView). Chaque emplacement est protégé par un seqlock : le
+    numéro de séquence devient impair avant l'écriture du solde et pair
+    après ; un lecteur qui voit une séquence impaire ou modifiée recommence.
+    La capacité est fixée à la création pour que les projections des
+    lecteurs restent valides.
+    """
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY):
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+            with open(path, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, VERSION, SLOT.size, capacity, 0))
+                file.truncate(HEADER.size + capacity * SLOT.size)
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, slot_size, self.capacity, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or slot_size != SLOT.size:
+            self.close()
+            raise ValueError(f"Format de table des soldes non reconnu: {path}")
+
+        self._offsets = {}
+        for slot in range(count):
+            offset = HEADER.size + slot * SLOT.size
+            sequence, account_id, _ = SLOT.unpack_from(self._map, offset)
+            # Écrivain précédent arrêté en pleine mise à jour : le solde écrit reste valable
+            if sequence & 1:
+                _SEQUENCE.pack_into(self._map, offset, sequence + 1)
+            self._offsets[account_id] = offset
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _add(self, account_id, cents):
+        count = len(self._offsets)
+        if count >= self.capacity:
+            raise ValueError(f"Table des soldes pleine ({self.capacity} comptes).")
+        offset = HEADER.size + count * SLOT.size
+        SLOT.pack_into(self._map, offset, 0, account_id, cents)
+        # Le compteur n'est augmenté qu'une fois l'emplacement écrit
+        struct.pack_into("<Q", self._map, _COUNT_OFFSET, count + 1)
+        self._offsets[account_id] = offset
+
+    def publish(self, cents, account_id=0):
+        """Met à jour le solde (en centimes) d'un compte"""
+        offset = self._offsets.get(account_id)
+        if offset is None:
+            self._add(account_id, cents)
+            return
+        buffer = self._map
+        sequence = _SEQUENCE.unpack_from(buffer, offset)[0]
+        _SEQUENCE.pack_into(buffer, offset, sequence + 1)
+        struct.pack_into("<q", buffer, offset + _BALANCE_OFFSET, cents)
+        _SEQUENCE.pack_into(buffer, offset, sequence + 2)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class BalanceView:
+    """Vue en lecture seule d'un compte publié dans une BalanceTable, compatible avec AccountManager.
+
+    `get_balance()` et `balance` lisent le solde dans la projection partagée
+    (quelques centaines de nanosecondes, sans verrou ni appel système) ;
+    les opérations de modification échouent avec le code READ_ONLY.
+    """
+
+    def __init__(self, path, account_id=0):
+        self.path = path
+        self.account_id = account_id
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, slot_size, _, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or slot_size != SLOT.size:
+            self.close()
+            raise ValueError(f"Format de table des soldes non reconnu: {path}")
+        self._offset = None
+
+    def _find(self):
+        count = struct.unpack_from("<Q", self._map, _COUNT_OFFSET)[0]
+        for slot in range(count):
+            offset = HEADER.size + slot * SLOT.size
+            if SLOT.unpack_from(self._map, offset)[1] == self.account_id:
+                self._offset = offset
+                return offset
+        raise KeyError(f"Compte non publié dans la table des soldes: {self.account_id}")
+
+    def cents(self):
+        """Solde en centimes, lu de façon cohérente"""
+        offset = self._offset
+        if offset is None:
+            offset = self._find()
+        buffer = self._map
+        for _ in range(_MAX_RETRIES):
+            sequence, cents = _SEQUENCE_AND_BALANCE.unpack_from(buffer, offset)
+            if not sequence & 1 and _SEQUENCE.unpack_from(buffer, offset)[0] == sequence:
+                return cents
+            time.sleep(0)
+        raise TimeoutError("Solde en cours de mise à jour : l'écrivain ne répond plus.")
+
+    @property
+    def balance(self):
+        return Money(self.cents())
+
+    def get_balance(self):
+        return Money(self.cents())
+
+    def credit_account(self, amount, request_id=None):
+        return False, ERROR_MESSAGES[READ_ONLY]
+
+    def debit_account(self, amount, request_id=None):
+        return False, ERROR_MESSAGES[READ_ONLY]
+
+    def apply_batch(self, ops, messages=False, request_ids=None):
+        result = (False, ERROR_MESSAGES[READ_ONLY] if messages else READ_ONLY)
+        return [result for _ in ops]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
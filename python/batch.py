@@ -0,0 +1,59 @@
+import sys
+import argparse
+
+from account_manager import AccountManager
+from money import Money
+
+
+def parse_ops(lines):
+    """Lit des lignes « opération montant » ou « opération,montant ».
+
+    Seule la virgule qui suit l'opération sépare les champs : le montant
+    garde sa virgule décimale (« credit 12,50 », « credit,12,50 »), comme
+    avec Money.parse et app.py --batch.
+    """
+    for line in lines:
+        parts = line.split(None, 1)
+        if not parts or parts[0].startswith("#"):
+            continue
+        op, _, amount = parts[0].partition(",")
+        if len(parts) > 1:
+            amount = f"{amount} {parts[1]}" if amount else parts[1]
+        try:
+            yield op.lower(), Money.parse(amount)
+        except ValueError:
+            yield op.lower(), 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Application d'un lot d'opérations en une seule écriture")
+    parser.add_argument("file", nargs="?", help="Fichier d'opérations (entrée standard par défaut)")
+    parser.add_argument("--data-file",
+                        help="Fichier de données du compte ($ACCOUNT_DATA_FILE, sinon account_data.json ; "
+                             "account_data.dat en mmap, account_data.db en sqlite)")
+    parser.add_argument("--storage", choices=("json", "binary", "mmap", "sqlite", "memory"),
+                        help="Stockage du solde ($ACCOUNT_STORAGE, json par défaut)")
+    parser.add_argument("--verbose", action="store_true", help="Afficher le message de chaque opération")
+    args = parser.parse_args(argv)
+
+    account = AccountManager(args.data_file, storage=args.storage)
+    source = open(args.file, 'r') if args.file else sys.stdin
+    try:
+        results = account.apply_batch(parse_ops(source), messages=args.verbose)
+    finally:
+        if args.file:
+            source.close()
+
+    if args.verbose:
+        for _, message in results:
+            print(message)
+
+    applied = sum(1 for success, _ in results if success)
+    print(f"Opérations appliquées: {applied}")
+    print(f"Opérations rejetées: {len(results) - applied}")
+    print(f"Solde final: {account.get_balance():.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+from array import array
+from decimal import Decimal, InvalidOperation
+
+from account_manager import ERROR_MESSAGES, INVALID_AMOUNT, INSUFFICIENT_FUNDS, UNKNOWN_OPERATION
+from money import to_cents, format_cents
+
+try:
+    import numpy
+except ImportError:  # calcul compte par compte en Python pur, même résultat
+    numpy = None
+
+# Taux exprimés en milliardièmes : les intérêts sont calculés en entiers, sans flottant
+RATE_SCALE = 10 ** 9
+_INT64_MAX = 2 ** 63 - 1
+
+
+class BulkResult:
+    """Bilan d'un traitement de masse : comptes mouvementés, total passé et comptes refusés par code d'erreur"""
+
+    def __init__(self, op, applied, cents, rejected):
+        self.op = op
+        self.applied = applied
+        self.cents = cents
+        self.rejected = rejected
+
+    def __str__(self):
+        refused = sum(len(accounts) for accounts in self.rejected.values())
+        return (f"{self.applied} comptes {'crédités' if self.op == 'credit' else 'débités'} "
+                f"pour {format_cents(self.cents)}, {refused} refusés")
+
+
+def rate_units(rate):
+    """Convertit un taux (0.015 pour 1,5 %) en milliardièmes ; ValueError s'il est négatif ou trop précis"""
+    try:
+        units = Decimal(str(rate)) * RATE_SCALE
+    except InvalidOperation:
+        raise ValueError(f"Taux invalide: {rate}") from None
+    if units < 0 or units != units.to_integral_value():
+        raise ValueError(f"Taux invalide (positif, 9 décimales au plus): {rate}")
+    return int(units)
+
+
+def proportional(balances, units, minimum=0):
+    """Montants arrondis au centime (demi supérieur) de `units` milliardièmes des soldes d'au moins `minimum`"""
+    minimum = max(minimum, 1)
+    half = RATE_SCALE // 2
+    if numpy is not None and isinstance(balances, numpy.ndarray):
+        if len(balances) and units and int(balances.max()) * units + half > _INT64_MAX:
+            raise ValueError("Taux trop élevé pour un calcul exact sur 64 bits.")
+        return numpy.where(balances >= minimum, (balances * units + half) // RATE_SCALE, 0)
+    return array('q', ((cents * units + half) // RATE_SCALE if cents >= minimum else 0 for cents in balances))
+
+
+def interest_amounts(balances, rate, minimum_balance=0):
+    """Intérêts en centimes de chaque solde positif d'au moins `minimum_balance`"""
+    return proportional(balances, rate_units(rate), to_cents(minimum_balance))
+
+
+def fee_amounts(balances, amount=0, rate=0):
+    """Frais en centimes de chaque compte : montant fixe plus une part de son solde"""
+    fixed = to_cents(amount)
+    if fixed < 0:
+        raise ValueError(f"Frais invalides: {amount}")
+    amounts = proportional(balances, rate_units(rate))
+    if numpy is not None and isinstance(amounts, numpy.ndarray):
+        return amounts + fixed
+    return array('q', (cents + fixed for cents in amounts))
+
+
+def apply_amounts(ids, balances, op, amounts, log=None):
+    """Applique à chaque compte l'opération `op` pour le montant correspondant de `amounts`.
+
+    `ids` et `balances` sont les tableaux du grand livre (array('q')) ;
+    `amounts` est une fonction qui reçoit les soldes (vue NumPy sans copie,
+    ou le tableau lui-même sans NumPy) et retourne un montant par compte.
+    Les règles de debit_account s'appliquent en masques : un montant négatif
+    est refusé (invalid_amount), un débit supérieur au solde aussi
+    (insufficient_funds) ; un montant nul ne passe aucune écriture. Les
+    nouveaux soldes sont journalisés en un seul enregistrement puis écrits
+    en place.
+    """
+    if op != "credit" and op != "debit":
+        raise ValueError(ERROR_MESSAGES[UNKNOWN_OPERATION])
+    if numpy is not None:
+        return _apply_vectorized(ids, balances, op, amounts, log)
+
+    rejected = {INVALID_AMOUNT: array('q'), INSUFFICIENT_FUNDS: array('q')}
+    updates = []
+    total = 0
+    for slot, (account_id, current, cents) in enumerate(zip(ids, balances, amounts(balances))):
+        if cents <= 0:
+            if cents < 0:
+                rejected[INVALID_AMOUNT].append(account_id)
+            continue
+        if op == "debit":
+            if cents > current:
+                rejected[INSUFFICIENT_FUNDS].append(account_id)
+                continue
+            cents = -cents
+        updates.append((slot, account_id, current + cents))
+        total += cents
+
+    if log is not None and updates:
+        log.append((account_id, cents) for _, account_id, cents in updates)
+    for slot, _, cents in updates:
+        balances[slot] = cents
+    return BulkResult(op, len(updates), abs(total), rejected)
+
+
+def _apply_vectorized(ids, balances, op, amounts, log):
+    if not len(ids):
+        return BulkResult(op, 0, 0, {INVALID_AMOUNT: numpy.empty(0, numpy.int64),
+                                     INSUFFICIENT_FUNDS: numpy.empty(0, numpy.int64)})
+    # Vues sans copie sur les tableaux du grand livre, libérées au retour
+    accounts = numpy.frombuffer(ids, dtype=numpy.int64)
+    current = numpy.frombuffer(balances, dtype=numpy.int64)
+    cents = numpy.asarray(amounts(current), dtype=numpy.int64)
+
+    invalid = cents < 0
+    insufficient = (cents > current) & ~invalid if op == "debit" else numpy.zeros(len(cents), bool)
+    applied = (cents > 0) & ~insufficient
+    # Calcul sur tous les comptes (montant nul hors masque) : plus rapide qu'une indexation par masque
+    signed = numpy.where(applied, cents if op == "credit" else -cents, 0)
+    count = int(numpy.count_nonzero(applied))
+
+    if log is not None and count:
+        legs = numpy.empty(count, dtype=[('account', '<u8'), ('balance', '<i8')])
+        legs['account'] = accounts[applied]
+        legs['balance'] = (current + signed)[applied]
+        log.append_encoded(count, legs)
+    current += signed
+    return BulkResult(op, count, abs(int(signed.sum())),
+                      {INVALID_AMOUNT: accounts[invalid], INSUFFICIENT_FUNDS: accounts[insufficient]})
@@ -0,0 +1,137 @@
+import time
+import threading
+from concurrent.futures import Future
+
+
+class CommitScheduler:
+    """Regroupe les écritures : une seule persistance toutes les `interval_ms` ou tous les `max_ops`.
+
+    Les opérations mettent à jour la mémoire puis appellent `mark_dirty()`, qui
+    retourne le Future du prochain commit : l'appelant peut l'attendre (accusé
+    de réception durable) ou l'ignorer. Un thread d'écriture appelle `persist()`,
+    qui doit écrire l'état courant et retourner True en cas de succès.
+
+    Un échec est remonté aux Future en attente, mais les opérations restent à
+    persister : un nouvel essai a lieu à l'intervalle suivant, si bien que le
+    fichier rattrape la mémoire dès qu'une écriture réussit. À l'arrêt, un
+    dernier échec fait lever IOError par `close()`.
+    """
+
+    def __init__(self, persist, interval_ms=10, max_ops=1000):
+        self._persist = persist
+        self.interval = interval_ms / 1000.0
+        self.max_ops = max_ops
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._first_dirty = 0.0
+        self._future = Future()
+        self._closing = False
+        self._retrying = False
+        self.commits = 0
+        self.committed_ops = 0
+        self.failed_commits = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+        self._thread = threading.Thread(target=self._run, name="commit-scheduler", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        return self._pending
+
+    def mark_dirty(self):
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Le planificateur de commits est arrêté.")
+            if self._pending == 0:
+                self._first_dirty = time.monotonic()
+                self._cond.notify()
+            self._pending += 1
+            if self._pending >= self.max_ops:
+                self._cond.notify()
+            return self._future
+
+    def commit_future(self):
+        """Future résolu quand toutes les opérations déjà effectuées sont persistées"""
+        with self._cond:
+            if self._pending:
+                return self._future
+        future = Future()
+        future.set_result(0)
+        return future
+
+    def flush(self, timeout=None):
+        """Force un commit immédiat des opérations en attente et l'attend"""
+        with self._cond:
+            future = self._future if self._pending else None
+            self._first_dirty = 0.0
+            self._cond.notify()
+        if future is not None:
+            future.result(timeout)
+
+    def close(self):
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join()
+        if self._pending:
+            raise IOError(f"Échec de la persistance du solde : {self._pending} opérations non persistées.")
+
+    def metrics(self):
+        return {
+            'queue_depth': self._pending,
+            'commits': self.commits,
+            'committed_ops': self.committed_ops,
+            'failed_commits': self.failed_commits,
+            'avg_commit_latency_ms': self.total_latency / self.commits * 1000 if self.commits else 0.0,
+            'max_commit_latency_ms': self.max_latency * 1000,
+            'last_commit_latency_ms': self.last_latency * 1000,
+        }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Après un échec, le nouvel essai attend l'intervalle même si max_ops est atteint
+                while (self._pending < self.max_ops or self._retrying) and not self._closing:
+                    remaining = self._first_dirty + self.interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                ops, self._pending = self._pending, 0
+                future, self._future = self._future, Future()
+
+            started = time.perf_counter()
+            try:
+                success = self._persist()
+            except Exception as error:
+                if self._failed(ops, future, error):
+                    return
+                continue
+            latency = time.perf_counter() - started
+
+            self.commits += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.last_latency = latency
+            if success:
+                self._retrying = False
+                self.committed_ops += ops
+                future.set_result(ops)
+            elif self._failed(ops, future, IOError("Échec de la persistance du solde.")):
+                return
+
+    def _failed(self, ops, future, error):
+        # Les opérations restent en attente pour le prochain essai ; retourne True à l'arrêt
+        with self._cond:
+            self.failed_commits += 1
+            self._retrying = True
+            self._first_dirty = time.monotonic()
+            self._pending += ops
+            closing = self._closing
+        future.set_exception(error)
+        return closing
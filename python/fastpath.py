@@ -0,0 +1,118 @@
+import sys
+
+# Démarrage rapide d'app.py pour les appels scriptés : consultation du solde
+# (--balance) et client du démon (--client SOCKET) sans importer argparse,
+# json ni AccountManager. Le solde est lu dans le cache binaire du fichier
+# JSON (storage.JsonBackend, sidecar=True) ou demandé au démon lancé par
+# `app.py --serve SOCKET`. Toute autre option passe par le chemin complet.
+
+_FLAGS = {"--balance"}
+_VALUES = {"--data-file", "--client"}
+
+
+def parse(argv):
+    """Options du chemin rapide, ou None si `argv` demande le chemin complet"""
+    options = {}
+    arguments = iter(argv)
+    for argument in arguments:
+        name, equals, value = argument.partition("=")
+        if name in _FLAGS and not equals:
+            options[name] = True
+        elif name in _VALUES:
+            value = value if equals else next(arguments, None)
+            if not value:
+                return None
+            options[name] = value
+        elif name == "--batch" and not equals and "--client" in argv:
+            # Mode batch vers le démon : commandes sur l'entrée standard uniquement
+            options[name] = True
+        else:
+            return None
+    if "--client" not in options and "--balance" not in options:
+        return None
+    if "--balance" in options and "--batch" in options:
+        return None
+    return options
+
+
+def connect(socket_path):
+    """Connexion au démon, ou None s'il ne répond pas"""
+    # _socket plutôt que socket : ce dernier importe enum et selectors, plus
+    # coûteux que l'échange lui-même
+    import _socket
+    connection = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def exchange(connection, payload):
+    """Envoie des commandes au démon et retourne ses réponses JSONL.
+
+    Le démon lit toutes les commandes avant de répondre (voir app.serve) :
+    l'envoi complet puis la lecture ne peuvent pas se bloquer mutuellement.
+    """
+    import _socket
+    try:
+        connection.sendall(payload)
+        connection.shutdown(_socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        connection.close()
+
+
+def balance_text(response):
+    """Solde tel qu'écrit par le démon (1000.00) dans sa réponse {"op":"balance","ok":true,"balance":1000.00}"""
+    return response.strip().rpartition(b":")[2].rstrip(b"}").decode()
+
+
+def cached_balance(data_file=None):
+    """Solde en centimes lu par le backend JSON avec cache binaire ou par le backend binaire, sinon None.
+
+    Lecture seule : un fichier absent n'est pas créé, un cache périmé n'est
+    pas réécrit et un JSON historique n'est pas converti.
+    """
+    from storage import read_balance, resolve_storage, STORAGE_JSON, STORAGE_BINARY
+    storage = resolve_storage()
+    if storage not in (STORAGE_JSON, STORAGE_BINARY):
+        return None
+    return read_balance(storage, data_file, sidecar=True)
+
+
+def main(options):
+    """Exécute le chemin rapide ; retourne le code de sortie, ou None pour basculer sur le chemin complet"""
+    socket_path = options.get("--client")
+    connection = connect(socket_path) if socket_path is not None else None
+    if connection is not None:
+        if "--balance" in options:
+            sys.stdout.write(balance_text(exchange(connection, b"balance\n")) + "\n")
+        else:
+            sys.stdout.buffer.write(exchange(connection, sys.stdin.buffer.read()))
+        return 0
+    if "--balance" not in options:
+        # Démon absent : le mode batch s'exécute localement (chemin complet)
+        return None
+
+    cents = cached_balance(options.get("--data-file"))
+    if cents is None:
+        return None
+    from money import format_cents
+    sys.stdout.write(format_cents(cents) + "\n")
+    return 0
+
+
+def run(argv):
+    """Point d'entrée d'app.py : code de sortie du chemin rapide, ou None"""
+    options = parse(argv)
+    if options is None:
+        return None
+    return main(options)
@@ -0,0 +1,304 @@
+import os
+import sys
+import mmap
+import time
+import struct
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from collections import namedtuple
+
+from money import Money
+
+# Ligne d'historique : horodatage (ns), compte, type d'opération,
+# montant et solde résultant en centimes
+RECORD = struct.Struct("<qQBqq")
+_TIMESTAMP = struct.Struct("<q")
+# En-tête : signature, version, taille de ligne, nombre de lignes
+HEADER = struct.Struct("<4sHHQ")
+MAGIC = b"HIST"
+VERSION = 1
+_COUNT_OFFSET = 8
+_MIN_RECORDS = 1024
+
+# Index par compte (<path>.idx) : un segment trié de couples (compte, ligne)
+# par tranche de SEGMENT_ROWS lignes ; la tranche en cours reste en mémoire
+INDEX_ENTRY = struct.Struct("<QQ")
+SEGMENT_ROWS = 65536
+
+_OP_CODES = {"credit": 1, "debit": 2, "batch": 3}
+_OP_NAMES = {code: name for name, code in _OP_CODES.items()}
+# Variation du solde par type d'opération (un lot porte sa variation nette)
+_OP_SIGNS = {1: 1, 2: -1, 3: 1}
+
+# Instantané : horodatage (ns), nombre de lignes d'historique couvertes, solde en centimes
+SNAPSHOT = struct.Struct("<qQq")
+
+Transaction = namedtuple("Transaction", "timestamp account_id op amount balance")
+
+
+class _Timestamps:
+    """Vue séquentielle sur les horodatages, pour la recherche dichotomique"""
+
+    def __init__(self, history):
+        self._history = history
+
+    def __len__(self):
+        return self._history._count
+
+    def __getitem__(self, row):
+        return _TIMESTAMP.unpack_from(self._history._map, HEADER.size + row * RECORD.size)[0]
+
+
+class _Segment:
+    """Vue séquentielle sur un segment trié de l'index par compte"""
+
+    def __init__(self, index_map, segment):
+        self._map = index_map
+        self._base = segment * SEGMENT_ROWS * INDEX_ENTRY.size
+
+    def __len__(self):
+        return SEGMENT_ROWS
+
+    def __getitem__(self, position):
+        return INDEX_ENTRY.unpack_from(self._map, self._base + position * INDEX_ENTRY.size)
+
+
+class TransactionHistory:
+    """Historique des opérations en ajout seul, avec index par date et par compte.
+
+    Les lignes de largeur fixe sont ajoutées dans l'ordre chronologique (les
+    horodatages ne décroissent jamais) : la ligne correspondant à un instant
+    se trouve par dichotomie sur le fichier projeté en mémoire. L'index par
+    compte est découpé en segments triés couvrant chacun SEGMENT_ROWS lignes
+    consécutives ; une requête sur une période ne consulte que les segments
+    qui la recouvrent, en O(log n + k) par segment.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+            with open(path, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+                file.truncate(HEADER.size + _MIN_RECORDS * RECORD.size)
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, record_size, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"Format d'historique non reconnu: {path}")
+
+        self._timestamps = _Timestamps(self)
+        self._last_timestamp = self._timestamps[self._count - 1] if self._count else 0
+        self._index_file = open(self.index_path, 'a+b')
+        self._index_map = None
+        self._open_index()
+        self._tail = {}
+        for row in range(self._segments * SEGMENT_ROWS, self._count):
+            self._tail.setdefault(self._get(row)[1], []).append(row)
+
+    def __len__(self):
+        return self._count
+
+    def _open_index(self):
+        """Projette l'index ; complète les segments manquants après une interruption"""
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        segment_size = SEGMENT_ROWS * INDEX_ENTRY.size
+        self._segments = os.path.getsize(self.index_path) // segment_size
+        self._index_file.truncate(self._segments * segment_size)
+        while self._segments < self._count // SEGMENT_ROWS:
+            start = self._segments * SEGMENT_ROWS
+            self._write_segment([(self._get(row)[1], row) for row in range(start, start + SEGMENT_ROWS)])
+        if self._segments:
+            self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _write_segment(self, entries):
+        entries.sort()
+        self._index_file.seek(0, os.SEEK_END)
+        self._index_file.write(b"".join(INDEX_ENTRY.pack(*entry) for entry in entries))
+        self._index_file.flush()
+        self._segments += 1
+
+    def _get(self, row):
+        return RECORD.unpack_from(self._map, HEADER.size + row * RECORD.size)
+
+    def __getitem__(self, row):
+        if not 0 <= row < self._count:
+            raise IndexError(f"Ligne inexistante: {row}")
+        timestamp, account_id, op, amount, balance = self._get(row)
+        return Transaction(timestamp, account_id, _OP_NAMES[op], Money(amount), Money(balance))
+
+    def append(self, account_id, op, amount, balance, timestamp=None):
+        """Ajoute une opération (montant et solde en centimes) et retourne son numéro de ligne"""
+        timestamp = max(time.time_ns() if timestamp is None else timestamp, self._last_timestamp)
+        row = self._count
+        end = HEADER.size + (row + 1) * RECORD.size
+        if end > len(self._map):
+            self._map.resize(max(end, 2 * len(self._map)))
+        RECORD.pack_into(self._map, end - RECORD.size, timestamp, account_id, _OP_CODES[op], amount, balance)
+        self._count += 1
+        struct.pack_into("<Q", self._map, _COUNT_OFFSET, self._count)
+        self._last_timestamp = timestamp
+
+        self._tail.setdefault(account_id, []).append(row)
+        if self._count % SEGMENT_ROWS == 0:
+            self._write_segment([(account, tail_row) for account, rows in self._tail.items() for tail_row in rows])
+            self._tail = {}
+            self._open_index()
+        return row
+
+    def row_at(self, timestamp):
+        """Première ligne dont l'horodatage est >= timestamp"""
+        return bisect_left(self._timestamps, timestamp)
+
+    def row_after(self, timestamp, first=0, last=None):
+        """Première ligne dont l'horodatage est > timestamp (recherche limitée à [first, last])"""
+        return bisect_right(self._timestamps, timestamp, first, self._count if last is None else last)
+
+    @property
+    def last_timestamp(self):
+        return self._last_timestamp
+
+    def replay(self, account_id, cents, first, last):
+        """Applique à `cents` les opérations du compte sur les lignes [first, last["""
+        for row in self._account_rows(account_id, first, last):
+            _, _, op, amount, _ = self._get(row)
+            cents += _OP_SIGNS[op] * amount
+        return cents
+
+    def between(self, start=None, end=None):
+        """Opérations de tous les comptes sur [start, end[ (horodatages en ns)"""
+        first = 0 if start is None else self.row_at(start)
+        last = self._count if end is None else self.row_at(end)
+        for row in range(first, last):
+            yield self[row]
+
+    def _account_rows(self, account_id, first, last):
+        """Lignes du compte dans [first, last[, par ordre croissant"""
+        if first >= last:
+            return
+        for segment in range(first // SEGMENT_ROWS, min(self._segments, (last - 1) // SEGMENT_ROWS + 1)):
+            entries = _Segment(self._index_map, segment)
+            low = bisect_left(entries, (account_id, first))
+            high = bisect_left(entries, (account_id, last))
+            for position in range(low, high):
+                yield entries[position][1]
+        rows = self._tail.get(account_id, ())
+        yield from rows[bisect_left(rows, first):bisect_left(rows, last)]
+
+    def statement(self, account_id, start=None, end=None):
+        """Relevé d'un compte sur [start, end[ (horodatages en ns)"""
+        first = 0 if start is None else self.row_at(start)
+        last = self._count if end is None else self.row_at(end)
+        if first >= last:
+            return []
+        return [self[row] for row in self._account_rows(account_id, first, last)]
+
+    def balance_at(self, account_id, timestamp):
+        """Solde du compte après sa dernière opération <= timestamp, ou None"""
+        last = bisect_right(self._timestamps, timestamp)
+        rows = self._tail.get(account_id, ())
+        position = bisect_left(rows, last)
+        if position:
+            return Money(self._get(rows[position - 1])[4])
+        for segment in range(min(self._segments, last // SEGMENT_ROWS + 1) - 1, -1, -1):
+            entries = _Segment(self._index_map, segment)
+            position = bisect_left(entries, (account_id, last))
+            if position and entries[position - 1][0] == account_id:
+                return Money(self._get(entries[position - 1][1])[4])
+        return None
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._index_file.close()
+        self._file.close()
+
+
+class SnapshotLog:
+    """Instantanés périodiques du solde d'un compte, en ajout seul.
+
+    Chaque instantané donne le solde après les `rows` premières lignes de
+    l'historique : le solde à une date se cherche entre l'instantané le plus
+    proche et le suivant, ou vaut celui de l'instantané sans ligne entre les deux.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.timestamps = array('q')
+        self.rows = array('q')
+        self.balances = array('q')
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                data = file.read()
+            # Un instantané incomplet (écriture interrompue) est ignoré
+            for timestamp, rows, cents in SNAPSHOT.iter_unpack(data[:len(data) - len(data) % SNAPSHOT.size]):
+                self._add(timestamp, rows, cents)
+        self._file = open(path, 'ab')
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _add(self, timestamp, rows, cents):
+        self.timestamps.append(timestamp)
+        self.rows.append(rows)
+        self.balances.append(cents)
+
+    def append(self, timestamp, rows, cents):
+        self._file.write(SNAPSHOT.pack(timestamp, rows, cents))
+        self._file.flush()
+        self._add(timestamp, rows, cents)
+
+    def before(self, timestamp):
+        """Dernier instantané (horodatage, lignes, centimes) pris à `timestamp` ou avant, ou None"""
+        position = bisect_right(self.timestamps, timestamp)
+        if not position:
+            return None
+        return self.timestamps[position - 1], self.rows[position - 1], self.balances[position - 1]
+
+    def rows_after(self, timestamp):
+        """Lignes couvertes par le premier instantané pris après `timestamp`, ou None"""
+        position = bisect_right(self.timestamps, timestamp)
+        return self.rows[position] if position < len(self.rows) else None
+
+    def close(self):
+        self._file.close()
+
+
+def parse_timestamp(text):
+    """Date ISO 8601 (heure locale si non précisée) -> horodatage en ns"""
+    return int(datetime.fromisoformat(text).timestamp() * 1_000_000_000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relevé d'opérations depuis l'historique des transactions")
+    parser.add_argument("history_file", help="Fichier d'historique (<data_file>.hist)")
+    parser.add_argument("--account", type=int, default=0, help="Numéro de compte")
+    parser.add_argument("--start", help="Début de période (ISO 8601, inclus)")
+    parser.add_argument("--end", help="Fin de période (ISO 8601, exclue)")
+    args = parser.parse_args(argv)
+
+    history = TransactionHistory(args.history_file)
+    start = parse_timestamp(args.start) if args.start else None
+    end = parse_timestamp(args.end) if args.end else None
+    for transaction in history.statement(args.account, start, end):
+        moment = datetime.fromtimestamp(transaction.timestamp / 1_000_000_000).isoformat(sep=" ")
+        print(f"{moment}  {transaction.op:<6} {transaction.amount:>12.2f} {transaction.balance:>14.2f}")
+    history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
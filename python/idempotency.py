@@ -0,0 +1,190 @@
+import os
+import time
+import struct
+import hashlib
+from collections import OrderedDict
+
+# Entrée du cache : empreinte de la clé, horodatage (ns), type d'opération,
+# code d'erreur (0 : succès), montant et solde résultant en centimes
+RECORD = struct.Struct("<16sqBBqq")
+_TIMESTAMP = struct.Struct("<q")
+_RESULT = struct.Struct("<BBqq")
+_DIGEST_SIZE = 16
+_RESULT_OFFSET = _DIGEST_SIZE + _TIMESTAMP.size
+
+# Scellé d'un bloc d'entrées : empreinte nulle, type 255, solde écrit juste après
+_SEAL_DIGEST = bytes(_DIGEST_SIZE)
+_SEAL_OP = 255
+
+DEFAULT_CAPACITY = 100000
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+
+def key_digest(request_id):
+    """Empreinte de 16 octets d'une clé d'idempotence (str ou bytes)"""
+    if isinstance(request_id, str):
+        request_id = request_id.encode()
+    return hashlib.blake2b(request_id, digest_size=_DIGEST_SIZE).digest()
+
+
+def _seal_record(balance):
+    return RECORD.pack(_SEAL_DIGEST, 0, _SEAL_OP, 0, 0, balance)
+
+
+class IdempotencyCache:
+    """Résultats des opérations déjà effectuées, indexés par clé d'idempotence.
+
+    Dictionnaire ordonné par ancienneté (recherche en O(1)) borné à `capacity`
+    entrées : la plus ancienne est évincée au-delà, et une entrée plus vieille
+    que `ttl` secondes est ignorée puis retirée. Seule l'empreinte de la clé
+    est gardée, avec l'enregistrement binaire du résultat : la mémoire reste
+    bornée quel que soit le nombre de clés distinctes.
+
+    Avec `path`, les entrées sont persistées avec le solde : `seal(cents)`,
+    appelé juste avant l'écriture du solde, ajoute au fichier les entrées en
+    attente suivies d'un scellé portant ce solde. Au chargement, `recover`
+    oublie le dernier bloc si le solde persisté n'est pas celui de son scellé
+    (arrêt avant l'écriture du solde). Le fichier est réécrit avec les seules
+    entrées vivantes quand il dépasse le double de la capacité.
+    """
+
+    def __init__(self, path=None, capacity=DEFAULT_CAPACITY, ttl=DEFAULT_TTL_SECONDS):
+        if capacity <= 0:
+            raise ValueError("La capacité du cache d'idempotence doit être positive.")
+        self.path = path
+        self.capacity = capacity
+        self.ttl_ns = int(ttl * 1_000_000_000)
+        self._entries = OrderedDict()
+        self._pending = []
+        # Dernier bloc lu et solde du dernier scellé écrit ; un bloc non vide
+        # reste à confirmer par le scellé de l'écriture suivante
+        self._last_block = ()
+        self._last_balance = None
+        self._confirmed = True
+        self._file = None
+        self._written = 0
+        self._torn = False
+        if path is not None:
+            if os.path.exists(path):
+                self._read()
+            self._file = open(path, 'ab')
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, request_id):
+        return self.get(request_id) is not None
+
+    @property
+    def pending(self):
+        """Nombre d'entrées pas encore scellées"""
+        return len(self._pending)
+
+    def _read(self):
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        self._written = len(data) // RECORD.size
+        block = []
+        for offset in range(0, self._written * RECORD.size, RECORD.size):
+            record = data[offset:offset + RECORD.size]
+            if record[:_DIGEST_SIZE] == _SEAL_DIGEST and record[_RESULT_OFFSET] == _SEAL_OP:
+                for entry in block:
+                    self._put(entry)
+                self._last_block, block = block, []
+                self._last_balance = _RESULT.unpack_from(record, _RESULT_OFFSET)[3]
+            else:
+                block.append(record)
+        # Entrées sans scellé ou écriture interrompue : le solde n'a jamais été écrit
+        self._torn = bool(block) or len(data) % RECORD.size != 0
+        self._expire(time.time_ns())
+
+    def recover(self, balance):
+        """Aligne le cache sur le solde persisté `balance` ; retourne le nombre d'entrées oubliées"""
+        discarded = 0
+        if self._last_balance is not None and self._last_balance != balance:
+            for record in self._last_block:
+                digest = record[:_DIGEST_SIZE]
+                if self._entries.get(digest) == record:
+                    del self._entries[digest]
+                    discarded += 1
+        self._last_block = ()
+        self._last_balance = balance
+        if self._file is not None and (discarded or self._torn):
+            self._compact(time.time_ns())
+        self._torn = False
+        return discarded
+
+    def _put(self, record):
+        digest = record[:_DIGEST_SIZE]
+        entries = self._entries
+        entries[digest] = record
+        entries.move_to_end(digest)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+    def _expire(self, now):
+        # Les entrées les plus anciennes sont en tête
+        entries = self._entries
+        limit = now - self.ttl_ns
+        while entries:
+            digest, record = next(iter(entries.items()))
+            if _TIMESTAMP.unpack_from(record, _DIGEST_SIZE)[0] >= limit:
+                break
+            del entries[digest]
+
+    def get(self, request_id):
+        """Résultat (op, erreur, centimes, solde) enregistré pour la clé, ou None"""
+        digest = key_digest(request_id)
+        record = self._entries.get(digest)
+        if record is None:
+            return None
+        if _TIMESTAMP.unpack_from(record, _DIGEST_SIZE)[0] < time.time_ns() - self.ttl_ns:
+            del self._entries[digest]
+            return None
+        return _RESULT.unpack_from(record, _RESULT_OFFSET)
+
+    def put(self, request_id, op, error, cents, balance):
+        """Enregistre le résultat d'une opération (codes entiers, montants en centimes).
+
+        L'entrée est visible immédiatement et écrite au prochain `seal`.
+        """
+        record = RECORD.pack(key_digest(request_id), time.time_ns(), op, error, cents, balance)
+        self._put(record)
+        self._pending.append(record)
+
+    def seal(self, balance):
+        """Écrit les entrées en attente, scellées par `balance`, le solde sur le point d'être persisté.
+
+        Après un bloc non vide, l'écriture suivante du solde (même sans clé)
+        pose un scellé, vide au besoin : il confirme le bloc précédent.
+        """
+        block, self._pending = self._pending, []
+        if self._file is None or (not block and self._confirmed):
+            return
+        if self._written + len(block) >= 2 * self.capacity:
+            self._compact(time.time_ns(), exclude=block)
+        block.append(_seal_record(balance))
+        self._file.write(b"".join(block))
+        self._file.flush()
+        self._written += len(block)
+        self._last_balance = balance
+        self._confirmed = len(block) == 1
+
+    def _compact(self, now, exclude=()):
+        # Entrées vivantes déjà scellées, sous un seul scellé (dernier solde écrit)
+        self._expire(now)
+        excluded = set(exclude)
+        records = [record for record in self._entries.values() if record not in excluded]
+        records.append(_seal_record(self._last_balance or 0))
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, 'wb') as file:
+            file.write(b"".join(records))
+        self._file.close()
+        os.replace(tmp_file, self.path)
+        self._file = open(self.path, 'ab')
+        self._written = len(records)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import time
+import argparse
+from itertools import islice
+
+from account_manager import AccountManager
+from money import Money, to_cents
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+class ImportStats:
+    def __init__(self):
+        self.ops = 0
+        self.applied = 0
+        self.rejected = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def throughput(self):
+        """Retourne (opérations/s, Mo/s) depuis le début de l'import"""
+        elapsed = self.elapsed or 1e-9
+        return self.ops / elapsed, self.bytes / elapsed / 1_000_000
+
+    def __str__(self):
+        ops_per_second, mb_per_second = self.throughput()
+        return (f"{self.ops} opérations ({self.applied} appliquées, {self.rejected} rejetées) "
+                f"en {self.elapsed:.2f}s - {ops_per_second:,.0f} op/s, {mb_per_second:.2f} Mo/s")
+
+
+def read_lines(file, offset):
+    """Lit le fichier ligne par ligne à partir d'un décalage : (décalage de fin, ligne)"""
+    file.seek(offset)
+    for line in file:
+        offset += len(line)
+        yield offset, line
+
+
+def parse_csv(lines):
+    for offset, line in lines:
+        fields = line.split(b",")
+        op = fields[0].strip().lower()
+        if not op or op.startswith(b"#") or op in (b"op", b"type"):
+            yield offset, None
+            continue
+        try:
+            amount = Money.parse(fields[1].decode("ascii"))
+        except (IndexError, ValueError):
+            amount = 0
+        yield offset, (op.decode("ascii", "replace"), amount)
+
+
+def parse_jsonl(lines):
+    for offset, line in lines:
+        if not line.strip():
+            yield offset, None
+            continue
+        try:
+            record = json.loads(line)
+            yield offset, (str(record["op"]).lower(), Money(to_cents(record["amount"])))
+        except (ValueError, KeyError, TypeError, OverflowError):
+            # Ligne illisible ou montant non représentable (1e400, Infinity, NaN) : seule la ligne est rejetée
+            yield offset, ("invalid", 0)
+
+
+def chunks(records, size):
+    """Regroupe les enregistrements en lots bornés : (décalage de fin, opérations)"""
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk[-1][0], [op for _, op in chunk if op is not None]
+
+
+class PostingImporter:
+    """Import en flux d'un fichier d'écritures CSV ou JSONL avec reprise sur incident.
+
+    Le fichier est lu par lots de `chunk_size` lignes, appliqués avec
+    AccountManager.apply_batch (une écriture par lot). Le point de reprise
+    (`<fichier>.ckpt`) est écrit avant et après chaque lot : s'il reste en cours
+    au redémarrage, le solde du compte indique si le lot a été appliqué.
+    """
+
+    def __init__(self, account, path, chunk_size=DEFAULT_CHUNK_SIZE, checkpoint_file=None):
+        self.account = account
+        self.path = path
+        self.chunk_size = chunk_size
+        self.checkpoint_file = checkpoint_file or path + ".ckpt"
+        self.stats = ImportStats()
+        if path.endswith((".jsonl", ".ndjson")):
+            self.parse = parse_jsonl
+        else:
+            self.parse = parse_csv
+
+    def _read_checkpoint(self):
+        if not os.path.exists(self.checkpoint_file):
+            return 0
+        with open(self.checkpoint_file, 'r') as file:
+            checkpoint = json.load(file)
+        self.stats.applied = checkpoint.get('applied', 0)
+        self.stats.rejected = checkpoint.get('rejected', 0)
+        self.stats.ops = self.stats.applied + self.stats.rejected
+        # Lot en cours lors de l'incident : appliqué si le solde a changé
+        if 'next_offset' in checkpoint and self.account.get_balance() != checkpoint['balance']:
+            return checkpoint['next_offset']
+        return checkpoint['offset']
+
+    def _write_checkpoint(self, offset, next_offset=None):
+        checkpoint = {
+            'offset': offset,
+            'balance': float(self.account.get_balance()),
+            'applied': self.stats.applied,
+            'rejected': self.stats.rejected,
+        }
+        if next_offset is not None:
+            checkpoint['next_offset'] = next_offset
+        tmp_file = self.checkpoint_file + ".tmp"
+        with open(tmp_file, 'w') as file:
+            json.dump(checkpoint, file)
+        os.replace(tmp_file, self.checkpoint_file)
+
+    def run(self, progress=None, progress_interval=1.0):
+        """Importe le fichier ; `progress(stats)` est appelé au plus toutes les `progress_interval` secondes"""
+        offset = self._read_checkpoint()
+        last_report = time.perf_counter()
+
+        with open(self.path, 'rb') as file:
+            records = self.parse(read_lines(file, offset))
+            for end_offset, ops in chunks(records, self.chunk_size):
+                self._write_checkpoint(offset, end_offset)
+                results = self.account.apply_batch(ops)
+                applied = sum(1 for success, _ in results if success)
+                self.stats.applied += applied
+                self.stats.rejected += len(results) - applied
+                self.stats.ops += len(results)
+                self.stats.bytes += end_offset - offset
+                offset = end_offset
+                self._write_checkpoint(offset)
+
+                if progress is not None and time.perf_counter() - last_report >= progress_interval:
+                    progress(self.stats)
+                    last_report = time.perf_counter()
+
+        os.remove(self.checkpoint_file)
+        return self.stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import en flux d'un fichier d'écritures CSV ou JSONL")
+    parser.add_argument("file", help="Fichier d'écritures (.csv ou .jsonl)")
+    parser.add_argument("--data-file",
+                        help="Fichier de données du compte ($ACCOUNT_DATA_FILE, sinon account_data.json ; "
+                             "account_data.dat en mmap, account_data.db en sqlite)")
+    parser.add_argument("--storage", choices=("json", "binary", "mmap", "sqlite", "memory"),
+                        help="Stockage du solde ($ACCOUNT_STORAGE, json par défaut)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Nombre de lignes par lot")
+    parser.add_argument("--checkpoint", help="Fichier de point de reprise (<fichier>.ckpt par défaut)")
+    args = parser.parse_args(argv)
+
+    account = AccountManager(args.data_file, storage=args.storage)
+    importer = PostingImporter(account, args.file, args.chunk_size, args.checkpoint)
+    stats = importer.run(progress=lambda stats: print(stats, file=sys.stderr))
+    print(stats)
+    print(f"Solde final: {account.get_balance():.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
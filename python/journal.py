@@ -0,0 +1,213 @@
+import os
+import struct
+import zlib
+import threading
+
+DURABILITY_ALWAYS = "always"
+DURABILITY_GROUP = "group"
+DURABILITY_NONE = "none"
+DURABILITY_MODES = (DURABILITY_ALWAYS, DURABILITY_GROUP, DURABILITY_NONE)
+
+# En-tête de chaque enregistrement : longueur du contenu, crc32 du contenu
+_HEADER = struct.Struct("<II")
+# Contenu : type d'opération, montant (variation nette pour un lot), solde résultant, en centimes
+_RECORD = struct.Struct("<Bqq")
+
+# Transaction du grand livre : nombre de jambes, puis (compte, solde résultant en centimes)
+_LEG_COUNT = struct.Struct("<I")
+_LEG = struct.Struct("<Qq")
+
+_OP_CODES = {"credit": 1, "debit": 2, "batch": 3}
+_OP_NAMES = {code: name for name, code in _OP_CODES.items()}
+
+
+class _AppendLog:
+    """Fichier journal en ajout seul : écriture des enregistrements encadrés
+    (longueur, crc32) selon le mode de durabilité."""
+
+    def __init__(self, log_file, durability=DURABILITY_ALWAYS, group_interval_ms=10):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Mode de durabilité inconnu: {durability}")
+        self.log_file = log_file
+        self.durability = durability
+        self.group_interval = group_interval_ms / 1000.0
+        self._handle = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def _read(self):
+        if not os.path.exists(self.log_file):
+            return b""
+        with open(self.log_file, 'rb') as file:
+            return file.read()
+
+    def _truncate(self, offset):
+        # Enregistrement incomplet ou corrompu en fin de journal : on le tronque
+        with open(self.log_file, 'r+b') as file:
+            file.truncate(offset)
+
+    def _write(self, payload, tail=None):
+        with self._lock:
+            if self._handle is None:
+                self._handle = open(self.log_file, 'ab')
+            if tail is None:
+                self._handle.write(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            else:
+                # Suite volumineuse (traitement de masse) : écrite sans la recopier dans l'enregistrement
+                tail = memoryview(tail).cast('B')
+                checksum = zlib.crc32(tail, zlib.crc32(payload))
+                self._handle.write(_HEADER.pack(len(payload) + len(tail), checksum) + payload)
+                self._handle.write(tail)
+            self._handle.flush()
+            if self.durability == DURABILITY_ALWAYS:
+                os.fsync(self._handle.fileno())
+            elif self.durability == DURABILITY_GROUP and self._timer is None:
+                self._timer = threading.Timer(self.group_interval, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+            self._pending += 1
+
+    def sync(self):
+        """Force l'écriture sur disque des opérations en attente"""
+        with self._lock:
+            self._timer = None
+            if self._handle is not None:
+                os.fsync(self._handle.fileno())
+
+    def close(self):
+        """Synchronise et ferme le journal"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._handle is not None:
+                if self.durability != DURABILITY_NONE:
+                    os.fsync(self._handle.fileno())
+                self._handle.close()
+                self._handle = None
+
+    @property
+    def pending(self):
+        return self._pending
+
+
+class TransactionLog(_AppendLog):
+    """Journal d'opérations en ajout seul, compacté périodiquement dans le fichier de données.
+
+    Le fichier de données JSON sert d'instantané ; le journal (`<data_file>.wal`)
+    contient les opérations postérieures. Chaque enregistrement porte le solde
+    résultant, donc le rejeu est idempotent même si un compactage a été interrompu.
+    """
+
+    def __init__(self, data_file, durability=DURABILITY_ALWAYS, group_interval_ms=10, compact_every=1000):
+        super().__init__(data_file + ".wal", durability, group_interval_ms)
+        self.data_file = data_file
+        self.compact_every = compact_every
+
+    def recover(self, balance):
+        """Rejoue le journal sur le solde de l'instantané (en centimes) et retourne le solde courant"""
+        self._pending = 0
+        data = self._read()
+        offset = 0
+        for offset, _, _, balance in _scan(data):
+            self._pending += 1
+        if offset != len(data):
+            self._truncate(offset)
+        return balance
+
+    def records(self):
+        """Retourne les opérations valides du journal : (opération, montant, solde)"""
+        return [(op, amount, balance) for _, op, amount, balance in _scan(self._read())]
+
+    def append(self, op, amount, balance):
+        """Ajoute une opération au journal ; compacte si le seuil est atteint"""
+        self._write(_RECORD.pack(_OP_CODES[op], amount, balance))
+        if self._pending >= self.compact_every:
+            self.compact(balance)
+
+    def compact(self, balance):
+        """Écrit un instantané atomique du solde (en centimes) puis vide le journal"""
+        import json
+        tmp_file = self.data_file + ".tmp"
+        with self._lock:
+            with open(tmp_file, 'w') as file:
+                json.dump({'balance': balance / 100}, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_file, self.data_file)
+
+            if self._handle is not None:
+                self._handle.close()
+            self._handle = open(self.log_file, 'wb')
+            self._pending = 0
+
+
+class LedgerLog(_AppendLog):
+    """Journal du grand livre : un enregistrement par transaction, quel que soit son nombre de comptes.
+
+    Toutes les jambes d'une transaction tiennent dans un seul enregistrement
+    protégé par un crc32 : un enregistrement tronqué est ignoré en entier, la
+    transaction est donc rejouée complètement ou pas du tout. Chaque jambe
+    porte le solde résultant du compte, ce qui rend le rejeu idempotent.
+    """
+
+    def replay(self):
+        """Retourne les transactions valides : listes de (compte, solde en centimes)"""
+        self._pending = 0
+        data = self._read()
+        offset = 0
+        transactions = []
+        for offset, legs in _scan_legs(data):
+            transactions.append(legs)
+            self._pending += 1
+        if offset != len(data):
+            self._truncate(offset)
+        return transactions
+
+    def append(self, legs):
+        """Ajoute une transaction : couples (compte, solde résultant en centimes), en une écriture"""
+        legs = list(legs)
+        self._write(_LEG_COUNT.pack(len(legs)) + b"".join(_LEG.pack(*leg) for leg in legs))
+
+    def append_encoded(self, count, legs):
+        """Ajoute une transaction de `count` jambes déjà encodées au format <Qq (tampon, voir bulk.py)"""
+        self._write(_LEG_COUNT.pack(count), legs)
+
+    def reset(self):
+        """Vide le journal, une fois l'état du grand livre sauvegardé"""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+            self._handle = open(self.log_file, 'wb')
+            self._pending = 0
+
+
+def _scan(data):
+    """Parcourt les enregistrements valides ; s'arrête au premier enregistrement tronqué ou corrompu"""
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, checksum = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        payload = data[start:start + length]
+        if length != _RECORD.size or len(payload) != length or zlib.crc32(payload) != checksum:
+            return
+        op, amount, balance = _RECORD.unpack(payload)
+        offset = start + length
+        yield offset, _OP_NAMES.get(op), amount, balance
+
+
+def _scan_legs(data):
+    """Parcourt les transactions valides du grand livre ; s'arrête à la première tronquée ou corrompue"""
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, checksum = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        payload = data[start:start + length]
+        if length < _LEG_COUNT.size or len(payload) != length or zlib.crc32(payload) != checksum:
+            return
+        count, = _LEG_COUNT.unpack_from(payload)
+        if length != _LEG_COUNT.size + count * _LEG.size:
+            return
+        offset = start + length
+        yield offset, list(_LEG.iter_unpack(payload[_LEG_COUNT.size:]))
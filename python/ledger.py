@@ -0,0 +1,330 @@
+import os
+import struct
+from array import array
+
+from money import Money, to_cents, format_cents
+from locking import StripedLock
+from account_manager import ERROR_MESSAGES, INVALID_AMOUNT, INSUFFICIENT_FUNDS, UNKNOWN_OPERATION, OVERFLOW
+from journal import LedgerLog, DURABILITY_ALWAYS
+
+DEFAULT_BALANCE = 1000.0
+
+_EMPTY = -1
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+_MIN_CAPACITY = 16
+# Numéros de compte : entiers de 0 à 2**63 - 1 (tableau 'q' et journal)
+_ACCOUNT_ID_LIMIT = 2 ** 63
+# Soldes en centimes : entiers 64 bits signés (tableau 'q' et journal)
+_BALANCE_MAX = 2 ** 63 - 1
+
+# En-tête du fichier : signature, version, nombre de comptes
+_FILE_HEADER = struct.Struct("<4sHQ")
+_FILE_MAGIC = b"LDGR"
+_FILE_VERSION = 1
+
+
+def _check_account_id(account_id):
+    if not 0 <= account_id < _ACCOUNT_ID_LIMIT:
+        raise ValueError(f"Numéro de compte invalide (de 0 à 2**63 - 1): {account_id}")
+
+
+class Ledger:
+    """Grand livre multi-comptes en mémoire.
+
+    Les soldes sont stockés en centimes (voir money.Money) dans un tableau d'entiers 64 bits ;
+    un index à adressage ouvert (sondage linéaire) associe chaque numéro de
+    compte à son emplacement. Un compte coûte quelques dizaines d'octets.
+    Les règles de `credit_account`/`debit_account` sont celles d'AccountManager.
+
+    Avec `lock_stripes` > 0, le grand livre peut être partagé entre threads :
+    une opération sur un compte existant ne prend que le verrou de sa tranche,
+    la création d'un compte (qui peut réorganiser l'index) les prend tous.
+
+    `apply_transaction` et `transfer` appliquent plusieurs jambes de façon
+    atomique. Avec un journal (`open_log`), chaque opération ou transaction
+    est persistée en un seul enregistrement avant d'être appliquée en mémoire.
+    `accrue_interest` et `charge_fee` traitent tous les comptes en une passe
+    (bulk.py, vectorisé avec NumPy s'il est installé).
+    """
+
+    def __init__(self, default_balance=DEFAULT_BALANCE, lock_stripes=0):
+        self.default_balance = default_balance
+        self._stripes = StripedLock(lock_stripes) if lock_stripes else None
+        self._default_cents = to_cents(default_balance)
+        self._ids = array('q')
+        self._balances = array('q')
+        self._capacity = _MIN_CAPACITY
+        self._keys = array('q', [_EMPTY]) * self._capacity
+        self._slots = array('q', [0]) * self._capacity
+        self.log = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, account_id):
+        return self._find(account_id) >= 0
+
+    def _probe(self, account_id):
+        mask = self._capacity - 1
+        position = ((account_id * _HASH_MULTIPLIER) & _MASK64) >> 32 & mask
+        keys = self._keys
+        while keys[position] != _EMPTY and keys[position] != account_id:
+            position = (position + 1) & mask
+        return position
+
+    def _find(self, account_id):
+        position = self._probe(account_id)
+        if self._keys[position] == _EMPTY:
+            return -1
+        return self._slots[position]
+
+    def _rebuild_index(self, capacity):
+        self._capacity = capacity
+        self._keys = array('q', [_EMPTY]) * self._capacity
+        self._slots = array('q', [0]) * self._capacity
+        for slot, account_id in enumerate(self._ids):
+            position = self._probe(account_id)
+            self._keys[position] = account_id
+            self._slots[position] = slot
+
+    def _insert(self, account_id, cents):
+        _check_account_id(account_id)
+        # Facteur de charge maximal de 2/3 pour garder des sondages courts
+        if (len(self._ids) + 1) * 3 > self._capacity * 2:
+            self._rebuild_index(self._capacity * 2)
+        slot = len(self._ids)
+        position = self._probe(account_id)
+        self._keys[position] = account_id
+        self._slots[position] = slot
+        self._ids.append(account_id)
+        self._balances.append(cents)
+        return slot
+
+    def open_account(self, account_id, balance=None):
+        if self._stripes is not None:
+            with self._stripes:
+                return self._open_account(account_id, balance)
+        return self._open_account(account_id, balance)
+
+    def _open_account(self, account_id, balance):
+        if self._find(account_id) >= 0:
+            raise ValueError(f"Le compte {account_id} existe déjà.")
+        self._insert(account_id, self._default_cents if balance is None else to_cents(balance))
+
+    def accounts(self):
+        """Itère sur les couples (numéro de compte, solde)"""
+        for account_id, cents in zip(self._ids, self._balances):
+            yield account_id, Money(cents)
+
+    def get_balance(self, account_id):
+        if self._stripes is None:
+            return Money(self._cents_of(account_id))
+        with self._stripes.for_key(account_id):
+            return Money(self._cents_of(account_id))
+
+    def apply(self, account_id, op, cents):
+        """Chemin rapide sans message : retourne (code d'erreur ou None, solde en centimes)"""
+        if self._stripes is None:
+            return self._apply(account_id, op, cents)
+        with self._stripes.for_key(account_id):
+            if self._find(account_id) >= 0:
+                return self._apply(account_id, op, cents)
+        with self._stripes:
+            return self._apply(account_id, op, cents)
+
+    def _apply(self, account_id, op, cents):
+        if op != "credit" and op != "debit":
+            return UNKNOWN_OPERATION, self._cents_of(account_id)
+        if cents <= 0:
+            return INVALID_AMOUNT, self._cents_of(account_id)
+
+        slot = self._find(account_id)
+        if slot < 0:
+            # Compte à créer : numéro vérifié avant toute écriture au journal
+            _check_account_id(account_id)
+        current = self._balances[slot] if slot >= 0 else self._default_cents
+        if op == "debit":
+            if cents > current:
+                return INSUFFICIENT_FUNDS, current
+            cents = -cents
+        elif current + cents > _BALANCE_MAX:
+            # Solde hors de l'entier 64 bits : refusé avant création du compte et journal
+            return OVERFLOW, current
+        if self.log is not None:
+            self.log.append(((account_id, current + cents),))
+        if slot < 0:
+            slot = self._insert(account_id, self._default_cents)
+        self._balances[slot] += cents
+        return None, self._balances[slot]
+
+    def apply_transaction(self, legs):
+        """Applique atomiquement des jambes (compte, opération, centimes) : toutes ou aucune.
+
+        Retourne (code d'erreur ou None, {compte: solde résultant en centimes}).
+        Les verrous des comptes concernés sont pris par ordre croissant de tranche.
+        """
+        legs = list(legs)
+        if self._stripes is None:
+            return self._apply_transaction(legs)
+        accounts = [leg[0] for leg in legs]
+        with self._stripes.for_keys(accounts):
+            if all(self._find(account_id) >= 0 for account_id in accounts):
+                return self._apply_transaction(legs)
+        with self._stripes:
+            return self._apply_transaction(legs)
+
+    def _apply_transaction(self, legs):
+        # Phase 1 : validation de toutes les jambes sur des soldes projetés (numéros
+        # de compte, règles de débit, soldes dans l'entier 64 bits), sans rien modifier
+        balances = {}
+        for account_id, op, cents in legs:
+            _check_account_id(account_id)
+            if op != "credit" and op != "debit":
+                return UNKNOWN_OPERATION, None
+            if cents <= 0:
+                return INVALID_AMOUNT, None
+            current = balances.get(account_id)
+            if current is None:
+                current = self._cents_of(account_id)
+            if op == "debit":
+                if cents > current:
+                    return INSUFFICIENT_FUNDS, None
+                cents = -cents
+            elif current + cents > _BALANCE_MAX:
+                return OVERFLOW, None
+            balances[account_id] = current + cents
+
+        # Phase 2 : un seul enregistrement au journal (point de validation), puis la mémoire
+        if self.log is not None and balances:
+            self.log.append(balances.items())
+        for account_id, cents in balances.items():
+            self._set_cents(account_id, cents)
+        return None, balances
+
+    def _set_cents(self, account_id, cents):
+        slot = self._find(account_id)
+        if slot < 0:
+            self._insert(account_id, cents)
+        else:
+            self._balances[slot] = cents
+
+    def _cents_of(self, account_id):
+        slot = self._find(account_id)
+        return self._balances[slot] if slot >= 0 else self._default_cents
+
+    def credit_account(self, account_id, amount):
+        cents = to_cents(amount)
+        error, balance = self.apply(account_id, "credit", cents)
+        if error is not None:
+            return False, ERROR_MESSAGES[error]
+        return True, f"Compte crédité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"
+
+    def debit_account(self, account_id, amount):
+        cents = to_cents(amount)
+        error, balance = self.apply(account_id, "debit", cents)
+        if error is not None:
+            return False, ERROR_MESSAGES[error]
+        return True, f"Compte débité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"
+
+    def transfer(self, from_id, to_id, amount):
+        """Virement atomique : débit de `from_id` et crédit de `to_id`, en une écriture"""
+        cents = to_cents(amount)
+        error, _ = self.apply_transaction(((from_id, "debit", cents), (to_id, "credit", cents)))
+        if error is not None:
+            return False, ERROR_MESSAGES[error]
+        return True, f"Virement de {format_cents(cents)} du compte {from_id} vers le compte {to_id} effectué."
+
+    def accrue_interest(self, rate, minimum_balance=0):
+        """Crédite en une passe les intérêts de chaque compte (taux 0.015 pour 1,5 %, arrondi au centime).
+
+        Seuls les soldes d'au moins `minimum_balance` en bénéficient. Tous les
+        nouveaux soldes forment une seule transaction du journal. Retourne un
+        bulk.BulkResult.
+        """
+        from bulk import interest_amounts
+        return self._apply_bulk("credit", lambda balances: interest_amounts(balances, rate, minimum_balance))
+
+    def charge_fee(self, amount=0, rate=0):
+        """Débite en une passe des frais de chaque compte : `amount` plus `rate` de son solde.
+
+        Les comptes dont le solde ne couvre pas les frais ne sont pas débités et
+        sont listés sous insufficient_funds dans le bulk.BulkResult retourné.
+        """
+        from bulk import fee_amounts
+        return self._apply_bulk("debit", lambda balances: fee_amounts(balances, amount, rate))
+
+    def _apply_bulk(self, op, amounts):
+        # Import différé : NumPy n'est chargé que pour les traitements de masse
+        from bulk import apply_amounts
+        if self._stripes is not None:
+            with self._stripes:
+                return apply_amounts(self._ids, self._balances, op, amounts, self.log)
+        return apply_amounts(self._ids, self._balances, op, amounts, self.log)
+
+    def open_log(self, log_file, durability=DURABILITY_ALWAYS):
+        """Rejoue le journal sur l'état chargé, puis y enregistre chaque opération"""
+        log = LedgerLog(log_file, durability)
+        for legs in log.replay():
+            for account_id, cents in legs:
+                self._set_cents(account_id, cents)
+        self.log = log
+
+    def checkpoint(self, path):
+        """Sauvegarde atomique du grand livre puis remise à zéro du journal"""
+        if self._stripes is not None:
+            with self._stripes:
+                self._checkpoint(path)
+        else:
+            self._checkpoint(path)
+
+    def _checkpoint(self, path):
+        tmp_file = path + ".tmp"
+        self.save(tmp_file)
+        with open(tmp_file, 'rb') as file:
+            os.fsync(file.fileno())
+        os.replace(tmp_file, path)
+        if self.log is not None:
+            self.log.reset()
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+
+    def copy(self):
+        """Copie indépendante, par exemple pour sauvegarder hors de la boucle d'événements"""
+        if self._stripes is not None:
+            with self._stripes:
+                return self._copy()
+        return self._copy()
+
+    def _copy(self):
+        ledger = Ledger(self.default_balance)
+        ledger._ids = array('q', self._ids)
+        ledger._balances = array('q', self._balances)
+        ledger._capacity = self._capacity
+        ledger._keys = array('q', self._keys)
+        ledger._slots = array('q', self._slots)
+        return ledger
+
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, len(self._ids)))
+            self._ids.tofile(file)
+            self._balances.tofile(file)
+
+    @classmethod
+    def load(cls, path, default_balance=DEFAULT_BALANCE, lock_stripes=0):
+        ledger = cls(default_balance, lock_stripes)
+        with open(path, 'rb') as file:
+            magic, version, count = _FILE_HEADER.unpack(file.read(_FILE_HEADER.size))
+            if magic != _FILE_MAGIC or version != _FILE_VERSION:
+                raise ValueError(f"Format de grand livre non reconnu: {path}")
+            ledger._ids.fromfile(file, count)
+            ledger._balances.fromfile(file, count)
+
+        capacity = _MIN_CAPACITY
+        while count * 3 > capacity * 2:
+            capacity *= 2
+        ledger._rebuild_index(capacity)
+        return ledger
@@ -0,0 +1,94 @@
+import os
+import threading
+from contextlib import nullcontext, contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou consultatif via fcntl
+    fcntl = None
+
+CONCURRENCY_NONE = None
+CONCURRENCY_THREAD = "thread"
+CONCURRENCY_PROCESS = "process"
+CONCURRENCY_MODES = (CONCURRENCY_NONE, CONCURRENCY_THREAD, CONCURRENCY_PROCESS)
+
+
+class FileLock:
+    """Verrou exclusif inter-processus (flock) sur un fichier, réentrant dans un même processus.
+
+    Le verrou de thread est pris avant le verrou de fichier : les threads d'un
+    processus se sérialisent entre eux, puis le processus se sérialise avec les
+    autres processus.
+    """
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise RuntimeError("Le verrouillage inter-processus n'est pas disponible sur cette plateforme.")
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._depth = 0
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def close(self):
+        with self._thread_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def make_lock(concurrency, data_file):
+    """Retourne le verrou correspondant au mode de concurrence demandé"""
+    if concurrency not in CONCURRENCY_MODES:
+        raise ValueError(f"Mode de concurrence inconnu: {concurrency}")
+    if concurrency == CONCURRENCY_PROCESS:
+        return FileLock(data_file + ".lock")
+    if concurrency == CONCURRENCY_THREAD:
+        return threading.RLock()
+    return nullcontext()
+
+
+class StripedLock:
+    """Ensemble de verrous répartis par numéro de compte (lock striping)"""
+
+    def __init__(self, stripes=64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def for_key(self, key):
+        return self._locks[key % len(self._locks)]
+
+    @contextmanager
+    def for_keys(self, keys):
+        """Verrous des tranches de `keys`, pris une fois chacun par ordre croissant (sans interblocage)"""
+        locks = [self._locks[index] for index in sorted({key % len(self._locks) for key in keys})]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def __enter__(self):
+        # Tous les verrous, toujours dans le même ordre, pour éviter les interblocages
+        for lock in self._locks:
+            lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        for lock in reversed(self._locks):
+            lock.release()
@@ -0,0 +1,146 @@
+import time
+import threading
+
+# Seaux de latence en puissances de 2 de microsecondes : le seau i compte les
+# durées inférieures à 2**i µs (de 1 µs à ~8 s), le dernier est +Inf
+BUCKETS = tuple(1e-6 * 2 ** exponent for exponent in range(24))
+_LAST_BUCKET = len(BUCKETS)
+
+
+class Histogram:
+    """Histogramme de latences à seaux fixes.
+
+    Le seau se calcule par bit_length de la durée en microsecondes, sans
+    recherche ; les mises à jour reposent sur le GIL plutôt que sur un verrou
+    (une observation concurrente peut exceptionnellement être perdue).
+    """
+
+    def __init__(self, sample_every=1):
+        self.counts = [0] * (_LAST_BUCKET + 1)
+        self.sum_ns = 0
+        self.sample_every = max(1, sample_every)
+        self._countdown = 1
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    @property
+    def sum(self):
+        return self.sum_ns / 1e9
+
+    def observe_ns(self, nanoseconds, weight=1):
+        bucket = (nanoseconds // 1000).bit_length()
+        self.counts[bucket if bucket < _LAST_BUCKET else _LAST_BUCKET] += weight
+        self.sum_ns += nanoseconds * weight
+
+    def observe(self, seconds):
+        self.observe_ns(int(seconds * 1e9))
+
+    def start(self):
+        """Début d'un appel : perf_counter_ns() s'il est chronométré (un sur sample_every), sinon 0"""
+        self._countdown -= 1
+        if self._countdown > 0:
+            return 0
+        self._countdown = self.sample_every
+        return time.perf_counter_ns()
+
+    def stop(self, started):
+        """Fin d'un appel chronométré par start(), compté pour sample_every"""
+        nanoseconds = time.perf_counter_ns() - started
+        bucket = (nanoseconds // 1000).bit_length()
+        self.counts[bucket if bucket < _LAST_BUCKET else _LAST_BUCKET] += self.sample_every
+        self.sum_ns += nanoseconds * self.sample_every
+
+    def quantile(self, fraction):
+        """Borne supérieure du seau contenant le quantile (None sans observation)"""
+        total = self.count
+        if not total:
+            return None
+        rank = fraction * total
+        seen = 0
+        for position, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BUCKETS[position] if position < _LAST_BUCKET else float("inf")
+        return float("inf")
+
+
+class Metrics:
+    """Compteurs et histogrammes de latence par opération.
+
+    Les histogrammes sont indexés par opération (`op`), les compteurs par
+    (nom, opération, motif). Exportables au format texte Prometheus ou en
+    instantané JSON.
+
+    Avec `sample_every` = N > 1, une opération sur N est chronométrée et
+    compte pour N : pour des opérations de quelques microsecondes (stockage
+    projeté en mémoire), il ne reste qu'un décompte par appel non mesuré.
+    """
+
+    def __init__(self, namespace="account_manager", sample_every=1):
+        self.namespace = namespace
+        self.sample_every = max(1, sample_every)
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def histogram(self, op):
+        with self._lock:
+            if op not in self._histograms:
+                self._histograms[op] = Histogram(self.sample_every)
+            return self._histograms[op]
+
+    def increment(self, name, op, reason=None, value=1):
+        key = (name, op, reason)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def counter(self, name, op, reason=None):
+        return self._counters.get((name, op, reason), 0)
+
+    def snapshot(self):
+        """État courant, sérialisable en JSON"""
+        operations = {}
+        for op, histogram in sorted(self._histograms.items()):
+            count = histogram.count
+            operations[op] = {
+                'count': count,
+                'sum_seconds': histogram.sum,
+                'mean_us': histogram.sum_ns / count / 1000 if count else 0.0,
+                'p50_us_max': _micros(histogram.quantile(0.50)),
+                'p99_us_max': _micros(histogram.quantile(0.99)),
+            }
+        counters = {}
+        for (name, op, reason), value in sorted(self._counters.items(), key=lambda item: str(item[0])):
+            counters.setdefault(name, {}).setdefault(op, {})[reason or "total"] = value
+        return {'timestamp': time.time(), 'operations': operations, 'counters': counters}
+
+    def to_prometheus(self):
+        """Export au format texte d'exposition Prometheus"""
+        name = f"{self.namespace}_operation_seconds"
+        lines = [f"# HELP {name} Durée des opérations.", f"# TYPE {name} histogram"]
+        for op, histogram in sorted(self._histograms.items()):
+            cumulative = 0
+            for position, count in enumerate(histogram.counts):
+                cumulative += count
+                bound = f"{BUCKETS[position]:.6g}" if position < _LAST_BUCKET else "+Inf"
+                lines.append(f'{name}_bucket{{op="{op}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{op="{op}"}} {histogram.sum:.9f}')
+            lines.append(f'{name}_count{{op="{op}"}} {cumulative}')
+
+        names = sorted({key[0] for key in self._counters})
+        for counter_name in names:
+            full_name = f"{self.namespace}_{counter_name}_total"
+            lines.append(f"# TYPE {full_name} counter")
+            for (key_name, op, reason), value in sorted(self._counters.items(), key=lambda item: str(item[0])):
+                if key_name != counter_name:
+                    continue
+                labels = f'op="{op}"' + (f',reason="{reason}"' if reason else "")
+                lines.append(f"{full_name}{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _micros(seconds):
+    # Quantile dans le seau +Inf ou sans observation : pas de borne (null en JSON)
+    return seconds * 1e6 if seconds is not None and seconds != float("inf") else None
@@ -0,0 +1,157 @@
+# Capacité d'un champ COBOL PIC 9(6)V99, en centimes
+PIC_9_6_V99_MAX = 99999999
+
+
+class Money:
+    """Montant en virgule fixe stocké en centimes entiers (équivalent de PIC 9(n)V99).
+
+    Toute l'arithmétique se fait sur des entiers ; les comparaisons avec un
+    float ou un int portent sur la valeur en unités, ce qui permet d'écrire
+    `balance == 1000.01` ou `f"{balance:.2f}"` comme avec l'ancien float.
+    Un montant de plus de deux décimales est refusé (ValueError), quel que
+    soit son type.
+    """
+
+    __slots__ = ("cents",)
+
+    def __init__(self, cents=0):
+        self.cents = cents
+
+    @classmethod
+    def parse(cls, text):
+        """Convertit une saisie texte (« 12 », « 12.5 », « 12,50 ») sans passer par un float"""
+        text = text.strip().replace(",", ".")
+        sign = 1
+        if text[:1] in ("-", "+"):
+            sign = -1 if text[0] == "-" else 1
+            text = text[1:]
+        units, _, fraction = text.partition(".")
+        digits = units + fraction
+        if not digits or len(fraction) > 2 or not (digits.isascii() and digits.isdigit()):
+            raise ValueError(f"Montant invalide: {text!r}")
+        return cls(sign * (int(units or "0") * 100 + int(fraction.ljust(2, "0"))))
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __str__(self):
+        return self.__format__(".2f")
+
+    def __format__(self, spec):
+        if spec == ".2f" or spec == "":
+            return format_cents(self.cents)
+        return format(self.to_decimal(), spec)
+
+    def to_decimal(self):
+        from decimal import Decimal
+        return Decimal(self.cents).scaleb(-2)
+
+    def __float__(self):
+        return self.cents / 100
+
+    def __int__(self):
+        return int(self.cents / 100)
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __hash__(self):
+        return hash(self.cents / 100)
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        if isinstance(other, (int, float)):
+            return self.cents / 100 == other
+        return NotImplemented
+
+    def __lt__(self, other):
+        if type(other) is float:
+            return self.cents / 100 < other
+        return self.cents < to_cents(other)
+
+    def __le__(self, other):
+        if type(other) is float:
+            return self.cents / 100 <= other
+        return self.cents <= to_cents(other)
+
+    def __gt__(self, other):
+        if type(other) is float:
+            return self.cents / 100 > other
+        return self.cents > to_cents(other)
+
+    def __ge__(self, other):
+        if type(other) is float:
+            return self.cents / 100 >= other
+        return self.cents >= to_cents(other)
+
+    def __add__(self, other):
+        return Money(self.cents + to_cents(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Money(self.cents - to_cents(other))
+
+    def __rsub__(self, other):
+        return Money(to_cents(other) - self.cents)
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+
+def format_cents(cents):
+    """Formate des centimes avec deux décimales, sans conversion en float"""
+    units, fraction = divmod(abs(cents), 100)
+    return f"{'-' if cents < 0 else ''}{units}.{fraction:02d}"
+
+
+def to_cents(value):
+    """Convertit un montant (Money, int, float, Decimal ou texte) en centimes entiers.
+
+    Comme Money.parse, refuse (ValueError) plus de deux décimales ainsi que
+    NaN et l'infini : un float vaut son écriture décimale la plus courte
+    (repr), 1.005 est donc refusé et non arrondi.
+    """
+    if type(value) is Money:
+        return value.cents
+    if type(value) is int:
+        return value * 100
+    if type(value) is float:
+        # Chemin rapide, exact en deçà de 2**53 centimes : le float est exactement
+        # l'écriture à deux décimales de ses centimes (faux pour NaN et l'infini,
+        # qui passent par Decimal comme les grands montants)
+        scaled = value * 100
+        if -9007199254740992.0 < scaled < 9007199254740992.0:
+            cents = round(scaled)
+            if cents / 100 == value:
+                return cents
+        from decimal import Decimal
+        return _decimal_cents(Decimal(repr(value)), value)
+    if isinstance(value, str):
+        return Money.parse(value).cents
+    # decimal n'est importé que pour convertir un Decimal (import coûteux au démarrage)
+    from decimal import Decimal
+    if isinstance(value, Decimal):
+        return _decimal_cents(value, value)
+    if isinstance(value, Money):
+        return value.cents
+    raise TypeError(f"Type de montant non supporté: {type(value).__name__}")
+
+
+def _decimal_cents(amount, value):
+    # Calcul sur les chiffres du Decimal : exact quelle que soit la précision du contexte
+    if not amount.is_finite():
+        raise ValueError(f"Montant invalide: {value!r}")
+    sign, digits, exponent = amount.as_tuple()
+    digits = "".join(map(str, digits))
+    while exponent < -2 and digits.endswith("0"):
+        digits = digits[:-1] or "0"
+        exponent += 1
+    if exponent < -2:
+        raise ValueError(f"Montant invalide (deux décimales au plus): {value!r}")
+    cents = int(digits) * 10 ** (exponent + 2)
+    return -cents if sign else cents
@@ -0,0 +1,135 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+
+from money import Money, to_cents
+
+# Enregistrement calqué sur la zone COBOL du compte, en binaire :
+#   05 ACCOUNT-ID  PIC 9(10)    -> entier non signé 64 bits
+#   05 BALANCE     PIC 9(6)V99  -> entier signé 64 bits, en centimes
+RECORD = struct.Struct("<Qq")
+_BALANCE = struct.Struct("<q")
+_BALANCE_OFFSET = 8
+# En-tête : signature, version, taille d'enregistrement, nombre d'enregistrements
+HEADER = struct.Struct("<4sHHQ")
+MAGIC = b"ACCT"
+VERSION = 1
+_COUNT_OFFSET = 8
+_MIN_RECORDS = 64
+
+
+class RecordStore:
+    """Fichier d'enregistrements binaires de largeur fixe, projeté en mémoire.
+
+    L'enregistrement n° `slot` est à l'octet HEADER.size + slot * RECORD.size :
+    une lecture est un unpack_from sur la projection, une mise à jour un
+    pack_into en place. L'ouverture ne lit que l'en-tête, quel que soit le
+    nombre de comptes.
+
+    Seul un fichier absent ou vide est initialisé ; un fichier existant trop
+    court ou d'un autre format (un account_data.json par exemple) lève
+    ValueError sans être modifié.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+                file.truncate(HEADER.size + _MIN_RECORDS * RECORD.size)
+        elif os.path.getsize(path) < HEADER.size:
+            raise ValueError(f"Fichier d'enregistrements tronqué: {path}")
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, record_size, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"Format d'enregistrements non reconnu: {path}")
+        if HEADER.size + self._count * RECORD.size > len(self._map):
+            self.close()
+            raise ValueError(f"Fichier d'enregistrements tronqué: {path}")
+
+    def __len__(self):
+        return self._count
+
+    def _offset(self, slot):
+        if not 0 <= slot < self._count:
+            raise IndexError(f"Emplacement inexistant: {slot}")
+        return HEADER.size + slot * RECORD.size
+
+    def record(self, slot):
+        """Vue sans copie sur les octets de l'enregistrement (à libérer avant append ou close)"""
+        offset = self._offset(slot)
+        return memoryview(self._map)[offset:offset + RECORD.size]
+
+    def get(self, slot):
+        """Retourne (numéro de compte, solde en centimes)"""
+        return RECORD.unpack_from(self._map, self._offset(slot))
+
+    def get_cents(self, slot):
+        return _BALANCE.unpack_from(self._map, self._offset(slot) + _BALANCE_OFFSET)[0]
+
+    def set_cents(self, slot, cents):
+        _BALANCE.pack_into(self._map, self._offset(slot) + _BALANCE_OFFSET, cents)
+
+    def append(self, account_id, cents):
+        """Ajoute un enregistrement et retourne son emplacement"""
+        slot = self._count
+        end = HEADER.size + (slot + 1) * RECORD.size
+        if end > len(self._map):
+            self._map.resize(max(end, 2 * len(self._map)))
+        RECORD.pack_into(self._map, end - RECORD.size, account_id, cents)
+        self._count += 1
+        struct.pack_into("<Q", self._map, _COUNT_OFFSET, self._count)
+        return slot
+
+    def records(self):
+        """Itère sur les couples (numéro de compte, solde en centimes)"""
+        for offset in range(HEADER.size, HEADER.size + self._count * RECORD.size, RECORD.size):
+            yield RECORD.unpack_from(self._map, offset)
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def convert_json(json_file, store_path, account_id=0):
+    """Convertit un fichier de données JSON ({"balance": ...}) en magasin d'enregistrements"""
+    with open(json_file, 'r') as file:
+        data = json.load(file)
+
+    if os.path.exists(store_path):
+        os.remove(store_path)
+    store = RecordStore(store_path)
+    try:
+        store.append(account_id, to_cents(data.get('balance', 1000.0)))
+        store.flush()
+    finally:
+        store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Conversion du fichier de données JSON en enregistrements binaires")
+    parser.add_argument("json_file", help="Fichier de données JSON (account_data.json)")
+    parser.add_argument("store_file", help="Fichier d'enregistrements à créer")
+    args = parser.parse_args(argv)
+
+    convert_json(args.json_file, args.store_file)
+    store = RecordStore(args.store_file)
+    for account_id, cents in store.records():
+        print(f"Compte {account_id}: {Money(cents)}")
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
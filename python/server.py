@@ -0,0 +1,207 @@
+import os
+import sys
+import asyncio
+import argparse
+import threading
+
+from ledger import Ledger
+from money import Money, format_cents
+from account_manager import ERROR_MESSAGES, INVALID_REQUEST
+
+_MAX_LINE = 1024
+
+
+class _AccountProtocol(asyncio.Protocol):
+    """Connexion client : les requêtes reçues ensemble sont traitées et répondues en un seul envoi"""
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.buffer = b""
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        lines = (self.buffer + data).split(b"\n")
+        self.buffer = lines.pop()
+        if len(self.buffer) > _MAX_LINE:
+            self.transport.close()
+            return
+
+        execute = self.server.execute
+        responses = []
+        for line in lines:
+            if line.strip().upper() == b"QUIT":
+                self.transport.write(b"".join(responses))
+                self.transport.close()
+                return
+            responses.append(execute(line))
+        self.transport.write(b"".join(responses))
+
+    # Contrôle de flux : on cesse de lire tant que le client ne consomme pas les réponses
+    def pause_writing(self):
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        self.transport.resume_reading()
+
+
+class AccountServer:
+    """Service TCP asyncio exposant solde, crédit et débit pour de nombreux comptes.
+
+    Protocole texte, une requête par ligne, réponses dans l'ordre des requêtes
+    (les requêtes peuvent être envoyées en rafale sans attendre les réponses) :
+
+        BALANCE <compte>            -> OK <solde>
+        CREDIT <compte> <montant>   -> OK <nouveau solde> | ERR <code> <message>
+        DEBIT <compte> <montant>    -> OK <nouveau solde> | ERR <code> <message>
+        TRANSFER <de> <vers> <montant> -> OK <solde de> <solde vers> | ERR <code> <message>
+        QUIT
+
+    Les opérations s'exécutent sur la boucle d'événements, donc dans l'ordre
+    et sans entrelacement pour un même compte. Le grand livre est sauvegardé
+    périodiquement dans un thread, qui en prend une copie sous le verrou des
+    opérations puis l'écrit ; une seule sauvegarde est en cours à la fois.
+    """
+
+    def __init__(self, ledger=None, data_file=None, save_interval=1.0):
+        self.data_file = data_file
+        if ledger is None:
+            ledger = Ledger.load(data_file) if data_file and os.path.exists(data_file) else Ledger()
+        self.ledger = ledger
+        self.save_interval = save_interval
+        self.port = None
+        self._server = None
+        self._persist_task = None
+        self._saving = None
+        self._dirty = False
+        # Pris par chaque requête et par la copie du grand livre faite dans le thread de sauvegarde
+        self._lock = threading.Lock()
+
+    def execute(self, line):
+        parts = line.split()
+        with self._lock:
+            return self._execute(parts)
+
+    def _execute(self, parts):
+        try:
+            command = parts[0].upper()
+            account_id = int(parts[1])
+            if command == b"BALANCE" and len(parts) == 2:
+                return b"OK %s\n" % format_cents(self.ledger.get_balance(account_id).cents).encode()
+            if command in (b"CREDIT", b"DEBIT") and len(parts) == 3:
+                cents = Money.parse(parts[2].decode("ascii")).cents
+                error, balance = self.ledger.apply(account_id, command.decode().lower(), cents)
+                if error is not None:
+                    return f"ERR {error} {ERROR_MESSAGES[error]}\n".encode()
+                self._dirty = True
+                return b"OK %s\n" % format_cents(balance).encode()
+            if command == b"TRANSFER" and len(parts) == 4:
+                to_id = int(parts[2])
+                cents = Money.parse(parts[3].decode("ascii")).cents
+                legs = ((account_id, "debit", cents), (to_id, "credit", cents))
+                error, balances = self.ledger.apply_transaction(legs)
+                if error is not None:
+                    return f"ERR {error} {ERROR_MESSAGES[error]}\n".encode()
+                self._dirty = True
+                return b"OK %s %s\n" % (format_cents(balances[account_id]).encode(),
+                                        format_cents(balances[to_id]).encode())
+        except (IndexError, ValueError, UnicodeDecodeError, OverflowError):
+            # Requête mal formée ou refusée par le grand livre : réponse d'erreur, la connexion reste ouverte
+            pass
+        return f"ERR {INVALID_REQUEST} Requête invalide.\n".encode()
+
+    async def start(self, host="127.0.0.1", port=0):
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(lambda: _AccountProtocol(self), host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.data_file:
+            self._persist_task = asyncio.create_task(self._persist_loop())
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._persist_task is not None:
+            self._persist_task.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+        # Attend la sauvegarde en cours (tâche périodique annulée pendant l'écriture) avant la dernière
+        await self.save()
+
+    async def save(self):
+        """Sauvegarde le grand livre hors de la boucle d'événements si des opérations ont eu lieu"""
+        while self._saving is not None and not self._saving.done():
+            await asyncio.wait((self._saving,))
+        if not self.data_file or not self._dirty:
+            return
+        self._dirty = False
+        self._saving = asyncio.get_running_loop().run_in_executor(
+            None, _write_snapshot, self.ledger, self._lock, self.data_file)
+        # L'annulation de l'appelant n'interrompt pas l'écriture, que close() attend
+        await asyncio.shield(self._saving)
+
+    async def _persist_loop(self):
+        while True:
+            await asyncio.sleep(self.save_interval)
+            await self.save()
+
+
+def _write_snapshot(ledger, lock, path):
+    with lock:
+        snapshot = ledger.copy()
+    tmp_file = path + ".tmp"
+    snapshot.save(tmp_file)
+    os.replace(tmp_file, path)
+
+
+class AccountClient:
+    """Client du service, avec envoi des requêtes en rafale"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, *commands):
+        """Envoie toutes les requêtes puis lit les réponses, dans l'ordre"""
+        self.writer.write("".join(f"{command}\n" for command in commands).encode())
+        await self.writer.drain()
+        return [(await self.reader.readline()).decode().rstrip("\n") for _ in commands]
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def _serve(args):
+    server = await AccountServer(data_file=args.data_file, save_interval=args.save_interval).start(args.host, args.port)
+    print(f"Service de gestion de compte à l'écoute sur {args.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service réseau de gestion de comptes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-file", default="ledger.bin", help="Fichier du grand livre")
+    parser.add_argument("--save-interval", type=float, default=1.0, help="Intervalle de sauvegarde en secondes")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import os
+import threading
+import multiprocessing
+
+from money import Money, to_cents, format_cents
+from ledger import Ledger, DEFAULT_BALANCE
+from account_manager import ERROR_MESSAGES, INVALID_REQUEST
+from journal import DURABILITY_GROUP
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+# Commandes du routeur vers un processus de tranche
+_APPLY = "apply"
+_BALANCES = "balances"
+_CHECKPOINT = "checkpoint"
+_CLOSE = "close"
+
+
+def shard_of(account_id, shards):
+    """Tranche d'un compte : hachage multiplicatif, réparti uniformément même pour des numéros consécutifs"""
+    return (((account_id * _HASH_MULTIPLIER) & _MASK64) >> 32) % shards
+
+
+def _shard_files(directory, shard):
+    base = os.path.join(directory, f"shard-{shard}")
+    return base + ".ldg", base + ".wal"
+
+
+def _apply_all(apply, payload):
+    """Résultat de chaque opération d'un lot ; une opération mal formée est refusée seule (INVALID_REQUEST)"""
+    results = []
+    append = results.append
+    for account_id, op, cents in payload:
+        try:
+            append(apply(account_id, op, cents))
+        except (ValueError, TypeError, OverflowError):
+            # Numéro de compte hors limites ou montant non entier : rien n'a été journalisé
+            # (un solde hors de l'entier 64 bits est refusé par le grand livre avec OVERFLOW)
+            append((INVALID_REQUEST, None))
+    return results
+
+
+def _worker(connection, shard, directory, durability, default_balance):
+    """Boucle d'un processus de tranche : applique dans l'ordre les lots reçus du routeur"""
+    if directory is not None:
+        data_file, log_file = _shard_files(directory, shard)
+        ledger = Ledger.load(data_file, default_balance) if os.path.exists(data_file) else Ledger(default_balance)
+        ledger.open_log(log_file, durability)
+    else:
+        data_file = None
+        ledger = Ledger(default_balance)
+
+    apply = ledger.apply
+    get_balance = ledger.get_balance
+    while True:
+        try:
+            command, payload = connection.recv()
+        except EOFError:
+            break
+        if command == _APPLY:
+            try:
+                connection.send(_apply_all(apply, payload))
+            except Exception as error:
+                # Échec d'écriture du journal : l'erreur est renvoyée au routeur sans
+                # arrêter la tranche ; les opérations précédentes du lot restent appliquées
+                connection.send(error)
+        elif command == _BALANCES:
+            connection.send([get_balance(account_id).cents for account_id in payload])
+        elif command == _CHECKPOINT:
+            if data_file is not None:
+                ledger.checkpoint(data_file)
+            connection.send(len(ledger))
+        elif command == _CLOSE:
+            if data_file is not None:
+                ledger.checkpoint(data_file)
+            ledger.close()
+            connection.send(len(ledger))
+            break
+    connection.close()
+
+
+class ShardedLedger:
+    """Grand livre réparti sur plusieurs processus, un par tranche de comptes.
+
+    Chaque compte appartient à une tranche (`shard_of`) ; le processus de la
+    tranche possède son grand livre et son stockage (<directory>/shard-<n>.ldg
+    et son journal .wal) et applique les opérations dans l'ordre reçu. Le
+    routeur, dans le processus appelant, transmet les opérations par tubes :
+    `apply_many` envoie un lot à chaque tranche concernée avant d'attendre les
+    réponses, si bien que les tranches travaillent en parallèle, chacune sur
+    son cœur. Un appel unitaire coûte un aller-retour : regrouper les
+    opérations est indispensable pour passer à l'échelle.
+
+    Les opérations portent sur un seul compte (pas de virement entre tranches).
+    Sans `directory`, les tranches restent en mémoire.
+    """
+
+    def __init__(self, workers=None, directory=None, durability=DURABILITY_GROUP, default_balance=DEFAULT_BALANCE):
+        self.workers = workers or os.cpu_count() or 1
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connections = []
+        self._processes = []
+        context = multiprocessing.get_context("spawn")
+        for shard in range(self.workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=_worker, name=f"ledger-shard-{shard}", daemon=True,
+                                      args=(child, shard, directory, durability, default_balance))
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def shard_of(self, account_id):
+        return shard_of(account_id, self.workers)
+
+    def _exchange(self, requests):
+        # Envoie toutes les requêtes {tranche: (commande, contenu)} puis recueille les réponses
+        with self._lock:
+            for shard, request in requests.items():
+                self._connections[shard].send(request)
+            replies = {shard: self._connections[shard].recv() for shard in requests}
+        for reply in replies.values():
+            if isinstance(reply, Exception):
+                raise reply
+        return replies
+
+    def apply_many(self, ops):
+        """Applique des (compte, opération, centimes) ; retourne (code d'erreur ou None, solde) par opération.
+
+        L'ordre est conservé pour chaque compte ; les tranches s'exécutent en parallèle.
+        Un numéro de compte ou un montant invalide est refusé avec le code
+        INVALID_REQUEST (solde None) sans interrompre le lot.
+        """
+        workers = self.workers
+        batches = {}
+        positions = {}
+        for position, op in enumerate(ops):
+            shard = (((op[0] * _HASH_MULTIPLIER) & _MASK64) >> 32) % workers
+            if shard not in batches:
+                batches[shard] = []
+                positions[shard] = []
+            batches[shard].append(op)
+            positions[shard].append(position)
+
+        replies = self._exchange({shard: (_APPLY, batch) for shard, batch in batches.items()})
+        results = [None] * sum(len(batch) for batch in batches.values())
+        for shard, reply in replies.items():
+            for position, result in zip(positions[shard], reply):
+                results[position] = result
+        return results
+
+    def apply(self, account_id, op, cents):
+        """Chemin rapide sans message : retourne (code d'erreur ou None, solde en centimes)"""
+        shard = self.shard_of(account_id)
+        return self._exchange({shard: (_APPLY, [(account_id, op, cents)])})[shard][0]
+
+    def get_balance(self, account_id):
+        shard = self.shard_of(account_id)
+        return Money(self._exchange({shard: (_BALANCES, [account_id])})[shard][0])
+
+    def credit_account(self, account_id, amount):
+        cents = to_cents(amount)
+        error, balance = self.apply(account_id, "credit", cents)
+        if error is not None:
+            return False, ERROR_MESSAGES[error]
+        return True, f"Compte crédité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"
+
+    def debit_account(self, account_id, amount):
+        cents = to_cents(amount)
+        error, balance = self.apply(account_id, "debit", cents)
+        if error is not None:
+            return False, ERROR_MESSAGES[error]
+        return True, f"Compte débité de {format_cents(cents)}. Nouveau solde: {format_cents(balance)}"
+
+    def checkpoint(self):
+        """Sauvegarde chaque tranche et vide son journal ; retourne le nombre total de comptes"""
+        replies = self._exchange({shard: (_CHECKPOINT, None) for shard in range(self.workers)})
+        return sum(replies.values())
+
+    def close(self):
+        """Sauvegarde les tranches et arrête les processus"""
+        if not self._processes:
+            return
+        self._exchange({shard: (_CLOSE, None) for shard in range(self.workers)})
+        for connection, process in zip(self._connections, self._processes):
+            process.join()
+            connection.close()
+        self._connections = []
+        self._processes = []
@@ -0,0 +1,382 @@
+import os
+import zlib
+import struct
+
+from balance_codec import encode, decode, detect, decode_legacy, FORMAT_BINARY
+
+STORAGE_JSON = "json"
+STORAGE_MMAP = "mmap"
+STORAGE_SQLITE = "sqlite"
+STORAGE_MEMORY = "memory"
+STORAGE_BINARY = "binary"
+
+# Variables d'environnement lues quand le constructeur ne précise rien
+DATA_FILE_ENV = "ACCOUNT_DATA_FILE"
+STORAGE_ENV = "ACCOUNT_STORAGE"
+DEFAULT_DATA_FILE = "account_data.json"
+# Fichier par défaut des backends qui ne lisent pas le JSON historique (le
+# backend binaire le convertit en place et garde donc account_data.json)
+DEFAULT_DATA_FILES = {
+    STORAGE_MMAP: "account_data.dat",
+    STORAGE_SQLITE: "account_data.db",
+}
+DEFAULT_BALANCE_CENTS = 100000
+
+# Cache binaire du fichier JSON (<data_file>.cache) : signature, version, taille et
+# crc32 du JSON décrit, solde en centimes, crc32 des champs précédents
+SIDECAR = struct.Struct("<4sHIIq")
+_SIDECAR_CHECKSUM = struct.Struct("<I")
+SIDECAR_MAGIC = b"ACSC"
+SIDECAR_VERSION = 1
+
+# Les modules json, sqlite3 et record_store ne sont importés que par les backends
+# qui les utilisent : une consultation en ligne de commande ne paie que le sien
+
+
+class StorageBackend:
+    """Protocole de persistance du solde d'un compte.
+
+    `load(default)` retourne le solde en centimes (en initialisant le stockage
+    avec `default` s'il est vide) ; `save(cents)` l'écrit et retourne True, ou
+    False en cas d'échec. `paths` liste les fichiers dont l'inode, la taille
+    et la date de modification révèlent une écriture externe (vide : relecture
+    directe, assez rapide pour être faite à chaque fois).
+    """
+
+    paths = ()
+
+    def load(self, default):
+        raise NotImplementedError
+
+    def save(self, cents):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class JsonBackend(StorageBackend):
+    """Fichier JSON {"balance": ...} réécrit à chaque sauvegarde (format historique).
+
+    Avec `sidecar=True`, le solde est aussi écrit dans <path>.cache avec la
+    taille et le crc32 du JSON correspondant : tant que le JSON n'a pas
+    changé, le chargement lit le cache au lieu d'importer json et d'analyser
+    le fichier (démarrage rapide de app.py). Un cache corrompu ou décrivant
+    un autre contenu est ignoré puis réécrit.
+    """
+
+    def __init__(self, path, sidecar=False):
+        self.path = path
+        self.paths = (path,)
+        self.sidecar_path = path + ".cache" if sidecar else None
+
+    def load(self, default):
+        return self._load(default, True)
+
+    def peek(self, default):
+        """Comme load, sans réécrire le cache binaire (consultation en lecture seule)"""
+        return self._load(default, False)
+
+    def _load(self, default, refresh):
+        try:
+            with open(self.path, 'rb') as file:
+                raw = file.read()
+        except IOError:
+            return default
+        if self.sidecar_path is not None:
+            cents = self._read_sidecar(raw)
+            if cents is not None:
+                return cents
+
+        try:
+            cents = decode_legacy(raw)
+        except ValueError:
+            return default
+        if refresh and self.sidecar_path is not None:
+            self._write_sidecar(raw, cents)
+        return cents
+
+    def save(self, cents):
+        import json
+        text = json.dumps({'balance': cents / 100})
+        try:
+            with open(self.path, 'w') as file:
+                file.write(text)
+        except IOError:
+            return False
+        if self.sidecar_path is not None:
+            self._write_sidecar(text.encode(), cents)
+        return True
+
+    def _read_sidecar(self, raw):
+        try:
+            with open(self.sidecar_path, 'rb') as file:
+                data = file.read()
+        except IOError:
+            return None
+        if len(data) != SIDECAR.size + _SIDECAR_CHECKSUM.size:
+            return None
+        magic, version, size, checksum, cents = SIDECAR.unpack_from(data)
+        if (magic != SIDECAR_MAGIC or version != SIDECAR_VERSION
+                or _SIDECAR_CHECKSUM.unpack_from(data, SIDECAR.size)[0] != zlib.crc32(data[:SIDECAR.size])
+                or size != len(raw) or checksum != zlib.crc32(raw)):
+            return None
+        return cents
+
+    def _write_sidecar(self, raw, cents):
+        header = SIDECAR.pack(SIDECAR_MAGIC, SIDECAR_VERSION, len(raw), zlib.crc32(raw), cents)
+        try:
+            with open(self.sidecar_path, 'wb') as file:
+                file.write(header + _SIDECAR_CHECKSUM.pack(zlib.crc32(header)))
+        except IOError:
+            pass
+
+
+class BinaryBackend(StorageBackend):
+    """Enregistrement de solde binaire de 24 octets (balance_codec.py), réécrit en place.
+
+    Pas d'analyse de texte : le chargement décode un struct et vérifie son
+    crc32. Un fichier JSON historique {"balance": ...} trouvé au même
+    emplacement est reconnu au chargement et converti (remplacement
+    atomique) ; un enregistrement corrompu est traité comme un JSON illisible.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.paths = (path,)
+        self._file = None
+
+    def load(self, default):
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read()
+        except IOError:
+            data = b""
+        if not data:
+            cents = default
+            self._replace(cents)
+        elif detect(data) == FORMAT_BINARY:
+            try:
+                cents = decode(data)[1]
+            except ValueError:
+                return default
+        else:
+            try:
+                cents = decode_legacy(data)
+            except ValueError:
+                return default
+            self._replace(cents)
+        self._open()
+        return cents
+
+    def peek(self, default):
+        """Solde lu sans créer ni convertir le fichier (consultation en lecture seule)"""
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read()
+        except IOError:
+            return default
+        try:
+            if not data:
+                return default
+            if detect(data) == FORMAT_BINARY:
+                return decode(data)[1]
+            return decode_legacy(data)
+        except ValueError:
+            return default
+
+    def save(self, cents):
+        try:
+            if self._file is None:
+                self._open()
+            self._file.seek(0)
+            self._file.write(encode(cents))
+            return True
+        except IOError:
+            return False
+
+    def _replace(self, cents):
+        # Création ou conversion : fichier temporaire puis remplacement atomique
+        tmp_file = self.path + ".tmp"
+        try:
+            with open(tmp_file, 'wb') as file:
+                file.write(encode(cents))
+            os.replace(tmp_file, self.path)
+        except IOError:
+            pass
+
+    def _open(self):
+        # Rouvert à chaque chargement : le fichier a pu être remplacé entre-temps
+        self.close()
+        try:
+            self._file = open(self.path, 'r+b', buffering=0)
+        except IOError:
+            self._file = None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RecordStoreBackend(StorageBackend):
+    """Enregistrement 0 d'un fichier binaire projeté en mémoire (record_store.py), mis à jour en place"""
+
+    def __init__(self, path):
+        from record_store import RecordStore
+        self.path = path
+        self.store = RecordStore(path)
+
+    def load(self, default):
+        if len(self.store) == 0:
+            self.store.append(0, default)
+        return self.store.get_cents(0)
+
+    def save(self, cents):
+        self.store.set_cents(0, cents)
+        return True
+
+    def close(self):
+        self.store.close()
+
+
+class SqliteBackend(StorageBackend):
+    """Base SQLite en mode WAL : une ligne par compte, une transaction par sauvegarde.
+
+    Les requêtes sont préparées une fois (cache de sqlite3) ; avec le commit
+    groupé d'AccountManager, une sauvegarde couvre toutes les opérations de
+    l'intervalle. synchronous=NORMAL : en mode WAL, une transaction validée
+    survit à l'arrêt du processus, seul un arrêt du système peut perdre les
+    dernières.
+    """
+
+    _SELECT = "SELECT balance FROM accounts WHERE id = ?"
+    _INSERT = "INSERT OR IGNORE INTO accounts (id, balance) VALUES (?, ?)"
+    _UPDATE = "UPDATE accounts SET balance = ? WHERE id = ?"
+
+    def __init__(self, path, account_id=0, synchronous="NORMAL"):
+        import sqlite3
+        self._errors = sqlite3.Error
+        self.path = path
+        self.paths = (path, path + "-wal")
+        self.account_id = account_id
+        # Autocommit : chaque UPDATE est sa propre transaction ; le commit groupé
+        # écrit depuis son thread, d'où check_same_thread=False
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous}")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS accounts (id INTEGER PRIMARY KEY, balance INTEGER NOT NULL)")
+
+    def load(self, default):
+        row = self._connection.execute(self._SELECT, (self.account_id,)).fetchone()
+        if row is not None:
+            return row[0]
+        self._connection.execute(self._INSERT, (self.account_id, default))
+        return default
+
+    def save(self, cents):
+        try:
+            self._connection.execute(self._UPDATE, (cents, self.account_id))
+            return True
+        except self._errors:
+            return False
+
+    def close(self):
+        self._connection.close()
+
+
+class MemoryBackend(StorageBackend):
+    """Solde gardé en mémoire uniquement, pour les tests et les bancs d'essai"""
+
+    def __init__(self, cents=None):
+        self.cents = cents
+
+    def load(self, default):
+        if self.cents is None:
+            self.cents = default
+        return self.cents
+
+    def save(self, cents):
+        self.cents = cents
+        return True
+
+
+BACKENDS = {
+    STORAGE_JSON: JsonBackend,
+    STORAGE_MMAP: RecordStoreBackend,
+    STORAGE_SQLITE: SqliteBackend,
+    STORAGE_MEMORY: lambda path: MemoryBackend(),
+    STORAGE_BINARY: BinaryBackend,
+}
+
+
+def resolve_data_file(data_file=None, storage=None):
+    """Fichier de données : argument, sinon $ACCOUNT_DATA_FILE, sinon le fichier par défaut du backend.
+
+    account_data.json en JSON et en binaire, account_data.dat en mmap,
+    account_data.db en SQLite ; `storage` est résolu comme par make_backend.
+    """
+    data_file = data_file or os.environ.get(DATA_FILE_ENV)
+    if data_file:
+        return data_file
+    if storage is not None and not isinstance(storage, str):
+        return DEFAULT_DATA_FILE
+    return DEFAULT_DATA_FILES.get(resolve_storage(storage), DEFAULT_DATA_FILE)
+
+
+def resolve_storage(storage=None):
+    """Nom du backend : argument, sinon $ACCOUNT_STORAGE, sinon json"""
+    storage = storage or os.environ.get(STORAGE_ENV) or STORAGE_JSON
+    if storage not in BACKENDS:
+        raise ValueError(f"Stockage inconnu: {storage}")
+    return storage
+
+
+def read_balance(storage=None, data_file=None, sidecar=False):
+    """Solde en centimes sans rien créer ni écrire (consultation --balance).
+
+    Un fichier absent ou vide vaut le solde initial, comme au premier
+    chargement ; le cache binaire du JSON est lu s'il est à jour, jamais réécrit.
+    """
+    storage = resolve_storage(storage)
+    data_file = resolve_data_file(data_file, storage)
+    if storage == STORAGE_MEMORY or not os.path.exists(data_file) or os.path.getsize(data_file) == 0:
+        return DEFAULT_BALANCE_CENTS
+    if storage == STORAGE_JSON:
+        return JsonBackend(data_file, sidecar).peek(DEFAULT_BALANCE_CENTS)
+    if storage == STORAGE_BINARY:
+        return BinaryBackend(data_file).peek(DEFAULT_BALANCE_CENTS)
+    if storage == STORAGE_MMAP:
+        from record_store import RecordStore
+        store = RecordStore(data_file)
+        try:
+            return store.get_cents(0) if len(store) else DEFAULT_BALANCE_CENTS
+        finally:
+            store.close()
+
+    import sqlite3
+    from urllib.parse import quote
+    # Sans fichier -wal, la base a été fermée proprement : immutable=1 évite que
+    # SQLite crée ses fichiers -wal et -shm pour une simple lecture
+    mode = "mode=ro" if os.path.exists(data_file + "-wal") else "immutable=1"
+    connection = sqlite3.connect(f"file:{quote(os.path.abspath(data_file))}?{mode}", uri=True)
+    try:
+        row = connection.execute(SqliteBackend._SELECT, (0,)).fetchone()
+    except sqlite3.Error:
+        row = None
+    finally:
+        connection.close()
+    return row[0] if row is not None else DEFAULT_BALANCE_CENTS
+
+
+def make_backend(storage, data_file, sidecar=False):
+    """Backend par nom ("json", "binary", "mmap", "sqlite", "memory", $ACCOUNT_STORAGE par défaut) ou instance.
+
+    `sidecar` active le cache binaire du backend JSON (ignoré par les autres).
+    """
+    if storage is not None and not isinstance(storage, str):
+        return storage
+    storage = resolve_storage(storage)
+    if storage == STORAGE_JSON:
+        return JsonBackend(data_file, sidecar)
+    return BACKENDS[storage](data_file)
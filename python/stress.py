@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import multiprocessing
+
+from account_manager import AccountManager
+from locking import CONCURRENCY_PROCESS
+
+
+def _worker(data_file, threads, ops):
+    account = AccountManager(data_file, concurrency=CONCURRENCY_PROCESS)
+
+    def hammer():
+        for _ in range(ops):
+            account.debit_account(1)
+
+    workers = [threading.Thread(target=hammer) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    account.close()
+
+
+def run_stress(data_file, threads, processes, ops):
+    """Débite 1.00 `ops` fois depuis threads × processus sur un compte crédité du total exact.
+
+    Le solde final doit être nul : tout reliquat correspond à des mises à jour perdues.
+    """
+    total = threads * processes * ops
+    with open(data_file, 'w') as file:
+        json.dump({'balance': float(total)}, file)
+
+    started = time.perf_counter()
+    workers = [multiprocessing.Process(target=_worker, args=(data_file, threads, ops)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    final = AccountManager(data_file).get_balance()
+    return {
+        'threads': threads,
+        'processes': processes,
+        'ops': total,
+        'seconds': elapsed,
+        'ops_per_second': total / elapsed,
+        'final_balance': float(final),
+        'lost_updates': final.cents // 100,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge : débits concurrents depuis N threads × M processus")
+    parser.add_argument("--threads", type=int, default=4, help="Threads par processus")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Nombre maximal de processus")
+    parser.add_argument("--ops", type=int, default=500, help="Débits par thread")
+    args = parser.parse_args(argv)
+
+    lost = 0
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, 'account_data.json')
+        print(f"{'processus':>9} {'threads':>7} {'opérations':>10} {'op/s':>10} {'perdues':>8}")
+        for processes in range(1, args.processes + 1):
+            result = run_stress(data_file, args.threads, processes, args.ops)
+            lost += result['lost_updates']
+            print(f"{processes:>9} {args.threads:>7} {result['ops']:>10} "
+                  f"{result['ops_per_second']:>10,.0f} {result['lost_updates']:>8}")
+
+    if lost:
+        print(f"ÉCHEC: {lost} mises à jour perdues")
+        return 1
+    print("✓ Aucune mise à jour perdue")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
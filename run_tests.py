@@ -11,6 +11,30 @@ import sys
 import unittest
 import argparse
 
+# Fichiers de tests unitaires, dans l'ordre d'exécution
+UNIT_TEST_FILES = [
+    'test_account_manager.py',
+    'test_app.py',
+    'test_money.py',
+    'test_journal.py',
+    'test_ledger.py',
+    'test_importer.py',
+    'test_server.py',
+    'test_locking.py',
+    'test_record_store.py',
+    'test_commit_scheduler.py',
+    'test_parity.py',
+    'test_fuzz.py',
+    'test_history.py',
+    'test_metrics.py',
+    'test_storage.py',
+    'test_idempotency.py',
+    'test_shard.py',
+    'test_balance_table.py',
+    'test_bulk.py',
+    'test_balance_codec.py',
+]
+
 def run_tests(e2e=True, unit=True):
     """Exécute les tests spécifiés"""
     test_loader = unittest.TestLoader()
@@ -19,15 +43,9 @@ def run_tests(e2e=True, unit=True):
     # Ajouter les tests unitaires si demandé
     if unit:
         print("\n=== Exécution des tests unitaires ===\n")
-        # Tester AccountManager
-        if os.path.exists('test_account_manager.py'):
-            account_tests = test_loader.discover('.', pattern='test_account_manager.py')
-            test_suite.addTest(account_tests)
-
-        # Tester app.py
-        if os.path.exists('test_app.py'):
-            app_tests = test_loader.discover('.', pattern='test_app.py')
-            test_suite.addTest(app_tests)
+        for test_file in UNIT_TEST_FILES:
+            if os.path.exists(test_file):
+                test_suite.addTest(test_loader.discover('.', pattern=test_file))
 
     # Ajouter les tests E2E si demandé
     if e2e:
@@ -76,8 +94,14 @@ def main():
     parser = argparse.ArgumentParser(description="Exécution des tests pour la migration COBOL vers Python")
     parser.add_argument('--unit-only', action='store_true', help="Exécuter uniquement les tests unitaires")
     parser.add_argument('--e2e-only', action='store_true', help="Exécuter uniquement les tests E2E")
+    parser.add_argument('--bench', action='store_true', help="Exécuter le banc d'essai des performances (voir benchmark.py)")
     args = parser.parse_args()
 
+    # Le banc d'essai remplace l'exécution des tests
+    if args.bench:
+        import benchmark
+        return benchmark.main([])
+
     # Déterminer quels tests exécuter
     run_unit = not args.e2e_only
     run_e2e = not args.unit_only
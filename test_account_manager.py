@@ -18,6 +18,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'pyth
 
 # Importer le module à tester
 from python.account_manager import AccountManager
+from python.money import PIC_9_6_V99_MAX
+from python.batch import parse_ops
 
 class TestAccountManager(unittest.TestCase):
     """Tests unitaires pour la classe AccountManager"""
@@ -213,6 +215,100 @@ class TestAccountManager(unittest.TestCase):
 
         print("✓ UT-PY-AM-10: Précision des nombres conforme aux attentes COBOL")
 
+    def test_ut_py_am_11_apply_batch(self):
+        """UT-PY-AM-11: Application d'un lot d'opérations"""
+        account = AccountManager(self.test_file)
+
+        results = account.apply_batch([
+            ("credit", 500.0),
+            ("debit", 2000.0),
+            ("debit", 0.0),
+            ("virement", 10.0),
+            ("debit", 1500.0),
+        ])
+
+        # Les opérations sont validées dans l'ordre avec les règles unitaires
+        self.assertEqual(results, [
+            (True, None),
+            (False, "insufficient_funds"),
+            (False, "invalid_amount"),
+            (False, "unknown_operation"),
+            (True, None),
+        ])
+        self.assertEqual(account.get_balance(), 0.0)
+
+        # Vérifier la persistance
+        with open(self.test_file, 'r') as f:
+            self.assertEqual(json.load(f)['balance'], 0.0)
+
+        print("✓ UT-PY-AM-11: Lot d'opérations appliqué correctement")
+
+    def test_ut_py_am_12_apply_batch_single_write(self):
+        """UT-PY-AM-12: Une seule écriture par lot, messages à la demande"""
+        account = AccountManager(self.test_file)
+
+        with patch.object(account, '_save_balance', wraps=account._save_balance) as mock_save:
+            results = account.apply_batch([("credit", 1.0)] * 1000 + [("debit", 3000.0)], messages=True)
+
+        mock_save.assert_called_once()
+        self.assertIn("Nouveau solde: 2000.00", results[999][1])
+        self.assertEqual(results[-1], (False, "Fonds insuffisants."))
+
+        print("✓ UT-PY-AM-12: Lot persisté en une seule écriture")
+
+    def test_ut_py_am_13_pic_limit(self):
+        """UT-PY-AM-13: Plafond optionnel PIC 9(6)V99"""
+        account = AccountManager(self.test_file, max_balance=PIC_9_6_V99_MAX / 100)
+
+        # 1000.00 + 998999.99 = 999999.99, la capacité maximale du champ COBOL
+        success, _ = account.credit_account(998999.99)
+        self.assertTrue(success)
+
+        success, message = account.credit_account(0.01)
+        self.assertFalse(success)
+        self.assertIn("capacité", message)
+        self.assertEqual(account.get_balance(), 999999.99)
+
+        print("✓ UT-PY-AM-13: Dépassement de capacité rejeté")
+
+    def test_ut_py_am_14_watch_cached_balance(self):
+        """UT-PY-AM-14: Lecture différée et mise en cache du solde (watch=True)"""
+        # Fichier modifié il y a une minute : sa date de modification est fiable
+        stat = os.stat(self.test_file)
+        os.utime(self.test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns - 60 * 10**9))
+
+        with patch('json.loads', wraps=json.loads) as mock_load:
+            reader = AccountManager(self.test_file, watch=True)
+            self.assertEqual(mock_load.call_count, 0)
+
+            # Première consultation : chargement, puis lectures servies par le cache
+            for _ in range(100):
+                self.assertEqual(reader.get_balance(), 1000.0)
+            self.assertEqual(mock_load.call_count, 1)
+
+            # Un autre écrivain modifie le fichier : le changement est détecté
+            writer = AccountManager(self.test_file)
+            writer.credit_account(250.0)
+            self.assertEqual(reader.get_balance(), 1250.0)
+            self.assertEqual(mock_load.call_count, 3)
+
+        print("✓ UT-PY-AM-14: Solde mis en cache et revalidé")
+
+    def test_ut_py_am_15_batch_file_lines(self):
+        """UT-PY-AM-15: Lignes de batch.py, virgule séparatrice ou décimale"""
+        lines = ["credit 12,50\n", "CREDIT,12,50\n", "debit, 2.5\n", "# commentaire\n", "\n",
+                 "debit\t1\n", "credit 1,234\n", "credit\n"]
+        ops = [(op, float(amount)) for op, amount in parse_ops(lines)]
+        self.assertEqual(ops, [("credit", 12.5), ("credit", 12.5), ("debit", 2.5), ("debit", 1.0),
+                               ("credit", 0.0), ("credit", 0.0)])
+
+        account = AccountManager(self.test_file)
+        results = account.apply_batch(parse_ops(lines))
+        self.assertEqual([success for success, _ in results], [True, True, True, True, False, False])
+        self.assertEqual(account.get_balance(), 1021.5)
+
+        print("✓ UT-PY-AM-15: Montants à virgule décimale acceptés par batch.py")
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
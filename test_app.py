@@ -8,7 +8,11 @@ Validation des fonctions d'interface utilisateur
 
 import os
 import sys
+import json
+import time
+import tempfile
 import unittest
+import subprocess
 from unittest.mock import patch, MagicMock
 from io import StringIO
 
@@ -16,7 +20,16 @@ from io import StringIO
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
 
 # Importer les modules à tester
-from python.app import display_menu, get_amount, main
+from python.app import display_menu, get_amount, main, run_batch
+from python.account_manager import AccountManager
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python', 'app.py')
+
+def run_app(*args, stdin=""):
+    """Exécute app.py dans un processus séparé ; retourne sa sortie standard"""
+    environment = {key: value for key, value in os.environ.items() if not key.startswith("ACCOUNT_")}
+    return subprocess.run([sys.executable, APP, *args], input=stdin, capture_output=True,
+                          text=True, check=True, env=environment, timeout=60).stdout
 
 class TestApp(unittest.TestCase):
     """Tests unitaires pour l'application principale"""
@@ -77,6 +90,18 @@ class TestApp(unittest.TestCase):
 
         print("✓ UT-PY-APP-04: Rejet de montant négatif fonctionnel")
 
+    def test_ut_py_app_10_get_amount_too_precise_then_valid(self):
+        """UT-PY-APP-10: Saisie du montant (plus de deux décimales puis valide)"""
+        with patch('builtins.input', side_effect=["10.005", "10.05"]):
+            with patch('builtins.print') as mock_print:
+                result = get_amount()
+
+        # Le montant est lu exactement, sans passer par un float
+        self.assertEqual(result.cents, 1005)
+        mock_print.assert_called_with("Veuillez entrer un montant valide.")
+
+        print("✓ UT-PY-APP-10: Rejet de montant trop précis fonctionnel")
+
     @patch('python.app.AccountManager')
     def test_ut_py_app_05_option_view_balance(self, mock_account_manager):
         """UT-PY-APP-05: Traitement option 1 (consultation)"""
@@ -156,6 +181,159 @@ class TestApp(unittest.TestCase):
 
         print("✓ UT-PY-APP-09: Rejet d'option invalide fonctionnel")
 
+    def test_ut_py_app_11_batch_mode(self):
+        """UT-PY-APP-11: Mode batch (commandes sans menu, résultats JSONL)"""
+        with tempfile.TemporaryDirectory() as directory:
+            data_file = os.path.join(directory, "account_data.json")
+            account = AccountManager(data_file)
+            commands = StringIO("1\ncredit 500.00\n# commentaire\n\n3 2000.00\ndebit abc\nfoo 1\n2 12,50\nbalance\n")
+            output = StringIO()
+
+            processed = run_batch(account, commands, output, chunk=3)
+            records = [json.loads(line) for line in output.getvalue().splitlines()]
+
+            # Relire le fichier : le solde final est persisté
+            persisted = AccountManager(data_file).get_balance()
+
+        self.assertEqual(processed, 7)
+        self.assertEqual(records[0], {"op": "balance", "ok": True, "balance": 1000.0})
+        self.assertEqual(records[1], {"op": "credit", "ok": True, "amount": 500.0, "balance": 1500.0})
+        self.assertEqual(records[2]["error"], "insufficient_funds")
+        self.assertEqual(records[3]["error"], "invalid_amount")
+        self.assertEqual(records[4]["error"], "unknown_operation")
+        self.assertEqual(records[5]["balance"], 1512.5)
+        self.assertEqual(records[6], {"op": "balance", "ok": True, "balance": 1512.5})
+        self.assertEqual(persisted, 1512.5)
+
+        print("✓ UT-PY-APP-11: Mode batch fonctionnel")
+
+    def test_ut_py_app_12_batch_mode_quit(self):
+        """UT-PY-APP-12: Mode batch (arrêt sur la commande quitter)"""
+        with tempfile.TemporaryDirectory() as directory:
+            data_file = os.path.join(directory, "account_data.json")
+            output = StringIO()
+            with patch('sys.stdin', StringIO("credit 10\n4\ncredit 10\n")), patch('sys.stdout', output):
+                main(["--batch", "--data-file", data_file])
+
+            self.assertEqual(AccountManager(data_file).get_balance(), 1010.0)
+        self.assertEqual(len(output.getvalue().splitlines()), 1)
+
+        print("✓ UT-PY-APP-12: Arrêt du mode batch fonctionnel")
+
+    def test_ut_py_app_13_balance_sidecar(self):
+        """UT-PY-APP-13: Consultation rapide du solde (--balance et cache binaire du JSON)"""
+        with tempfile.TemporaryDirectory() as directory:
+            data_file = os.path.join(directory, "account_data.json")
+            self.assertEqual(run_app("--balance", "--data-file", data_file), "1000.00\n")
+
+            run_app("--batch", "--data-file", data_file, stdin="credit 234.56\n")
+            self.assertTrue(os.path.exists(data_file + ".cache"))
+            self.assertEqual(run_app("--balance", "--data-file", data_file), "1234.56\n")
+
+            # JSON modifié par un autre programme : le cache ne correspond plus
+            with open(data_file, 'w') as file:
+                json.dump({"balance": 42.5}, file)
+            self.assertEqual(run_app("--balance", "--data-file", data_file), "42.50\n")
+
+            # Cache corrompu : ignoré
+            with open(data_file + ".cache", 'r+b') as file:
+                file.seek(-1, os.SEEK_END)
+                file.write(b"\xff")
+            self.assertEqual(run_app("--balance", "--data-file", data_file), "42.50\n")
+            self.assertEqual(run_app(f"--data-file={data_file}", "--balance"), "42.50\n")
+
+            # Mode interactif : pas de cache binaire
+            interactive_file = os.path.join(directory, "interactive.json")
+            with patch('builtins.input', side_effect=["2", "10", "4"]), patch('builtins.print'):
+                main(["--data-file", interactive_file])
+            self.assertEqual(AccountManager(interactive_file).get_balance(), 1010.0)
+            self.assertFalse(os.path.exists(interactive_file + ".cache"))
+
+        print("✓ UT-PY-APP-13: Solde lu depuis le cache binaire")
+
+    def test_ut_py_app_15_balance_read_only(self):
+        """UT-PY-APP-15: --balance ne crée ni ne modifie aucun fichier"""
+        with tempfile.TemporaryDirectory() as directory:
+            def listing():
+                return {name: (os.path.getmtime(os.path.join(directory, name)),
+                               open(os.path.join(directory, name), 'rb').read())
+                        for name in os.listdir(directory)}
+
+            # Fichier absent : solde initial, rien n'est créé
+            for storage in ("json", "binary", "mmap", "sqlite"):
+                data_file = os.path.join(directory, "absent." + storage)
+                self.assertEqual(run_app("--balance", "--data-file", data_file, "--storage", storage), "1000.00\n")
+            data_file = os.path.join(directory, "account_data.json")
+            self.assertEqual(run_app("--balance", "--data-file", data_file), "1000.00\n")
+            self.assertEqual(os.listdir(directory), [])
+
+            # JSON sans cache et JSON historique lu en binaire : ni cache écrit, ni conversion
+            with open(data_file, 'w') as file:
+                json.dump({"balance": 42.5}, file)
+            before = listing()
+            self.assertEqual(run_app("--balance", "--data-file", data_file), "42.50\n")
+            self.assertEqual(run_app("--balance", "--data-file", data_file, "--storage", "binary"), "42.50\n")
+            self.assertEqual(listing(), before)
+
+            # Fichiers existants des autres backends : lus sans être modifiés
+            for storage in ("mmap", "sqlite"):
+                other = os.path.join(directory, "account." + storage)
+                account = AccountManager(other, storage=storage)
+                account.credit_account(5)
+                account.close()
+                before = listing()
+                self.assertEqual(run_app("--balance", "--data-file", other, "--storage", storage), "1005.00\n")
+                self.assertEqual(listing(), before)
+
+        print("✓ UT-PY-APP-15: Consultation du solde en lecture seule")
+
+    def test_ut_py_app_14_daemon_client(self):
+        """UT-PY-APP-14: Démon (--serve) et client (--client)"""
+        with tempfile.TemporaryDirectory() as directory:
+            data_file = os.path.join(directory, "account_data.json")
+            socket_path = os.path.join(directory, "account.sock")
+
+            # Sans démon, le client exécute localement
+            output = run_app("--client", socket_path, "--batch", "--data-file", data_file, stdin="credit 10\n")
+            self.assertEqual(json.loads(output)["balance"], 1010.0)
+
+            server = subprocess.Popen([sys.executable, APP, "--serve", socket_path, "--data-file", data_file])
+            try:
+                for _ in range(500):
+                    if os.path.exists(socket_path):
+                        break
+                    time.sleep(0.01)
+                self.assertEqual(run_app("--client", socket_path, "--balance"), "1010.00\n")
+                output = run_app("--client", socket_path, "--batch", stdin="credit 5\ndebit 5000\nbalance\n")
+                records = [json.loads(line) for line in output.splitlines()]
+                self.assertEqual(records[0]["balance"], 1015.0)
+                self.assertEqual(records[1]["error"], "insufficient_funds")
+                self.assertEqual(records[2], {"op": "balance", "ok": True, "balance": 1015.0})
+
+                # Chemin complet (--storage) : même affichage que le chemin rapide
+                self.assertEqual(run_app("--client", socket_path, "--balance", "--storage", "json"), "1015.00\n")
+
+                # Client parti sans lire la réponse : le démon continue
+                import socket
+                client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                client.connect(socket_path)
+                client.sendall(b"balance\n" * 20000)
+                client.close()
+
+                # Lot plus grand qu'un paquet de run_batch : pas d'interblocage
+                output = run_app("--client", socket_path, "--batch", stdin="credit 1\ndebit 1\n" * 15000)
+                self.assertEqual(len(output.splitlines()), 30000)
+                self.assertEqual(run_app("--client", socket_path, "--balance"), "1015.00\n")
+                self.assertIsNone(server.poll())
+            finally:
+                server.terminate()
+                server.wait()
+
+            # Les opérations du démon sont persistées
+            self.assertEqual(AccountManager(data_file).get_balance(), 1015.0)
+
+        print("✓ UT-PY-APP-14: Démon et client fonctionnels")
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
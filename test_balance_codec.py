@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le format binaire des soldes (balance_codec.py)
+Validation de l'encodage, du décodage en flux et de la conversion du JSON historique
+"""
+
+import io
+import os
+import sys
+import json
+import unittest
+import tempfile
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.balance_codec import (encode, decode, encode_many, detect, RecordReader, RecordWriter,
+                                  iter_records, RECORD_SIZE, FORMAT_BINARY, FORMAT_JSON)
+from python.account_manager import AccountManager
+
+
+class TestBalanceCodec(unittest.TestCase):
+    """Tests unitaires pour l'enregistrement binaire des soldes"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.directory.name, 'account_data.json')
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def test_ut_py_codec_01_records(self):
+        """UT-PY-CODEC-01: Encodage, vérification du crc32 et décodage en flux"""
+        record = encode(-12345, account_id=7)
+        self.assertEqual(len(record), RECORD_SIZE)
+        self.assertEqual(decode(record), (7, -12345))
+        self.assertEqual(detect(record), FORMAT_BINARY)
+        self.assertEqual(detect(b'{"balance": 1000.0}'), FORMAT_JSON)
+
+        corrupted = bytearray(record)
+        corrupted[12] ^= 1
+        for data in (bytes(corrupted), record[:-1], b"XX" + record[2:]):
+            with self.assertRaises(ValueError):
+                decode(data)
+
+        # Enregistrements reçus par morceaux de taille quelconque
+        records = [(account_id, account_id * 1000 - 5) for account_id in range(100)]
+        data = encode_many(records)
+        reader = RecordReader()
+        decoded = []
+        for start in range(0, len(data), 7):
+            decoded.extend(reader.feed(data[start:start + 7]))
+        self.assertEqual(decoded, records)
+        self.assertEqual(reader.pending, 0)
+
+        stream = io.BytesIO()
+        writer = RecordWriter(stream, buffer_records=10)
+        for account_id, cents in records[:25]:
+            writer.write(cents, account_id)
+        writer.write_many(records[25:])
+        self.assertEqual(list(iter_records(io.BytesIO(stream.getvalue()), chunk_size=100)), records)
+        with self.assertRaises(ValueError):
+            list(iter_records(io.BytesIO(data[:-3])))
+        print("✓ UT-PY-CODEC-01: Enregistrements binaires encodés et décodés")
+
+    def test_ut_py_codec_02_legacy_migration(self):
+        """UT-PY-CODEC-02: Le JSON historique est reconnu et converti par le backend binaire"""
+        with open(self.data_file, 'w') as file:
+            json.dump({"balance": 1234.56}, file)
+
+        account = AccountManager(self.data_file, storage="binary")
+        self.assertEqual(account.get_balance(), 1234.56)
+        with open(self.data_file, 'rb') as file:
+            self.assertEqual(decode(file.read()), (0, 123456))
+        account.credit_account(0.44)
+        account.close()
+
+        reader = AccountManager(self.data_file, storage="binary", watch=True)
+        self.assertEqual(reader.get_balance(), 1235.0)
+        writer = AccountManager(self.data_file, storage="binary")
+        writer.debit_account(35.0)
+        self.assertEqual(reader.get_balance(), 1200.0)
+        self.assertEqual(os.path.getsize(self.data_file), RECORD_SIZE)
+        writer.close()
+        reader.close()
+        print("✓ UT-PY-CODEC-02: JSON historique converti au format binaire")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
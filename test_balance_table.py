@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour la table des soldes partagée (balance_table.py)
+Validation de la publication, de la vue en lecture seule et du seqlock
+"""
+
+import os
+import sys
+import struct
+import unittest
+import tempfile
+import subprocess
+from unittest.mock import patch
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.balance_table import BalanceTable, BalanceView, HEADER, SLOT
+from python.account_manager import AccountManager
+
+
+class TestBalanceTable(unittest.TestCase):
+    """Tests unitaires pour les classes BalanceTable et BalanceView"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.directory.name, 'account_data.json')
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def test_ut_py_tbl_01_read_only_view(self):
+        """UT-PY-TBL-01: La vue suit les soldes publiés par l'écrivain et refuse les modifications"""
+        account = AccountManager(self.data_file, shared_table=True)
+        view = BalanceView(self.data_file + ".tbl")
+        self.assertEqual(view.get_balance(), 1000.0)
+
+        account.credit_account(250.25)
+        account.apply_batch([("debit", 50), ("credit", 10)])
+        self.assertEqual(view.get_balance(), 1210.25)
+        self.assertEqual(view.balance, account.get_balance())
+
+        self.assertEqual(view.credit_account(10), (False, "Compte en lecture seule."))
+        self.assertEqual(view.debit_account(10), (False, "Compte en lecture seule."))
+        self.assertEqual(view.apply_batch([("credit", 1)]), [(False, "read_only")])
+        self.assertEqual(view.get_balance(), 1210.25)
+
+        # Lecteur dans un autre processus
+        script = ("import sys; sys.path.insert(0, 'python'); from balance_table import BalanceView; "
+                  f"print(BalanceView({self.data_file + '.tbl'!r}).get_balance())")
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+        self.assertEqual(output.strip(), "1210.25")
+        view.close()
+        account.close()
+        print("✓ UT-PY-TBL-01: Soldes lus sans copie par la vue en lecture seule")
+
+    def test_ut_py_tbl_02_seqlock(self):
+        """UT-PY-TBL-02: Seqlock, comptes multiples et reprise après un écrivain interrompu"""
+        path = os.path.join(self.directory.name, 'balances.tbl')
+        table = BalanceTable(path, capacity=4)
+        for account_id in range(4):
+            table.publish(account_id * 100, account_id)
+        table.publish(12345, 2)
+        with self.assertRaises(ValueError):
+            table.publish(0, 99)
+        self.assertEqual(BalanceView(path, 2).cents(), 12345)
+        with self.assertRaises(KeyError):
+            BalanceView(path, 99).cents()
+
+        # Écrivain arrêté en pleine mise à jour : séquence impaire
+        offset = HEADER.size + 3 * SLOT.size
+        struct.pack_into("<Q", table._map, offset, 7)
+        view = BalanceView(path, 3)
+        with patch('python.balance_table._MAX_RETRIES', 10):
+            with self.assertRaises(TimeoutError):
+                view.cents()
+        table.close()
+
+        # Un nouvel écrivain rétablit une séquence paire et reprend les emplacements
+        table = BalanceTable(path)
+        self.assertEqual(len(table), 4)
+        self.assertEqual(view.cents(), 300)
+        table.publish(301, 3)
+        self.assertEqual(view.cents(), 301)
+        view.close()
+        table.close()
+        print("✓ UT-PY-TBL-02: Lectures cohérentes protégées par le seqlock")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
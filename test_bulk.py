@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour les traitements de masse du grand livre (bulk.py)
+Validation des intérêts, des frais, des règles de débit et du journal
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+from unittest.mock import patch
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.ledger import Ledger
+from python.journal import DURABILITY_NONE
+import bulk
+
+
+class TestBulk(unittest.TestCase):
+    """Tests unitaires pour accrue_interest et charge_fee"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.directory.name, 'ledger.wal')
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def make_ledger(self, balances):
+        ledger = Ledger(lock_stripes=4)
+        for account_id, balance in enumerate(balances):
+            ledger.open_account(account_id, balance)
+        ledger.open_log(self.log_file, DURABILITY_NONE)
+        return ledger
+
+    def test_ut_py_bulk_01_interest_and_fees(self):
+        """UT-PY-BULK-01: Intérêts et frais appliqués en une passe, refus en masque"""
+        ledger = self.make_ledger([0, 0.33, 1000.0, 100.0, 2.0])
+
+        result = ledger.accrue_interest("0.015", minimum_balance=1.0)
+        self.assertEqual(result.applied, 3)
+        self.assertEqual(result.cents, 1500 + 150 + 3)
+        # 0.33 × 1,5 % arrondi à 0 et solde sous le minimum : aucun mouvement
+        self.assertEqual([balance for _, balance in ledger.accounts()], [0, 0.33, 1015.0, 101.5, 2.03])
+
+        result = ledger.charge_fee(1.0, rate="0.01")
+        self.assertEqual(sorted(result.rejected['insufficient_funds']), [0, 1])
+        self.assertEqual(len(result.rejected['invalid_amount']), 0)
+        self.assertEqual([balance for _, balance in ledger.accounts()], [0, 0.33, 1003.85, 99.48, 1.01])
+        self.assertEqual(str(result), "3 comptes débités pour 14.19, 2 refusés")
+
+        # Un seul enregistrement par traitement : le rejeu retrouve les soldes
+        ledger.close()
+        replayed = Ledger()
+        replayed.open_log(self.log_file)
+        self.assertEqual(replayed.get_balance(3), 99.48)
+        self.assertEqual(replayed.log.pending, 2)
+        replayed.close()
+
+        # Le grand livre reste modifiable : les vues sur ses tableaux sont libérées
+        ledger.open_account(99)
+        with self.assertRaises(ValueError):
+            ledger.accrue_interest("0.0000000001")
+        with self.assertRaises(ValueError):
+            ledger.charge_fee(-1.0)
+        print("✓ UT-PY-BULK-01: Intérêts et frais appliqués en masse")
+
+    def test_ut_py_bulk_02_same_results_without_numpy(self):
+        """UT-PY-BULK-02: Le calcul en Python pur donne les mêmes soldes et refus"""
+        balances = [(account_id * 7919) % 250000 / 100 for account_id in range(2000)]
+        outcomes = []
+        for numpy in (bulk.numpy, None):
+            with patch('bulk.numpy', numpy):
+                ledger = Ledger()
+                for account_id, balance in enumerate(balances):
+                    ledger.open_account(account_id, balance)
+                interest = ledger.accrue_interest("0.0125", minimum_balance=10.0)
+                fee = ledger.charge_fee(12.5, rate="0.001")
+                outcomes.append((list(ledger.accounts()), interest.applied, interest.cents, fee.applied,
+                                 fee.cents, sorted(int(account_id) for account_id in fee.rejected['insufficient_funds'])))
+        self.assertEqual(outcomes[0], outcomes[1])
+        print("✓ UT-PY-BULK-02: Résultats identiques avec et sans NumPy")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le commit groupé (commit_scheduler.py)
+Validation du regroupement des écritures et des accusés de réception
+"""
+
+import os
+import sys
+import json
+import unittest
+import tempfile
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.account_manager import AccountManager
+from python.commit_scheduler import CommitScheduler
+
+
+class TestCommitScheduler(unittest.TestCase):
+    """Tests unitaires pour la classe CommitScheduler"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.directory.name, 'account_data.json')
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def read_balance(self):
+        with open(self.data_file, 'r') as f:
+            return json.load(f)['balance']
+
+    def test_ut_py_gc_01_coalescing(self):
+        """UT-PY-GC-01: Les opérations sont regroupées en peu d'écritures"""
+        account = AccountManager(self.data_file, group_commit=True, commit_interval_ms=50, commit_max_ops=10000)
+        for _ in range(1000):
+            account.credit_account(1)
+
+        # Accusé de réception durable
+        account.commit_future().result(timeout=5)
+        self.assertEqual(self.read_balance(), 2000.0)
+
+        metrics = account.commit_metrics()
+        self.assertEqual(metrics['committed_ops'], 1000)
+        self.assertLess(metrics['commits'], 10)
+        self.assertEqual(metrics['queue_depth'], 0)
+        account.close()
+
+        print("✓ UT-PY-GC-01: Écritures regroupées")
+
+    def test_ut_py_gc_02_max_ops(self):
+        """UT-PY-GC-02: Commit déclenché par le nombre d'opérations"""
+        account = AccountManager(self.data_file, group_commit=True, commit_interval_ms=60000, commit_max_ops=5)
+        for _ in range(5):
+            account.debit_account(1)
+
+        account.commit_future().result(timeout=5)
+        self.assertEqual(self.read_balance(), 995.0)
+        account.close()
+
+        print("✓ UT-PY-GC-02: Seuil d'opérations respecté")
+
+    def test_ut_py_gc_03_close_flushes(self):
+        """UT-PY-GC-03: La fermeture persiste les opérations en attente"""
+        account = AccountManager(self.data_file, group_commit=True, commit_interval_ms=60000)
+        account.credit_account(10)
+        account.close()
+
+        self.assertEqual(AccountManager(self.data_file).get_balance(), 1010.0)
+
+        print("✓ UT-PY-GC-03: Fermeture sans perte")
+
+    def test_ut_py_gc_04_failure(self):
+        """UT-PY-GC-04: Un échec de persistance est remonté au Future"""
+        scheduler = CommitScheduler(lambda: False, interval_ms=1)
+        future = scheduler.mark_dirty()
+
+        with self.assertRaises(IOError):
+            future.result(timeout=5)
+        self.assertGreaterEqual(scheduler.metrics()['failed_commits'], 1)
+        self.assertEqual(scheduler.queue_depth, 1)
+
+        # L'opération jamais persistée est signalée à l'arrêt
+        with self.assertRaises(IOError):
+            scheduler.close()
+
+        print("✓ UT-PY-GC-04: Échec de persistance remonté")
+
+    def test_ut_py_gc_05_retry_after_failure(self):
+        """UT-PY-GC-05: Un commit en échec est retenté et le fichier rattrape la mémoire"""
+        account = AccountManager(self.data_file, group_commit=True, commit_interval_ms=60000)
+        write_balance = account._write_balance
+        attempts = []
+
+        def failing_once(*args):
+            attempts.append(args)
+            return len(attempts) > 1 and write_balance(*args)
+
+        account._write_balance = failing_once
+        account.credit_account(10)
+        with self.assertRaises(IOError):
+            account.flush(timeout=5)
+
+        # Sans nouvelle opération, le nouvel essai persiste le solde en mémoire
+        account.flush()
+        self.assertEqual(self.read_balance(), 1010.0)
+        self.assertEqual(account.commit_metrics()['queue_depth'], 0)
+
+        account.credit_account(5)
+        account.close()
+        self.assertEqual(self.read_balance(), 1015.0)
+        self.assertEqual(AccountManager(self.data_file).get_balance(), 1015.0)
+
+        print("✓ UT-PY-GC-05: Commit retenté après un échec")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
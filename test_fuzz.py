@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le fuzzing différentiel (fuzz.py)
+Validation du modèle de référence COBOL et de la réduction des divergences
+"""
+
+import io
+import os
+import sys
+import random
+import unittest
+import tempfile
+import contextlib
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+import fuzz
+import parity
+
+
+class TestFuzz(unittest.TestCase):
+    """Tests unitaires pour le fuzzing différentiel"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Préparer un worker Python isolé"""
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.workers = (parity.PythonWorker(cls.directory.name), fuzz.CobolModel())
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyer après les tests"""
+        cls.directory.cleanup()
+
+    def test_ut_py_fuzz_01_cobol_model(self):
+        """UT-PY-FUZZ-01: Modèle de la sémantique PIC 9(6)V99"""
+        model = fuzz.CobolModel()
+
+        self.assertEqual(model.run(["2", "500.00", "1", "3", "2000.00"]), [1500.0, 1500.0])
+        # Troncature des chiffres de poids fort au-delà de 999999.99
+        self.assertEqual(model.run(["2", "999999.99"]), [999.99])
+        # Un crédit nul est accepté par le COBOL, sans effet sur le solde
+        self.assertEqual(model.run(["2", "0.00", "4", "1"]), [])
+
+        print("✓ UT-PY-FUZZ-01: Modèle de référence conforme")
+
+    def test_ut_py_fuzz_02_shrink(self):
+        """UT-PY-FUZZ-02: Réduction à une reproduction minimale"""
+        steps = [("1",), ("2", "10.00"), ("9",), ("3", "999.00"), ("2", "5.00"), ("1",)]
+
+        # Divergence artificielle : dès qu'un débit est présent
+        minimal = fuzz.shrink(steps, lambda candidate: any(step[0] == "3" for step in candidate))
+
+        self.assertEqual(minimal, [("3", "1.00")])
+
+        print("✓ UT-PY-FUZZ-02: Réduction fonctionnelle")
+
+    def test_ut_py_fuzz_03_no_divergence_in_range(self):
+        """UT-PY-FUZZ-03: Aucune divergence avec des montants dans la capacité COBOL"""
+        rng = random.Random(3)
+        for _ in range(20):
+            steps = fuzz.generate_steps(rng, 30, edge_ratio=0, exclude_overflow=True)
+            self.assertFalse(fuzz.diverges(steps, self.workers), steps)
+
+        print("✓ UT-PY-FUZZ-03: Comportements identiques dans la capacité COBOL")
+
+    def test_ut_py_fuzz_04_overflow_divergence(self):
+        """UT-PY-FUZZ-04: Dépassement de capacité détecté et réduit"""
+        steps = [("1",), ("2", "999999.99"), ("3", "10.00"), ("1",)]
+        fails = lambda candidate: fuzz.diverges(candidate, self.workers)
+
+        self.assertTrue(fails(steps))
+        self.assertEqual(fuzz.shrink(steps, fails), [("2", "999999.99")])
+
+        print("✓ UT-PY-FUZZ-04: Divergence de capacité détectée")
+
+    def test_ut_py_fuzz_05_known_overflow_excluded(self):
+        """UT-PY-FUZZ-05: Dépassement de capacité généré par défaut, exclu sur demande"""
+        # Par défaut, la divergence connue est générée et détectée
+        overflowing = [fuzz.generate_steps(random.Random(seed), 100, edge_ratio=0.5) for seed in range(10)]
+        self.assertTrue(any(fuzz.diverges(steps, self.workers) for steps in overflowing))
+
+        for seed in range(10):
+            steps = fuzz.generate_steps(random.Random(seed), 100, edge_ratio=0.5, exclude_overflow=True)
+            self.assertFalse(fuzz.diverges(steps, self.workers), steps)
+
+        # --exclude-known-overflow : exclusion annoncée par une note
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = fuzz.main(["--sequences", "4", "--length", "50", "--workers", "1",
+                                "--oracle", "model", "--exclude-known-overflow"])
+        self.assertEqual(status, 0)
+        self.assertIn("divergence connue, délibérément exclue", output.getvalue())
+
+        print("✓ UT-PY-FUZZ-05: Divergence connue exclue sur demande")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour l'historique des transactions (history.py)
+Validation des relevés par période, du solde à une date et des index
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import unittest
+import tempfile
+from unittest.mock import patch
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.history import TransactionHistory
+from python.account_manager import AccountManager
+
+
+class TestHistory(unittest.TestCase):
+    """Tests unitaires pour la classe TransactionHistory"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.history_file = os.path.join(self.directory.name, 'account_data.json.hist')
+        # Historique de référence : 4 comptes, une opération toutes les 10 ns
+        rng = random.Random(15)
+        self.rows = []
+        for row in range(100):
+            self.rows.append((1000 + row * 10, rng.randint(0, 3), row * 100))
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def fill(self):
+        history = TransactionHistory(self.history_file)
+        for timestamp, account_id, balance in self.rows:
+            history.append(account_id, "credit", 100, balance, timestamp)
+        return history
+
+    def check_queries(self, history):
+        for account_id in range(4):
+            for start, end in ((None, None), (1050, 1500), (1995, 2000), (1500, 1050)):
+                expected = [(timestamp, balance) for timestamp, account, balance in self.rows
+                            if account == account_id and (start is None or timestamp >= start)
+                            and (end is None or timestamp < end)]
+                statement = history.statement(account_id, start, end)
+                self.assertEqual([(t.timestamp, t.balance.cents) for t in statement], expected)
+
+            for moment in range(990, 2100, 7):
+                expected = [balance for timestamp, account, balance in self.rows
+                            if account == account_id and timestamp <= moment]
+                balance = history.balance_at(account_id, moment)
+                self.assertEqual(balance, expected[-1] / 100 if expected else None)
+
+    @patch('python.history.SEGMENT_ROWS', 8)
+    def test_ut_py_hist_01_statement_and_balance_at(self):
+        """UT-PY-HIST-01: Relevé par période et solde à une date"""
+        history = self.fill()
+
+        self.assertEqual(len(history), 100)
+        self.assertEqual(history[5].op, "credit")
+        self.assertEqual(history[5].amount, 1.0)
+        self.check_queries(history)
+        # Les horodatages ne décroissent jamais
+        row = history.append(0, "debit", 100, 0, timestamp=5)
+        self.assertEqual(history[row].timestamp, history[row - 1].timestamp)
+        history.close()
+
+        print("✓ UT-PY-HIST-01: Requêtes indexées fonctionnelles")
+
+    @patch('python.history.SEGMENT_ROWS', 8)
+    def test_ut_py_hist_02_reopen_and_rebuild_index(self):
+        """UT-PY-HIST-02: Réouverture et reconstruction d'un index incomplet"""
+        self.fill().close()
+
+        # Index tronqué (écriture interrompue) : les segments manquants sont reconstruits
+        with open(self.history_file + '.idx', 'r+b') as file:
+            file.truncate(8 * 16 * 5 + 3)
+        history = TransactionHistory(self.history_file)
+        self.check_queries(history)
+        history.close()
+
+        print("✓ UT-PY-HIST-02: Index reconstruit à la réouverture")
+
+    def test_ut_py_hist_03_account_manager(self):
+        """UT-PY-HIST-03: Historique des opérations d'AccountManager"""
+        data_file = os.path.join(self.directory.name, 'account_data.json')
+        with open(data_file, 'w') as f:
+            json.dump({'balance': 1000.0}, f)
+
+        account = AccountManager(data_file, history=True)
+        account.credit_account(500.0)
+        account.debit_account(5000.0)
+        account.apply_batch([("debit", 200.0), ("credit", 0), ("credit", 50.0)])
+        account.close()
+
+        history = TransactionHistory(data_file + '.hist')
+        statement = history.statement(0)
+        self.assertEqual([(t.op, t.amount, t.balance) for t in statement],
+                         [("credit", 500.0, 1500.0), ("debit", 200.0, 1300.0), ("credit", 50.0, 1350.0)])
+        self.assertEqual(history.balance_at(0, statement[0].timestamp), 1500.0)
+        self.assertIsNone(history.balance_at(0, statement[0].timestamp - 1))
+        history.close()
+
+        print("✓ UT-PY-HIST-03: Opérations d'AccountManager historisées")
+
+    def test_ut_py_hist_05_failed_write_not_recorded(self):
+        """UT-PY-HIST-05: Aucune ligne d'historique pour un lot dont le solde n'a pas été écrit"""
+        data_file = os.path.join(self.directory.name, 'account_data.json')
+        account = AccountManager(data_file, history=True)
+        with patch.object(account, '_write_balance', side_effect=IOError("disque plein")):
+            with self.assertRaises(IOError):
+                account.apply_batch([("credit", 10.0), ("debit", 5.0)])
+        self.assertEqual(len(account.history), 0)
+
+        account.apply_batch([("credit", 10.0), ("credit", "abc")])
+        self.assertEqual([(t.op, t.amount) for t in account.history.statement(0)], [("credit", 10.0)])
+        account.close()
+
+        print("✓ UT-PY-HIST-05: Historique écrit après le solde")
+
+    def test_ut_py_hist_04_balance_at_snapshots(self):
+        """UT-PY-HIST-04: Solde à une date depuis l'instantané le plus proche"""
+        data_file = os.path.join(self.directory.name, 'account_data.json')
+        with open(data_file, 'w') as f:
+            json.dump({'balance': 1000.0}, f)
+
+        before = time.time() - 1
+        account = AccountManager(data_file, history=True, snapshot_every=10)
+        expected = []
+        for amount in range(1, 60):
+            account.apply_batch([("credit", amount), ("debit", amount / 2), ("debit", 10**6)])
+            expected.append((time.time(), account.get_balance()))
+        account.close()
+
+        # Réouverture : les instantanés sont relus, sans instantané initial supplémentaire
+        account = AccountManager(data_file, history=True, snapshot_every=10)
+        self.assertEqual(len(account.snapshots), 12)
+        self.assertIsNone(account.balance_at(before))
+        for moment, balance in expected:
+            self.assertEqual(account.balance_at(moment), balance)
+        account.close()
+
+        print("✓ UT-PY-HIST-04: Solde historique reconstruit depuis les instantanés")
+
+    def test_ut_py_hist_06_balance_at_bounded(self):
+        """UT-PY-HIST-06: Solde à une date sans rejeu, lectures bornées par snapshot_every"""
+        data_file = os.path.join(self.directory.name, 'account_data.json')
+        account = AccountManager(data_file, history=True, snapshot_every=16, storage="memory")
+        expected = []
+        for amount in range(1, 400):
+            account.apply_batch([("credit", amount), ("debit", 10**6)] if amount % 3 else [("debit", 1)])
+            expected.append((account.history.last_timestamp, account.get_balance()))
+        last_timestamp = account.history.last_timestamp
+
+        class CountingTimestamps:
+            def __init__(self, timestamps):
+                self.timestamps = timestamps
+                self.reads = 0
+
+            def __len__(self):
+                return len(self.timestamps)
+
+            def __getitem__(self, row):
+                self.reads += 1
+                return self.timestamps[row]
+
+        timestamps = account.history._timestamps = CountingTimestamps(account.history._timestamps)
+        checked = 0
+        with patch.object(account.history, 'replay', side_effect=AssertionError("rejeu")):
+            # Date à mi-chemin de l'opération suivante (un float en secondes n'a pas la précision de la ns)
+            for (timestamp, balance), (following, _) in zip(expected, expected[1:]):
+                if following - timestamp < 2000:
+                    continue
+                timestamps.reads = 0
+                self.assertEqual(account.balance_at((timestamp + following) / 2e9), balance)
+                self.assertLessEqual(timestamps.reads, 6)
+                checked += 1
+            # Après la dernière opération : solde courant
+            self.assertEqual(account.balance_at(last_timestamp / 1e9 + 60), account.get_balance())
+        self.assertGreater(checked, 100)
+        account.close()
+
+        print("✓ UT-PY-HIST-06: Solde à une date en lectures bornées")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
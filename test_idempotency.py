@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le cache d'idempotence (idempotency.py)
+Validation de la déduplication par request_id, des évictions et de la reprise
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+from unittest.mock import patch
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.idempotency import IdempotencyCache
+from python.account_manager import AccountManager
+
+
+class TestIdempotency(unittest.TestCase):
+    """Tests unitaires pour les opérations idempotentes"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.directory.name, 'account_data.json')
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def test_ut_py_idem_01_duplicate_requests(self):
+        """UT-PY-IDEM-01: Une clé répétée retourne le résultat d'origine sans rejouer"""
+        account = AccountManager(self.data_file, idempotency=True)
+        first = account.credit_account(100.0, request_id="req-1")
+        self.assertEqual(account.credit_account(100.0, request_id="req-1"), first)
+        self.assertEqual(account.get_balance(), 1100.0)
+
+        # Les échecs sont aussi conservés, même si le solde change ensuite
+        failed = account.debit_account(5000.0, request_id="req-2")
+        self.assertFalse(failed[0])
+        account.credit_account(5000.0)
+        self.assertEqual(account.debit_account(5000.0, request_id="req-2"), failed)
+        self.assertEqual(account.get_balance(), 6100.0)
+
+        # Lot : doublons dans le lot et avec les opérations précédentes
+        results = account.apply_batch([("debit", 100), ("debit", 100), ("credit", 100), ("debit", 1)],
+                                       request_ids=["b-1", "b-1", "req-1", None])
+        self.assertEqual(results, [(True, None), (True, None), (True, None), (True, None)])
+        self.assertEqual(account.get_balance(), 5999.0)
+        account.close()
+
+        # Persisté avec le solde : une nouvelle instance reconnaît les clés
+        account = AccountManager(self.data_file, idempotency=True)
+        self.assertEqual(account.credit_account(100.0, request_id="req-1"), first)
+        self.assertEqual(account.get_balance(), 5999.0)
+        account.close()
+
+        with self.assertRaises(ValueError):
+            AccountManager(self.data_file).credit_account(1.0, request_id="req-3")
+        print("✓ UT-PY-IDEM-01: Opérations répétées dédupliquées")
+
+    def test_ut_py_idem_02_bounded_cache(self):
+        """UT-PY-IDEM-02: Capacité, expiration et compaction du fichier"""
+        path = os.path.join(self.directory.name, 'cache.idem')
+        cache = IdempotencyCache(path, capacity=100)
+        for key in range(1000):
+            cache.put(f"key-{key}", 1, 0, key, key)
+            cache.seal(key)
+        self.assertEqual(len(cache), 100)
+        self.assertIsNone(cache.get("key-0"))
+        self.assertEqual(cache.get("key-999"), (1, 0, 999, 999))
+        # Le fichier est réécrit avec les seules entrées vivantes
+        self.assertLessEqual(os.path.getsize(path), 2 * 100 * 50)
+        cache.close()
+
+        cache = IdempotencyCache(path, capacity=100)
+        self.assertEqual(cache.recover(999), 0)
+        self.assertEqual(len(cache), 100)
+        self.assertEqual(cache.get("key-900"), (1, 0, 900, 900))
+        # Au-delà de la durée de vie, l'entrée est ignorée
+        with patch('idempotency.time.time_ns', return_value=2 ** 62):
+            self.assertIsNone(cache.get("key-900"))
+        cache.close()
+        print("✓ UT-PY-IDEM-02: Cache borné en taille et en durée")
+
+    def test_ut_py_idem_03_crash_before_balance(self):
+        """UT-PY-IDEM-03: Une clé dont le solde n'a pas été persisté est oubliée"""
+        account = AccountManager(self.data_file, idempotency=True)
+        account.credit_account(10.0, request_id="applied")
+        # Arrêt entre l'écriture de la clé et celle du solde
+        with patch.object(account, '_write_balance', return_value=True):
+            account.credit_account(20.0, request_id="lost")
+        account.close()
+
+        account = AccountManager(self.data_file, idempotency=True)
+        self.assertEqual(account.get_balance(), 1010.0)
+        self.assertEqual(account.credit_account(10.0, request_id="applied")[1],
+                         "Compte crédité de 10.00. Nouveau solde: 1010.00")
+        # La nouvelle tentative est appliquée
+        account.credit_account(20.0, request_id="lost")
+        self.assertEqual(account.get_balance(), 1030.0)
+        account.close()
+        print("✓ UT-PY-IDEM-03: Reprise cohérente après interruption")
+
+    def test_ut_py_idem_04_invalid_amount_in_batch(self):
+        """UT-PY-IDEM-04: Un montant illisible ne laisse aucune clé sans opération appliquée"""
+        account = AccountManager(self.data_file, idempotency=True)
+        results = account.apply_batch([("credit", 10), ("credit", "abc")], request_ids=["a", "b"])
+        self.assertEqual(results, [(True, None), (False, "invalid_amount")])
+        self.assertEqual(account.get_balance(), 1010.0)
+        # Les clés reflètent exactement ce qui a été appliqué
+        self.assertEqual(account.credit_account(10, request_id="a"),
+                         (True, "Compte crédité de 10.00. Nouveau solde: 1010.00"))
+        self.assertEqual(account.credit_account(10, request_id="b")[0], False)
+        self.assertEqual(account.get_balance(), 1010.0)
+
+        # Sans clé comme avec, un montant illisible d'une opération unitaire lève ValueError
+        with self.assertRaises(ValueError):
+            account.credit_account("abc", request_id="c")
+        self.assertIsNone(account.idempotency.get("c"))
+        account.close()
+
+        account = AccountManager(self.data_file, idempotency=True)
+        self.assertEqual(account.get_balance(), 1010.0)
+        self.assertEqual(account.credit_account(10, request_id="a")[1],
+                         "Compte crédité de 10.00. Nouveau solde: 1010.00")
+        account.close()
+        print("✓ UT-PY-IDEM-04: Lot avec montant illisible cohérent")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
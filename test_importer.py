@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour l'import en flux des écritures (importer.py)
+Validation de l'import CSV/JSONL et de la reprise sur incident
+"""
+
+import os
+import sys
+import json
+import unittest
+import tempfile
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.account_manager import AccountManager
+from python.importer import PostingImporter
+
+
+class TestPostingImporter(unittest.TestCase):
+    """Tests unitaires pour la classe PostingImporter"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.directory.name, 'account_data.json')
+        with open(self.data_file, 'w') as f:
+            json.dump({'balance': 1000.0}, f)
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def write_postings(self, name, lines):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def test_ut_py_imp_01_csv(self):
+        """UT-PY-IMP-01: Import d'un fichier CSV par lots"""
+        path = self.write_postings('postings.csv', ["op,amount"] + ["credit,1.50", "debit,0.50"] * 25 + ["debit,9999", "credit,abc"])
+        account = AccountManager(self.data_file)
+
+        stats = PostingImporter(account, path, chunk_size=7).run()
+
+        self.assertEqual(stats.applied, 50)
+        self.assertEqual(stats.rejected, 2)
+        self.assertEqual(stats.bytes, os.path.getsize(path))
+        self.assertEqual(AccountManager(self.data_file).get_balance(), 1025.0)
+        self.assertFalse(os.path.exists(path + '.ckpt'))
+
+        print("✓ UT-PY-IMP-01: Import CSV fonctionnel")
+
+    def test_ut_py_imp_02_jsonl(self):
+        """UT-PY-IMP-02: Import d'un fichier JSONL"""
+        path = self.write_postings('postings.jsonl', [
+            json.dumps({"op": "credit", "amount": 250}),
+            json.dumps({"op": "debit"}),
+            json.dumps({"op": "debit", "amount": 50}),
+        ])
+        account = AccountManager(self.data_file)
+
+        stats = PostingImporter(account, path).run()
+
+        self.assertEqual((stats.applied, stats.rejected), (2, 1))
+        self.assertEqual(account.get_balance(), 1200.0)
+
+        print("✓ UT-PY-IMP-02: Import JSONL fonctionnel")
+
+    def test_ut_py_imp_03_resume_after_crash(self):
+        """UT-PY-IMP-03: Reprise après un incident pendant un lot"""
+        path = self.write_postings('postings.csv', ["credit,10"] * 4)
+        line_size = len("credit,10\n")
+
+        # Incident après l'application du premier lot mais avant la mise à jour du point de reprise
+        with open(path + '.ckpt', 'w') as f:
+            json.dump({'offset': 0, 'balance': 1000.0, 'applied': 0, 'rejected': 0,
+                       'next_offset': 2 * line_size}, f)
+        with open(self.data_file, 'w') as f:
+            json.dump({'balance': 1020.0}, f)
+
+        account = AccountManager(self.data_file)
+        stats = PostingImporter(account, path, chunk_size=2).run()
+
+        # Le premier lot n'est pas appliqué une deuxième fois
+        self.assertEqual(account.get_balance(), 1040.0)
+        self.assertEqual(stats.bytes, 2 * line_size)
+
+        print("✓ UT-PY-IMP-03: Reprise sans double application")
+
+    def test_ut_py_imp_04_resume_before_apply(self):
+        """UT-PY-IMP-04: Reprise d'un lot qui n'avait pas été appliqué"""
+        path = self.write_postings('postings.csv', ["credit,10"] * 4)
+        with open(path + '.ckpt', 'w') as f:
+            json.dump({'offset': 0, 'balance': 1000.0, 'applied': 0, 'rejected': 0,
+                       'next_offset': 20}, f)
+
+        account = AccountManager(self.data_file)
+        stats = PostingImporter(account, path, chunk_size=2).run()
+
+        self.assertEqual(account.get_balance(), 1040.0)
+        self.assertEqual(stats.applied, 4)
+
+        print("✓ UT-PY-IMP-04: Lot non appliqué rejoué")
+
+    def test_ut_py_imp_05_non_finite_amounts(self):
+        """UT-PY-IMP-05: Montants infinis ou NaN rejetés ligne par ligne"""
+        path = self.write_postings('postings.jsonl', [
+            json.dumps({"op": "credit", "amount": 10}),
+            '{"op": "credit", "amount": 1e400}',
+            '{"op": "credit", "amount": Infinity}',
+            '{"op": "debit", "amount": -Infinity}',
+            '{"op": "credit", "amount": NaN}',
+            json.dumps({"op": "credit", "amount": 5}),
+        ])
+        account = AccountManager(self.data_file)
+
+        stats = PostingImporter(account, path, chunk_size=2).run()
+
+        self.assertEqual((stats.applied, stats.rejected), (2, 4))
+        self.assertEqual(account.get_balance(), 1015.0)
+        self.assertFalse(os.path.exists(path + '.ckpt'))
+
+        print("✓ UT-PY-IMP-05: Montants non représentables rejetés")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le journal de transactions (journal.py)
+Validation de l'ajout, du rejeu et du compactage
+"""
+
+import os
+import sys
+import json
+import unittest
+import tempfile
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.journal import TransactionLog, DURABILITY_GROUP, DURABILITY_NONE
+from python.account_manager import AccountManager
+
+
+class TestTransactionLog(unittest.TestCase):
+    """Tests unitaires pour la classe TransactionLog"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.test_file = tempfile.NamedTemporaryFile(delete=False, suffix='.json').name
+        with open(self.test_file, 'w') as f:
+            json.dump({'balance': 1000.0}, f)
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        for path in (self.test_file, self.test_file + '.wal', self.test_file + '.tmp'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_ut_py_wal_01_replay(self):
+        """UT-PY-WAL-01: Rejeu du journal après redémarrage"""
+        account = AccountManager(self.test_file, journal=True)
+        account.credit_account(500.0)
+        account.debit_account(200.0)
+        account.close()
+
+        # Le fichier de données n'est pas réécrit à chaque opération
+        with open(self.test_file, 'r') as f:
+            self.assertEqual(json.load(f)['balance'], 1000.0)
+
+        account = AccountManager(self.test_file, journal=True)
+        self.assertEqual(account.get_balance(), 1300.0)
+        self.assertEqual(account.journal.records(), [("credit", 50000, 150000), ("debit", 20000, 130000)])
+        account.close()
+
+        print("✓ UT-PY-WAL-01: Rejeu du journal fonctionnel")
+
+    def test_ut_py_wal_02_torn_tail(self):
+        """UT-PY-WAL-02: Enregistrement incomplet en fin de journal ignoré"""
+        log = TransactionLog(self.test_file, durability=DURABILITY_NONE)
+        log.append("credit", 10000, 110000)
+        log.close()
+
+        # Simuler un crash au milieu d'une écriture
+        with open(log.log_file, 'ab') as f:
+            f.write(b'\x11\x00\x00\x00\xde\xad')
+        size_before = os.path.getsize(log.log_file)
+
+        log = TransactionLog(self.test_file)
+        self.assertEqual(log.recover(100000), 110000)
+        self.assertLess(os.path.getsize(log.log_file), size_before)
+
+        print("✓ UT-PY-WAL-02: Fin de journal corrompue tronquée")
+
+    def test_ut_py_wal_03_compaction(self):
+        """UT-PY-WAL-03: Compactage du journal dans l'instantané"""
+        log = TransactionLog(self.test_file, durability=DURABILITY_GROUP, compact_every=3)
+        balance = 100000
+        for _ in range(3):
+            balance += 1000
+            log.append("credit", 1000, balance)
+        log.close()
+
+        with open(self.test_file, 'r') as f:
+            self.assertEqual(json.load(f)['balance'], 1030.0)
+        self.assertEqual(os.path.getsize(log.log_file), 0)
+        self.assertEqual(log.pending, 0)
+
+        print("✓ UT-PY-WAL-03: Compactage fonctionnel")
+
+    def test_ut_py_wal_04_invalid_durability(self):
+        """UT-PY-WAL-04: Mode de durabilité invalide rejeté"""
+        with self.assertRaises(ValueError):
+            TransactionLog(self.test_file, durability="parfois")
+
+        print("✓ UT-PY-WAL-04: Mode de durabilité invalide rejeté")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le grand livre multi-comptes (ledger.py)
+Validation des règles métier par compte et de la persistance
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer le module à tester
+from python.ledger import Ledger
+
+
+class TestLedger(unittest.TestCase):
+    """Tests unitaires pour la classe Ledger"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.ledger = Ledger()
+
+    def test_ut_py_ldg_01_default_balance(self):
+        """UT-PY-LDG-01: Solde par défaut d'un compte inconnu"""
+        self.assertEqual(self.ledger.get_balance(42), 1000.0)
+        self.assertNotIn(42, self.ledger)
+
+        print("✓ UT-PY-LDG-01: Solde par défaut correct")
+
+    def test_ut_py_ldg_02_operations_per_account(self):
+        """UT-PY-LDG-02: Crédit et débit indépendants par compte"""
+        self.ledger.open_account(1, 100.0)
+        self.ledger.open_account(2)
+
+        success, message = self.ledger.credit_account(1, 50.25)
+        self.assertTrue(success)
+        self.assertIn("150.25", message)
+
+        success, message = self.ledger.debit_account(2, 2000.0)
+        self.assertFalse(success)
+        self.assertIn("insuffisants", message)
+
+        success, _ = self.ledger.credit_account(1, 0.0)
+        self.assertFalse(success)
+
+        self.assertEqual(self.ledger.get_balance(1), 150.25)
+        self.assertEqual(self.ledger.get_balance(2), 1000.0)
+
+        print("✓ UT-PY-LDG-02: Opérations par compte correctes")
+
+    def test_ut_py_ldg_03_failed_debit_does_not_open(self):
+        """UT-PY-LDG-03: Un débit refusé ne crée pas de compte"""
+        success, _ = self.ledger.debit_account(7, 5000.0)
+        self.assertFalse(success)
+        self.assertEqual(len(self.ledger), 0)
+
+        print("✓ UT-PY-LDG-03: Débit refusé sans effet")
+
+    def test_ut_py_ldg_04_many_accounts(self):
+        """UT-PY-LDG-04: Croissance de l'index avec de nombreux comptes"""
+        for account_id in range(0, 50000, 3):
+            self.ledger.credit_account(account_id, 1.0)
+
+        self.assertEqual(len(self.ledger), len(range(0, 50000, 3)))
+        self.assertEqual(self.ledger.get_balance(49998), 1001.0)
+        self.assertEqual(self.ledger.get_balance(49999), 1000.0)
+        with self.assertRaises(ValueError):
+            self.ledger.open_account(3)
+
+        print("✓ UT-PY-LDG-04: Index à adressage ouvert fonctionnel")
+
+    def test_ut_py_ldg_05_save_load(self):
+        """UT-PY-LDG-05: Sauvegarde et chargement du grand livre"""
+        path = tempfile.NamedTemporaryFile(delete=False, suffix='.ldg').name
+        try:
+            self.ledger.open_account(10, 12.34)
+            self.ledger.open_account(20, 999999.99)
+            self.ledger.save(path)
+
+            loaded = Ledger.load(path)
+            self.assertEqual(sorted(loaded.accounts()), [(10, 12.34), (20, 999999.99)])
+        finally:
+            os.remove(path)
+
+        print("✓ UT-PY-LDG-05: Persistance du grand livre fonctionnelle")
+
+    def test_ut_py_ldg_06_atomic_transactions(self):
+        """UT-PY-LDG-06: Virements et transactions multi-comptes atomiques"""
+        self.ledger.open_account(1, 100.0)
+
+        success, message = self.ledger.transfer(1, 2, 60.0)
+        self.assertTrue(success)
+        self.assertIn("Virement", message)
+        self.assertEqual(self.ledger.get_balance(1), 40.0)
+        self.assertEqual(self.ledger.get_balance(2), 1060.0)
+
+        success, message = self.ledger.transfer(1, 2, 60.0)
+        self.assertFalse(success)
+        self.assertIn("insuffisants", message)
+
+        # Une jambe refusée annule toute la transaction
+        error, balances = self.ledger.apply_transaction([
+            (2, "debit", 5000), (3, "credit", 5000), (1, "debit", 5000), (1, "debit", 1),
+        ])
+        self.assertEqual(error, "insufficient_funds")
+        self.assertIsNone(balances)
+        self.assertEqual(self.ledger.get_balance(2), 1060.0)
+        self.assertNotIn(3, self.ledger)
+
+        error, balances = self.ledger.apply_transaction([(2, "debit", 5000), (3, "credit", 2500), (1, "credit", 2500)])
+        self.assertIsNone(error)
+        self.assertEqual(balances, {2: 101000, 3: 102500, 1: 6500})
+
+        print("✓ UT-PY-LDG-06: Transactions atomiques fonctionnelles")
+
+    def test_ut_py_ldg_07_transaction_log(self):
+        """UT-PY-LDG-07: Journal du grand livre (une écriture par transaction, rejeu)"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ledger.ldg')
+            log_file = path + '.wal'
+
+            self.ledger.open_log(log_file)
+            self.ledger.transfer(1, 2, 100.0)
+            self.ledger.credit_account(3, 5.0)
+            self.ledger.transfer(2, 3, 1.0)
+            self.assertEqual(self.ledger.log.pending, 3)
+            self.ledger.close()
+
+            # Dernière transaction tronquée : elle est ignorée en entier
+            with open(log_file, 'r+b') as file:
+                file.truncate(os.path.getsize(log_file) - 3)
+
+            recovered = Ledger()
+            recovered.open_log(log_file)
+            self.assertEqual(sorted(recovered.accounts()), [(1, 900.0), (2, 1100.0), (3, 1005.0)])
+
+            # Point de reprise : sauvegarde du grand livre et journal vidé
+            recovered.checkpoint(path)
+            self.assertEqual(os.path.getsize(log_file), 0)
+            recovered.close()
+            loaded = Ledger.load(path)
+            loaded.open_log(log_file)
+            self.assertEqual(sorted(loaded.accounts()), [(1, 900.0), (2, 1100.0), (3, 1005.0)])
+            loaded.close()
+
+        print("✓ UT-PY-LDG-07: Journal du grand livre fonctionnel")
+
+    def test_ut_py_ldg_08_invalid_account_ids(self):
+        """UT-PY-LDG-08: Numéro de compte invalide refusé avant toute modification"""
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'ledger.wal')
+            self.ledger.open_log(log_file)
+            self.ledger.open_account(1)
+            for account_id in (-5, 2 ** 63):
+                with self.assertRaises(ValueError):
+                    self.ledger.transfer(1, account_id, 10.0)
+                with self.assertRaises(ValueError):
+                    self.ledger.credit_account(account_id, 10.0)
+            self.assertEqual(self.ledger.get_balance(1), 1000.0)
+            self.assertEqual(len(self.ledger), 1)
+            self.assertEqual(self.ledger.log.pending, 0)
+            self.ledger.close()
+
+            recovered = Ledger()
+            recovered.open_log(log_file)
+            self.assertEqual(len(recovered), 0)
+            recovered.close()
+
+        print("✓ UT-PY-LDG-08: Numéros de compte invalides refusés")
+
+    def test_ut_py_ldg_09_balance_overflow(self):
+        """UT-PY-LDG-09: Crédit hors de l'entier 64 bits refusé avant toute modification"""
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'ledger.wal')
+            self.ledger.open_log(log_file)
+            self.assertEqual(self.ledger.apply(1, "credit", 2 ** 63), ("overflow", 100000))
+            self.assertEqual(len(self.ledger), 0)
+            self.ledger.open_account(2, 0)
+            self.assertEqual(self.ledger.apply(2, "credit", 2 ** 63 - 1), (None, 2 ** 63 - 1))
+            self.assertEqual(self.ledger.apply(2, "credit", 1), ("overflow", 2 ** 63 - 1))
+            self.assertEqual(self.ledger.credit_account(3, 10 ** 17),
+                             (False, "Le solde dépasserait la capacité maximale du compte."))
+            self.assertEqual(len(self.ledger), 1)
+            self.assertEqual(self.ledger.log.pending, 1)
+            self.ledger.close()
+
+        print("✓ UT-PY-LDG-09: Dépassement de capacité refusé")
+
+    def test_ut_py_ldg_10_transaction_overflow(self):
+        """UT-PY-LDG-10: Jambe créditrice hors de l'entier 64 bits : transaction refusée sans journal"""
+        with tempfile.TemporaryDirectory() as directory:
+            self.ledger.open_log(os.path.join(directory, 'ledger.wal'))
+            self.ledger.open_account(1, 0)
+            self.ledger.open_account(2)
+            self.assertEqual(self.ledger.apply(1, "credit", 2 ** 63 - 100), (None, 2 ** 63 - 100))
+            pending = self.ledger.log.pending
+
+            self.assertEqual(self.ledger.apply_transaction([(2, "debit", 100), (1, "credit", 101)]),
+                             ("overflow", None))
+            self.assertEqual(self.ledger.transfer(2, 1, 1.01),
+                             (False, "Le solde dépasserait la capacité maximale du compte."))
+            # Deux crédits du même compte : le solde projeté est vérifié jambe par jambe
+            self.assertEqual(self.ledger.apply_transaction([(1, "credit", 60), (1, "credit", 60)]),
+                             ("overflow", None))
+            self.assertEqual(self.ledger.apply_transaction([(3, "credit", 2 ** 63)]), ("overflow", None))
+
+            self.assertEqual(self.ledger.get_balance(2), 1000.0)
+            self.assertEqual(self.ledger.get_balance(1).cents, 2 ** 63 - 100)
+            self.assertEqual(len(self.ledger), 2)
+            self.assertEqual(self.ledger.log.pending, pending)
+            self.assertEqual(self.ledger.transfer(2, 1, 0.99)[0], True)
+            self.ledger.close()
+
+        print("✓ UT-PY-LDG-10: Transactions hors capacité refusées")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
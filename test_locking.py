@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le mode concurrent (locking.py)
+Validation de l'absence de mises à jour perdues entre threads et processus
+"""
+
+import os
+import sys
+import json
+import unittest
+import tempfile
+import threading
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.account_manager import AccountManager
+from python.ledger import Ledger
+from python.stress import run_stress
+
+def run_threads(target, count=8):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConcurrency(unittest.TestCase):
+    """Tests unitaires pour les modes de concurrence"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.directory.name, 'account_data.json')
+        with open(self.data_file, 'w') as f:
+            json.dump({'balance': 800.0}, f)
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def test_ut_py_lock_01_threads(self):
+        """UT-PY-LOCK-01: Threads partageant une instance"""
+        account = AccountManager(self.data_file, concurrency="thread")
+
+        # 8 threads × 120 débits de 1.00 : seuls 800 peuvent réussir
+        run_threads(lambda: [account.debit_account(1) for _ in range(120)])
+
+        self.assertEqual(account.get_balance(), 0.0)
+        self.assertEqual(AccountManager(self.data_file).get_balance(), 0.0)
+
+        print("✓ UT-PY-LOCK-01: Aucune mise à jour perdue entre threads")
+
+    def test_ut_py_lock_02_processes(self):
+        """UT-PY-LOCK-02: Processus partageant le fichier de données"""
+        result = run_stress(self.data_file, threads=2, processes=3, ops=50)
+
+        self.assertEqual(result['ops'], 300)
+        self.assertEqual(result['lost_updates'], 0)
+
+        print("✓ UT-PY-LOCK-02: Aucune mise à jour perdue entre processus")
+
+    def test_ut_py_lock_03_invalid_mode(self):
+        """UT-PY-LOCK-03: Mode de concurrence invalide rejeté"""
+        with self.assertRaises(ValueError):
+            AccountManager(self.data_file, concurrency="parfois")
+
+        print("✓ UT-PY-LOCK-03: Mode de concurrence invalide rejeté")
+
+    def test_ut_py_lock_04_striped_ledger(self):
+        """UT-PY-LOCK-04: Grand livre partagé avec verrous par tranche"""
+        ledger = Ledger(lock_stripes=8)
+
+        # Créations de comptes (réorganisation de l'index) et mises à jour concurrentes
+        def work():
+            for account_id in range(500):
+                ledger.credit_account(account_id, 1)
+
+        run_threads(work)
+
+        self.assertEqual(len(ledger), 500)
+        self.assertTrue(all(balance == 1008.0 for _, balance in ledger.accounts()))
+
+        print("✓ UT-PY-LOCK-04: Verrous par tranche corrects")
+
+    def test_ut_py_lock_05_concurrent_transfers(self):
+        """UT-PY-LOCK-05: Virements croisés concurrents sans interblocage"""
+        ledger = Ledger(lock_stripes=8)
+        for account_id in range(16):
+            ledger.open_account(account_id)
+
+        # Virements dans les deux sens entre les mêmes comptes
+        def work():
+            for index in range(2000):
+                source = index % 16
+                ledger.transfer(source, (source * 7 + 3) % 16, 1)
+                ledger.transfer((source * 7 + 3) % 16, source, 1)
+
+        run_threads(work)
+
+        self.assertEqual(sum(balance for _, balance in ledger.accounts()), 16000.0)
+        self.assertTrue(all(balance == 1000.0 for _, balance in ledger.accounts()))
+
+        print("✓ UT-PY-LOCK-05: Virements concurrents cohérents")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
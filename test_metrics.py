@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour l'instrumentation (metrics.py)
+Validation des histogrammes, des compteurs d'échecs et des exports
+"""
+
+import os
+import sys
+import json
+import unittest
+import tempfile
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.metrics import Histogram, Metrics
+from python.account_manager import AccountManager
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests unitaires pour les classes Histogram et Metrics"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.directory.name, 'account_data.json')
+        with open(self.data_file, 'w') as f:
+            json.dump({'balance': 1000.0}, f)
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def test_ut_py_met_01_histogram(self):
+        """UT-PY-MET-01: Seaux de latence et quantiles"""
+        histogram = Histogram()
+        for nanoseconds in (500, 1500, 3000, 3500, 10**12):
+            histogram.observe_ns(nanoseconds)
+        histogram.observe_ns(1500, weight=5)
+
+        self.assertEqual(histogram.count, 10)
+        self.assertEqual(histogram.counts[0], 1)   # < 1 µs
+        self.assertEqual(histogram.counts[1], 6)   # < 2 µs
+        self.assertEqual(histogram.counts[2], 2)   # < 4 µs
+        self.assertEqual(histogram.counts[-1], 1)  # +Inf
+        self.assertEqual(histogram.quantile(0.5), 2e-06)
+        self.assertEqual(histogram.quantile(1.0), float("inf"))
+
+        print("✓ UT-PY-MET-01: Histogramme fonctionnel")
+
+    def test_ut_py_met_02_account_manager(self):
+        """UT-PY-MET-02: Opérations et échecs de validation comptés"""
+        account = AccountManager(self.data_file, metrics=True)
+        account.credit_account(100.0)
+        account.credit_account(0)
+        account.debit_account(5000.0)
+        account.debit_account(50.0)
+        account.get_balance()
+
+        snapshot = account.metrics.snapshot()
+        operations = snapshot['operations']
+        self.assertEqual(operations['load']['count'], 1)
+        self.assertEqual(operations['credit']['count'], 2)
+        self.assertEqual(operations['debit']['count'], 2)
+        self.assertEqual(operations['save']['count'], 2)
+        self.assertEqual(operations['balance']['count'], 1)
+        self.assertEqual(snapshot['counters']['failures'],
+                         {'credit': {'invalid_amount': 1}, 'debit': {'insufficient_funds': 1}})
+        json.dumps(snapshot)
+
+        text = account.metrics.to_prometheus()
+        self.assertIn('account_manager_operation_seconds_count{op="credit"} 2', text)
+        self.assertIn('account_manager_operation_seconds_bucket{op="credit",le="+Inf"} 2', text)
+        self.assertIn('account_manager_failures_total{op="debit",reason="insufficient_funds"} 1', text)
+
+        print("✓ UT-PY-MET-02: Instrumentation d'AccountManager fonctionnelle")
+
+    def test_ut_py_met_03_disabled_and_sampled(self):
+        """UT-PY-MET-03: Sans métriques rien n'est ajouté ; échantillonnage pondéré"""
+        account = AccountManager(self.data_file)
+        self.assertIsNone(account.metrics)
+
+        account = AccountManager(self.data_file, metrics=Metrics(sample_every=4))
+        for _ in range(7):
+            account.credit_account(1.0)
+        account.credit_account(0)
+        # 2 appels chronométrés sur 8, chacun compté pour 4
+        operations = account.metrics.snapshot()['operations']
+        self.assertEqual(operations['credit']['count'], 8)
+        # Les échecs sont comptés exactement, même hors échantillon
+        self.assertEqual(account.metrics.counter('failures', 'credit', 'invalid_amount'), 1)
+
+        print("✓ UT-PY-MET-03: Désactivation et échantillonnage fonctionnels")
+
+    def test_ut_py_met_04_batch_failures(self):
+        """UT-PY-MET-04: Refus des lots et des opérations avec clé comptés par motif"""
+        account = AccountManager(self.data_file, metrics=True, idempotency=True)
+        account.apply_batch([("credit", 10.0), ("credit", 0), ("debit", 5000.0), ("debit", -1),
+                             ("virement", 1.0), ("debit", 5000.0), ("credit", "abc")])
+        account.debit_account(5000.0, request_id="r1")
+        # Rejeu d'une clé : résultat d'origine, pas de nouvel échec compté
+        account.debit_account(5000.0, request_id="r1")
+
+        self.assertEqual(account.metrics.snapshot()['counters']['failures'], {
+            'credit': {'invalid_amount': 2},
+            'debit': {'insufficient_funds': 3, 'invalid_amount': 1},
+            'other': {'unknown_operation': 1},
+        })
+        self.assertEqual(account.metrics.snapshot()['operations']['batch']['count'], 1)
+
+        print("✓ UT-PY-MET-04: Échecs des lots comptés")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le type monétaire en virgule fixe (money.py)
+Validation de l'exactitude des calculs, comparable à COBOL PIC 9(6)V99
+"""
+
+import os
+import sys
+import unittest
+from decimal import Decimal
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer le module à tester
+from python.money import Money, to_cents, format_cents
+
+
+class TestMoney(unittest.TestCase):
+    """Tests unitaires pour la classe Money"""
+
+    def test_ut_py_mon_01_parse(self):
+        """UT-PY-MON-01: Lecture exacte des montants saisis"""
+        self.assertEqual(Money.parse("100.00").cents, 10000)
+        self.assertEqual(Money.parse("0.1").cents, 10)
+        self.assertEqual(Money.parse("12,5").cents, 1250)
+        self.assertEqual(Money.parse("-3").cents, -300)
+        self.assertEqual(Money.parse(".05").cents, 5)
+
+        for invalid in ("abc", "", "1.234", "1.2.3", "--1", "1e3"):
+            with self.assertRaises(ValueError):
+                Money.parse(invalid)
+
+        print("✓ UT-PY-MON-01: Lecture des montants exacte")
+
+    def test_ut_py_mon_02_format(self):
+        """UT-PY-MON-02: Formatage à deux décimales"""
+        self.assertEqual(f"{Money(100099999):.2f}", "1000999.99")
+        self.assertEqual(f"{Money(-5):.2f}", "-0.05")
+        self.assertEqual(f"{Money(1234):>10.1f}", "      12.3")
+        self.assertEqual(format_cents(7), "0.07")
+
+        print("✓ UT-PY-MON-02: Formatage conforme")
+
+    def test_ut_py_mon_03_exact_arithmetic(self):
+        """UT-PY-MON-03: Absence de dérive après de nombreuses opérations"""
+        total = Money()
+        for _ in range(100000):
+            total = total + 0.1
+        self.assertEqual(total.cents, 1000000)
+
+        float_total = 0.0
+        for _ in range(100000):
+            float_total += 0.1
+        self.assertNotEqual(float_total, 10000.0)
+
+        print("✓ UT-PY-MON-03: Arithmétique exacte en centimes")
+
+    def test_ut_py_mon_04_comparisons(self):
+        """UT-PY-MON-04: Comparaisons avec les nombres et conversions"""
+        balance = Money(100001)
+        self.assertEqual(balance, 1000.01)
+        self.assertEqual(hash(balance), hash(1000.01))
+        self.assertGreater(balance, 1000)
+        self.assertLess(Money(5), Money(6))
+        self.assertEqual(to_cents(Decimal("19.99")), 1999)
+        self.assertEqual(Money(1999).to_decimal(), Decimal("19.99"))
+        with self.assertRaises(TypeError):
+            to_cents([1])
+
+        print("✓ UT-PY-MON-04: Comparaisons et conversions correctes")
+
+    def test_ut_py_mon_05_same_rules_for_every_type(self):
+        """UT-PY-MON-05: Plus de deux décimales, NaN et infini refusés quel que soit le type"""
+        for amount in ("1.005", 1.005, Decimal("1.005"), 0.1 + 0.2, 1e-05,
+                       float("nan"), float("inf"), -float("inf"), Decimal("NaN"), Decimal("Infinity")):
+            with self.assertRaises(ValueError, msg=repr(amount)):
+                to_cents(amount)
+
+        for amount, cents in ((1234.56, 123456), (-0.01, -1), (1e20, 10 ** 22), (Decimal("19.990"), 1999),
+                              (Decimal("1234567890123456789012345678.91"), 123456789012345678901234567891)):
+            self.assertEqual(to_cents(amount), cents)
+        for cents in range(-100000, 100000, 7):
+            self.assertEqual(to_cents(cents / 100), cents)
+
+        # Les comparaisons avec un float ne passent pas par les centimes
+        self.assertLess(Money(100), 1.005)
+        self.assertGreaterEqual(Money(101), 1.005)
+
+        print("✓ UT-PY-MON-05: Conversion cohérente des montants")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le moteur de tests de parité (parity.py)
+Validation des workers maintenus à chaud, avec un programme imitant le COBOL
+"""
+
+import os
+import sys
+import stat
+import unittest
+import tempfile
+from unittest.mock import patch
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer le module à tester
+import parity
+
+# Imitation de cobol/accountsystem : mêmes affichages, solde en mémoire uniquement
+FAKE_COBOL = '''#!{python}
+import sys
+balance = 1000.0
+while True:
+    print("Account Management System")
+    print("Enter your choice (1-4): ", flush=True)
+    choice = sys.stdin.readline().strip()
+    if choice == "1":
+        print(f"Current balance: {{balance:09.2f}}", flush=True)
+    elif choice == "2":
+        balance += float(sys.stdin.readline())
+        print(f"Amount credited. New balance: {{balance:09.2f}}", flush=True)
+    elif choice == "3":
+        amount = float(sys.stdin.readline())
+        if balance >= amount:
+            balance -= amount
+            print(f"Amount debited. New balance: {{balance:09.2f}}", flush=True)
+        else:
+            print("Insufficient funds for this debit.", flush=True)
+    elif choice == "4" or not choice:
+        break
+    else:
+        print("Invalid choice, please select 1-4.", flush=True)
+print("Exiting the program. Goodbye!")
+'''
+
+
+class TestParity(unittest.TestCase):
+    """Tests unitaires pour les workers de parité"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Créer le programme imitant le COBOL"""
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.fake_cobol = os.path.join(cls.directory.name, 'accountsystem')
+        with open(cls.fake_cobol, 'w') as f:
+            f.write(FAKE_COBOL.format(python=sys.executable))
+        os.chmod(cls.fake_cobol, os.stat(cls.fake_cobol).st_mode | stat.S_IEXEC)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyer après les tests"""
+        cls.directory.cleanup()
+
+    def test_ut_py_par_01_count_views(self):
+        """UT-PY-PAR-01: Comptage des consultations hors montants"""
+        self.assertEqual(parity.count_views(["1", "2", "1.00", "3", "1", "1", "9"]), 2)
+
+        print("✓ UT-PY-PAR-01: Comptage des consultations correct")
+
+    def test_ut_py_par_02_warm_cobol_worker(self):
+        """UT-PY-PAR-02: Processus maintenu à chaud et réinitialisé entre scénarios"""
+        worker = parity.CobolWorker(self.fake_cobol)
+        try:
+            self.assertEqual(worker.run(["2", "500.00", "1", "3", "200.00"]), [1500.0, 1300.0])
+            process = worker.process
+
+            # Le même processus est réutilisé, avec un solde réinitialisé
+            self.assertEqual(worker.run(["3", "2000.00", "9"]), [1000.0])
+            self.assertIs(worker.process, process)
+
+            # Un scénario terminal arrête le processus, relancé ensuite
+            self.assertEqual(worker.run(["1", "4"]), [1000.0])
+            self.assertEqual(worker.run([]), [1000.0])
+        finally:
+            worker.close()
+
+        print("✓ UT-PY-PAR-02: Worker COBOL maintenu à chaud fonctionnel")
+
+    def test_ut_py_par_03_python_worker(self):
+        """UT-PY-PAR-03: Application Python exécutée sans relance"""
+        worker = parity.PythonWorker(self.directory.name)
+
+        self.assertEqual(worker.run(["2", "500.00", "1", "3", "200.00"]), [1500.0, 1300.0])
+        self.assertEqual(worker.run(["3", "2000.00", "9"]), [1000.0])
+
+        print("✓ UT-PY-PAR-03: Worker Python fonctionnel")
+
+    def test_ut_py_par_04_generated_parity(self):
+        """UT-PY-PAR-04: Parité sur des scénarios générés"""
+        python_worker = parity.PythonWorker(self.directory.name)
+        cobol_worker = parity.CobolWorker(self.fake_cobol)
+        try:
+            for scenario in parity.generate_scenarios(30, seed=11):
+                self.assertEqual(python_worker.run(scenario), cobol_worker.run(scenario), scenario)
+        finally:
+            cobol_worker.close()
+
+        print("✓ UT-PY-PAR-04: Parité sur scénarios générés")
+
+    def test_ut_py_par_05_worker_directories(self):
+        """UT-PY-PAR-05: Les répertoires des workers sont supprimés, le répertoire courant inchangé"""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as root, patch.object(tempfile, 'tempdir', root):
+            results = parity.run_scenarios(parity.generate_scenarios(8, seed=5), workers=2, with_cobol=False)
+            self.assertEqual(len(results), 8)
+            self.assertEqual(os.listdir(root), [])
+        self.assertEqual(os.getcwd(), cwd)
+
+        print("✓ UT-PY-PAR-05: Répertoires des workers nettoyés")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le magasin d'enregistrements binaires (record_store.py)
+Validation des lectures/écritures en place et de la conversion depuis JSON
+"""
+
+import os
+import sys
+import json
+import unittest
+import tempfile
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.record_store import RecordStore, RECORD, HEADER, convert_json
+from python.account_manager import AccountManager
+
+
+class TestRecordStore(unittest.TestCase):
+    """Tests unitaires pour la classe RecordStore"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.store_file = os.path.join(self.directory.name, 'accounts.dat')
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def test_ut_py_rec_01_append_and_update(self):
+        """UT-PY-REC-01: Ajout, lecture et mise à jour en place"""
+        store = RecordStore(self.store_file)
+        for account_id in range(200):
+            self.assertEqual(store.append(account_id, account_id * 100), account_id)
+
+        store.set_cents(150, 12345)
+        self.assertEqual(store.get(150), (150, 12345))
+        self.assertEqual(RECORD.unpack(store.record(7)), (7, 700))
+        with self.assertRaises(IndexError):
+            store.get(200)
+        store.close()
+
+        # Réouverture : seul l'en-tête est lu, les enregistrements sont intacts
+        store = RecordStore(self.store_file)
+        self.assertEqual(len(store), 200)
+        self.assertEqual(store.get_cents(150), 12345)
+        self.assertEqual(sum(1 for _ in store.records()), 200)
+        store.close()
+
+        print("✓ UT-PY-REC-01: Enregistrements de largeur fixe fonctionnels")
+
+    def test_ut_py_rec_02_convert_json(self):
+        """UT-PY-REC-02: Conversion du fichier de données JSON"""
+        json_file = os.path.join(self.directory.name, 'account_data.json')
+        with open(json_file, 'w') as f:
+            json.dump({'balance': 1450.75}, f)
+
+        convert_json(json_file, self.store_file)
+
+        account = AccountManager(self.store_file, storage="mmap")
+        self.assertEqual(account.get_balance(), 1450.75)
+        account.close()
+
+        print("✓ UT-PY-REC-02: Conversion depuis JSON fonctionnelle")
+
+    def test_ut_py_rec_03_account_manager(self):
+        """UT-PY-REC-03: AccountManager sur stockage projeté en mémoire"""
+        account = AccountManager(self.store_file, storage="mmap")
+        self.assertEqual(account.get_balance(), 1000.0)
+        account.credit_account(500.0)
+        account.debit_account(0.25)
+        account.close()
+
+        account = AccountManager(self.store_file, storage="mmap")
+        self.assertEqual(account.get_balance(), 1499.75)
+        account.close()
+
+        with self.assertRaises(ValueError):
+            AccountManager(self.store_file, storage="mmap", journal=True)
+
+        print("✓ UT-PY-REC-03: Persistance en place fonctionnelle")
+
+    def test_ut_py_rec_04_foreign_file_untouched(self):
+        """UT-PY-REC-04: Fichier existant trop court ou d'un autre format refusé sans être modifié"""
+        json_file = os.path.join(self.directory.name, 'account_data.json')
+        contents = {
+            json_file: json.dumps({'balance': 1450.75}).encode(),
+            self.store_file: b"ACCT",
+        }
+        store = RecordStore(os.path.join(self.directory.name, 'full.dat'))
+        store.append(1, 100)
+        store.append(2, 200)
+        store.close()
+        with open(os.path.join(self.directory.name, 'full.dat'), 'rb') as file:
+            # En-tête intact, enregistrements annoncés manquants
+            contents[os.path.join(self.directory.name, 'truncated.dat')] = file.read()[:HEADER.size + 4]
+
+        for path, data in contents.items():
+            with open(path, 'wb') as file:
+                file.write(data)
+            with self.assertRaises(ValueError):
+                RecordStore(path)
+            with self.assertRaises(ValueError):
+                AccountManager(path, storage="mmap")
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), data)
+
+        # Un fichier vide est initialisé
+        empty_file = os.path.join(self.directory.name, 'empty.dat')
+        open(empty_file, 'wb').close()
+        store = RecordStore(empty_file)
+        self.assertEqual(len(store), 0)
+        store.close()
+
+        print("✓ UT-PY-REC-04: Fichiers étrangers préservés")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le service réseau asyncio (server.py)
+Validation du protocole, des requêtes en rafale et de la sauvegarde
+"""
+
+import os
+import sys
+import time
+import asyncio
+import unittest
+import tempfile
+from unittest.mock import patch
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.ledger import Ledger
+from python.server import AccountServer, AccountClient, _write_snapshot
+
+
+class TestAccountServer(unittest.IsolatedAsyncioTestCase):
+    """Tests unitaires pour le service AccountServer, sur localhost"""
+
+    async def asyncSetUp(self):
+        """Démarrer le service sur un port libre"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.directory.name, 'ledger.bin')
+        self.server = await AccountServer(data_file=self.data_file, save_interval=60).start()
+        self.client = await AccountClient.connect(port=self.server.port)
+
+    async def asyncTearDown(self):
+        """Arrêter le service"""
+        await self.client.close()
+        await self.server.close()
+        self.directory.cleanup()
+
+    async def test_ut_py_srv_01_operations(self):
+        """UT-PY-SRV-01: Consultation, crédit et débit"""
+        responses = await self.client.request(
+            "BALANCE 1",
+            "CREDIT 1 500.00",
+            "DEBIT 1 2000",
+            "DEBIT 1 0",
+            "DEBIT 1 200.50",
+        )
+
+        self.assertEqual(responses, [
+            "OK 1000.00",
+            "OK 1500.00",
+            "ERR insufficient_funds Fonds insuffisants.",
+            "ERR invalid_amount Le montant doit être supérieur à zéro.",
+            "OK 1299.50",
+        ])
+
+        print("✓ UT-PY-SRV-01: Opérations du service fonctionnelles")
+
+    async def test_ut_py_srv_05_transfer(self):
+        """UT-PY-SRV-05: Virement entre deux comptes"""
+        responses = await self.client.request("TRANSFER 1 2 250.00", "TRANSFER 1 2 5000", "BALANCE 2")
+
+        self.assertEqual(responses, [
+            "OK 750.00 1250.00",
+            "ERR insufficient_funds Fonds insuffisants.",
+            "OK 1250.00",
+        ])
+
+        print("✓ UT-PY-SRV-05: Virement du service fonctionnel")
+
+    async def test_ut_py_srv_02_invalid_requests(self):
+        """UT-PY-SRV-02: Requêtes invalides rejetées"""
+        responses = await self.client.request("TRANSFER 1 2", "CREDIT x 10", "CREDIT 1 1.234", "BALANCE")
+
+        for response in responses:
+            self.assertTrue(response.startswith("ERR invalid_request"), response)
+
+        print("✓ UT-PY-SRV-02: Requêtes invalides rejetées")
+
+    async def test_ut_py_srv_03_concurrent_clients(self):
+        """UT-PY-SRV-03: Clients concurrents sur le même compte, sans perte de mise à jour"""
+        clients = [await AccountClient.connect(port=self.server.port) for _ in range(10)]
+        try:
+            await asyncio.gather(*(client.request(*["CREDIT 7 1"] * 200) for client in clients))
+        finally:
+            for client in clients:
+                await client.close()
+
+        self.assertEqual(await self.client.request("BALANCE 7"), ["OK 3000.00"])
+
+        print("✓ UT-PY-SRV-03: Sérialisation par compte correcte")
+
+    async def test_ut_py_srv_04_persistence(self):
+        """UT-PY-SRV-04: Sauvegarde du grand livre à l'arrêt"""
+        await self.client.request("CREDIT 3 25.25")
+        await self.server.save()
+
+        self.assertEqual(Ledger.load(self.data_file).get_balance(3), 1025.25)
+
+        print("✓ UT-PY-SRV-04: Sauvegarde du grand livre fonctionnelle")
+
+    async def test_ut_py_srv_06_ledger_errors(self):
+        """UT-PY-SRV-06: Refus du grand livre répondus sans fermer la connexion"""
+        responses = await self.client.request(
+            "CREDIT 1 99999999999999999999",
+            "TRANSFER 2 1 1",
+            "CREDIT 1 92233720368547758.07",
+            f"CREDIT {2 ** 64} 1",
+            "BALANCE 1",
+        )
+
+        self.assertEqual(responses[0], "ERR overflow Le solde dépasserait la capacité maximale du compte.")
+        self.assertEqual(responses[1], "OK 999.00 1001.00")
+        self.assertEqual(responses[2], "ERR overflow Le solde dépasserait la capacité maximale du compte.")
+        self.assertTrue(responses[3].startswith("ERR invalid_request"), responses[3])
+        self.assertEqual(responses[4], "OK 1001.00")
+
+        print("✓ UT-PY-SRV-06: Erreurs du grand livre répondues")
+
+    async def test_ut_py_srv_07_close_waits_for_save(self):
+        """UT-PY-SRV-07: L'arrêt attend la sauvegarde en cours, les écritures ne se chevauchent pas"""
+        writing = []
+        overlaps = []
+
+        def slow_write(ledger, lock, path):
+            overlaps.append(bool(writing))
+            writing.append(path)
+            time.sleep(0.2)
+            _write_snapshot(ledger, lock, path)
+            writing.pop()
+
+        with patch('python.server._write_snapshot', slow_write):
+            await self.client.request("CREDIT 4 1")
+            periodic = asyncio.create_task(self.server.save())
+            await asyncio.sleep(0.05)
+            periodic.cancel()
+            await self.client.request("CREDIT 4 2")
+            await self.client.close()
+            await self.server.close()
+
+        self.assertEqual(overlaps, [False, False])
+        self.assertEqual(Ledger.load(self.data_file).get_balance(4), 1003.0)
+        self.server = await AccountServer(data_file=self.data_file, save_interval=60).start()
+        self.client = await AccountClient.connect(port=self.server.port)
+
+        print("✓ UT-PY-SRV-07: Sauvegardes sérialisées à l'arrêt")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le grand livre réparti en processus (shard.py)
+Validation du routage, de l'ordre des opérations et de la persistance par tranche
+"""
+
+import os
+import sys
+import random
+import unittest
+import tempfile
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.shard import ShardedLedger, shard_of
+from python.ledger import Ledger
+
+
+class TestShard(unittest.TestCase):
+    """Tests unitaires pour la classe ShardedLedger"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def test_ut_py_shard_01_same_results_as_ledger(self):
+        """UT-PY-SHARD-01: Résultats identiques à un grand livre unique"""
+        rng = random.Random(21)
+        ops = [(rng.randrange(50), rng.choice(("credit", "debit")), rng.randint(-10, 60000))
+               for _ in range(5000)]
+        reference = Ledger()
+        expected = [reference.apply(*op) for op in ops]
+
+        sharded = ShardedLedger(workers=3)
+        try:
+            self.assertEqual(sharded.apply_many(ops[:2500]) + sharded.apply_many(ops[2500:]), expected)
+            for account_id in range(50):
+                self.assertEqual(sharded.get_balance(account_id), reference.get_balance(account_id))
+            self.assertEqual(sharded.credit_account(7, 1.5), reference.credit_account(7, 1.5))
+            self.assertEqual(sharded.debit_account(7, 1e6), reference.debit_account(7, 1e6))
+        finally:
+            sharded.close()
+
+        # Répartition uniforme de numéros consécutifs
+        counts = [0] * 4
+        for account_id in range(10000):
+            counts[shard_of(account_id, 4)] += 1
+        self.assertTrue(all(2000 < count < 3000 for count in counts), counts)
+        print("✓ UT-PY-SHARD-01: Opérations routées vers les tranches")
+
+    def test_ut_py_shard_02_persistence(self):
+        """UT-PY-SHARD-02: Chaque tranche persiste son état ; une opération invalide est refusée seule"""
+        sharded = ShardedLedger(workers=2, directory=self.directory.name)
+        sharded.apply_many([(account_id, "credit", 100) for account_id in range(20)])
+        self.assertEqual(sharded.checkpoint(), 20)
+        results = sharded.apply_many([(account_id, "debit", 50) for account_id in range(5)] +
+                                     [(-1, "credit", 100), (2 ** 63, "credit", 100), (5, "credit", "50")] +
+                                     [(account_id, "debit", 50) for account_id in range(5, 10)])
+        self.assertEqual(results[5:8], [("invalid_request", None)] * 3)
+        self.assertEqual([error for error, _ in results[:5] + results[8:]], [None] * 10)
+        self.assertEqual(sharded.apply(-1, "credit", 100), ("invalid_request", None))
+        self.assertEqual(sharded.credit_account(-1, 1.0), (False, "Numéro de compte ou montant invalide."))
+        # Les autres opérations du lot sont appliquées, la tranche reste disponible
+        self.assertEqual(sharded.get_balance(3), 1000.50)
+        sharded.close()
+
+        sharded = ShardedLedger(workers=2, directory=self.directory.name)
+        try:
+            self.assertEqual(sharded.get_balance(3), 1000.50)
+            self.assertEqual(sharded.get_balance(15), 1001.00)
+            self.assertEqual(sorted(os.listdir(self.directory.name)),
+                             ["shard-0.ldg", "shard-0.wal", "shard-1.ldg", "shard-1.wal"])
+        finally:
+            sharded.close()
+        print("✓ UT-PY-SHARD-02: Tranches persistées et rechargées")
+
+    def test_ut_py_shard_03_overflow_in_batch(self):
+        """UT-PY-SHARD-03: Un crédit trop grand est refusé seul, le reste du lot est retourné"""
+        sharded = ShardedLedger(workers=2)
+        try:
+            results = sharded.apply_many([(1, "credit", 100), (2, "credit", 2 ** 63), (3, "credit", 100),
+                                          (2, "credit", 100), (1, "credit", 2 ** 62)])
+            self.assertEqual(results, [(None, 100100), ("overflow", 100000), (None, 100100),
+                                       (None, 100100), (None, 2 ** 62 + 100100)])
+            self.assertEqual(sharded.apply(1, "credit", 2 ** 62), ("overflow", 2 ** 62 + 100100))
+            self.assertEqual(sharded.get_balance(1).cents, 2 ** 62 + 100100)
+        finally:
+            sharded.close()
+        print("✓ UT-PY-SHARD-03: Dépassement refusé sans perdre le lot")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
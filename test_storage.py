@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour les backends de stockage (storage.py)
+Validation des backends JSON, mmap, SQLite et mémoire et de leur sélection
+"""
+
+import os
+import sys
+import sqlite3
+import unittest
+import tempfile
+from unittest.mock import patch
+
+# Ajouter le répertoire python au chemin de recherche
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'python')))
+
+# Importer les modules à tester
+from python.storage import MemoryBackend, resolve_data_file
+from python.account_manager import AccountManager
+
+
+class TestStorage(unittest.TestCase):
+    """Tests unitaires pour les backends de stockage"""
+
+    def setUp(self):
+        """Préparer l'environnement de test"""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Nettoyer après les tests"""
+        self.directory.cleanup()
+
+    def test_ut_py_sto_01_backends(self):
+        """UT-PY-STO-01: Mêmes opérations et persistance sur chaque backend"""
+        for storage in ("json", "binary", "mmap", "sqlite"):
+            data_file = os.path.join(self.directory.name, f'account.{storage}')
+            account = AccountManager(data_file, storage=storage)
+            self.assertEqual(account.get_balance(), 1000.0)
+            account.credit_account(250.50)
+            account.debit_account(50.0)
+            self.assertEqual(account.debit_account(5000.0)[0], False)
+            account.apply_batch([("credit", 10), ("debit", 5)])
+            account.close()
+
+            # Relecture par une nouvelle instance
+            account = AccountManager(data_file, storage=storage)
+            self.assertEqual(account.get_balance(), 1205.50, storage)
+            account.close()
+
+        print("✓ UT-PY-STO-01: Backends JSON, binaire, mmap et SQLite fonctionnels")
+
+    def test_ut_py_sto_02_sqlite_wal(self):
+        """UT-PY-STO-02: Base SQLite en mode WAL, écritures externes détectées"""
+        data_file = os.path.join(self.directory.name, 'account.db')
+        reader = AccountManager(data_file, storage="sqlite", watch=True)
+        writer = AccountManager(data_file, storage="sqlite")
+        writer.credit_account(100.0)
+        self.assertEqual(reader.get_balance(), 1100.0)
+
+        connection = sqlite3.connect(data_file)
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(connection.execute("SELECT balance FROM accounts").fetchall(), [(110000,)])
+        connection.close()
+        reader.close()
+        writer.close()
+
+        print("✓ UT-PY-STO-02: Backend SQLite WAL fonctionnel")
+
+    def test_ut_py_sto_03_memory_and_selection(self):
+        """UT-PY-STO-03: Backend mémoire et sélection par variables d'environnement"""
+        backend = MemoryBackend()
+        account = AccountManager(storage=backend)
+        account.credit_account(1.0)
+        self.assertEqual(backend.cents, 100100)
+
+        data_file = os.path.join(self.directory.name, 'env.db')
+        with patch.dict(os.environ, {'ACCOUNT_DATA_FILE': data_file, 'ACCOUNT_STORAGE': 'sqlite'}):
+            account = AccountManager()
+            account.credit_account(1.0)
+            account.close()
+        self.assertEqual(account.data_file, data_file)
+        with open(data_file, 'rb') as f:
+            self.assertEqual(f.read(16), b"SQLite format 3\x00")
+
+        with self.assertRaises(ValueError):
+            AccountManager(os.path.join(self.directory.name, 'x'), storage="cassette")
+        with self.assertRaises(ValueError):
+            AccountManager(storage="memory", journal=True)
+
+        print("✓ UT-PY-STO-03: Sélection du backend fonctionnelle")
+
+    def test_ut_py_sto_04_default_data_file(self):
+        """UT-PY-STO-04: Fichier de données par défaut propre à chaque backend"""
+        self.assertEqual(resolve_data_file(None, "json"), "account_data.json")
+        self.assertEqual(resolve_data_file(None, "binary"), "account_data.json")
+        self.assertEqual(resolve_data_file(None, "mmap"), "account_data.dat")
+        self.assertEqual(resolve_data_file(None, "sqlite"), "account_data.db")
+        self.assertEqual(resolve_data_file("compte.bin", "sqlite"), "compte.bin")
+
+        # Un account_data.json existant n'est ni ouvert comme base SQLite ni écrasé
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            with open('account_data.json', 'w') as f:
+                f.write('{"balance": 42.5}')
+            with patch.dict(os.environ):
+                os.environ.pop('ACCOUNT_DATA_FILE', None)
+                os.environ.pop('ACCOUNT_STORAGE', None)
+                for storage in ("sqlite", "mmap"):
+                    account = AccountManager(storage=storage)
+                    self.assertEqual(account.get_balance(), 1000.0)
+                    account.close()
+                self.assertEqual(AccountManager().get_balance(), 42.5)
+                with patch.dict(os.environ, {'ACCOUNT_STORAGE': 'sqlite'}):
+                    self.assertEqual(resolve_data_file(), "account_data.db")
+            with open('account_data.json') as f:
+                self.assertEqual(f.read(), '{"balance": 42.5}')
+            self.assertTrue(os.path.exists('account_data.db'))
+            self.assertTrue(os.path.exists('account_data.dat'))
+        finally:
+            os.chdir(cwd)
+
+        print("✓ UT-PY-STO-04: Fichier par défaut propre au backend")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)